@@ -0,0 +1,143 @@
+"""
+Pack d'images pré-redimensionnées pour un démarrage rapide.
+
+Les PNG livrés sont très gros (jusqu'à 2 Mo) alors que le jeu les réduit
+immédiatement à 30x30, 60x60 ou 800x600. Ce module « cuit » chaque image à
+sa taille cible dans un seul fichier binaire (lignes RGBA brutes, mises bout
+à bout) accompagné d'un manifeste JSON. Au chargement, le pack est mappé en
+mémoire et chaque image est créée avec `pygame.image.frombuffer`, sans
+décodage PNG.
+
+Construction du pack (à relancer quand les images changent) :
+    python asset_pack.py
+
+Mettre la variable d'environnement ZOMBIE_ASSET_PACK=0 pour forcer
+l'utilisation des PNG sources.
+"""
+import json
+import mmap
+import os
+
+import pygame
+
+PACK_VERSION = 2 # 2 : date de modification des PNG sources dans le manifeste
+PACK_FILENAME = 'assets.pack'
+MANIFEST_FILENAME = 'assets.pack.json'
+PIXEL_FORMAT = 'RGBA'
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _source_stamp(filename, directory):
+    """
+    Taille en octets et date de modification (ns) du PNG source, pour
+    détecter un pack périmé sans relire l'image ; None si le fichier manque.
+    """
+    try:
+        stat = os.stat(os.path.join(directory, filename))
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def build_pack(manifest, directory=ASSET_DIR):
+    """
+    Construit le pack binaire et son manifeste à partir des PNG sources.
+
+    Args:
+        manifest (iterable): couples (filename, target_size) à inclure.
+        directory (str): dossier des PNG et du pack produit.
+
+    Returns:
+        dict: le manifeste écrit sur disque.
+    """
+    entries = []
+    offset = 0
+    pack_path = os.path.join(directory, PACK_FILENAME)
+    # Écrire dans un fichier temporaire : un pack existant peut être mappé en mémoire
+    tmp_path = pack_path + '.tmp'
+    with open(tmp_path, 'wb') as pack_file:
+        for filename, target_size in manifest:
+            image = pygame.image.load(os.path.join(directory, filename))
+            if target_size:
+                image = pygame.transform.scale(image, target_size)
+            data = pygame.image.tobytes(image, PIXEL_FORMAT)
+            pack_file.write(data)
+            entries.append({
+                'file': filename,
+                'target_size': list(target_size) if target_size else None,
+                'size': list(image.get_size()),
+                'offset': offset,
+                'length': len(data),
+                'source': _source_stamp(filename, directory),
+            })
+            offset += len(data)
+    os.replace(tmp_path, pack_path)
+
+    manifest_data = {'version': PACK_VERSION, 'format': PIXEL_FORMAT, 'entries': entries}
+    with open(os.path.join(directory, MANIFEST_FILENAME), 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest_data, manifest_file, indent=1)
+    return manifest_data
+
+
+class AssetPack:
+    """Accès en lecture à un pack d'images mappé en mémoire."""
+    def __init__(self, pack_path, manifest_data, directory):
+        self._file = open(pack_path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._directory = directory
+        self._entries = {}
+        for entry in manifest_data['entries']:
+            target_size = tuple(entry['target_size']) if entry['target_size'] else None
+            self._entries[(entry['file'], target_size)] = entry
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def load(self, filename, target_size=None):
+        """
+        Retourne la surface (non convertie) de l'image, ou None si elle
+        n'est pas dans le pack ou si le PNG source a changé depuis la cuisson.
+        """
+        key = (filename, tuple(target_size) if target_size else None)
+        entry = self._entries.get(key)
+        if entry is None or entry['source'] != _source_stamp(filename, self._directory):
+            return None
+        start = entry['offset']
+        data = self._view[start:start + entry['length']]
+        return pygame.image.frombuffer(data, tuple(entry['size']), PIXEL_FORMAT)
+
+    def close(self):
+        """Libère le mapping mémoire (les surfaces converties restent valides)."""
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+
+def open_pack(directory=ASSET_DIR):
+    """Ouvre le pack s'il existe et est valide, sinon retourne None."""
+    if os.environ.get('ZOMBIE_ASSET_PACK') == '0':
+        return None
+    pack_path = os.path.join(directory, PACK_FILENAME)
+    manifest_path = os.path.join(directory, MANIFEST_FILENAME)
+    try:
+        with open(manifest_path, encoding='utf-8') as manifest_file:
+            manifest_data = json.load(manifest_file)
+        if manifest_data.get('version') != PACK_VERSION or manifest_data.get('format') != PIXEL_FORMAT:
+            print(f"Avertissement: pack d'images '{PACK_FILENAME}' obsolète, utilisation des PNG.")
+            return None
+        return AssetPack(pack_path, manifest_data, directory)
+    except (OSError, ValueError, KeyError) as e:
+        if os.path.exists(manifest_path):
+            print(f"Erreur: Impossible d'ouvrir le pack d'images: {e}")
+        return None
+
+
+if __name__ == '__main__':
+    # Le jeu n'a pas besoin d'être affiché pour construire le pack
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    from main import ASSET_MANIFEST
+    written = build_pack(ASSET_MANIFEST)
+    total = sum(entry['length'] for entry in written['entries'])
+    print(f"Pack écrit : {len(written['entries'])} images, {total / 1024:.0f} Ko dans '{PACK_FILENAME}'")
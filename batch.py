@@ -0,0 +1,127 @@
+"""
+Lanceur de parties en lot, en parallèle sur tous les cœurs.
+
+Joue N parties sans affichage (graines consécutives) pour chaque combinaison
+de constantes de `main` à tester, et écrit un résultat JSON par ligne dès
+qu'une partie se termine.
+
+    python batch.py --games 200 --bot dodge --out results.jsonl \\
+        --set INITIAL_ZOMBIE_SPAWN_DELAY=1000,1500 --set ZOMBIE_SPAWN_DECREASE_RATE=20,40
+
+Le bot peut être un nom de headless.POLICIES ou 'module:fabrique', où
+`fabrique()` retourne une entrée `policy(simulation) -> touches`.
+"""
+import argparse
+import ast
+import importlib
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import headless
+import main
+
+
+def parse_override(text):
+    """
+    'NOM=v1,v2' -> ('NOM', [v1, v2]) ; vérifie que NOM est une constante de main.
+    Les valeurs sont des littéraux Python séparés par des virgules de premier
+    niveau : 'NOM=(1, 2),(3, 4)' donne deux tuples.
+    """
+    name, _, values = text.partition('=')
+    name = name.strip()
+    if not name.isupper() or not hasattr(main, name):
+        raise argparse.ArgumentTypeError(f"constante inconnue dans main: '{name}'")
+    try:
+        parsed = ast.literal_eval(f"[{values}]")
+    except (ValueError, SyntaxError) as e:
+        raise argparse.ArgumentTypeError(f"valeur invalide pour {name}: {e}")
+    if not parsed:
+        raise argparse.ArgumentTypeError(f"aucune valeur pour {name}")
+    return name, parsed
+
+
+def override_grid(overrides):
+    """Produit cartésien des valeurs : liste de dictionnaires {constante: valeur}."""
+    if not overrides:
+        return [{}]
+    names = [name for name, _ in overrides]
+    return [dict(zip(names, combo)) for combo in itertools.product(*(values for _, values in overrides))]
+
+
+def resolve_policy(spec):
+    """Retourne la fabrique d'entrée pour un nom de bot ou 'module:fabrique'."""
+    if spec in headless.POLICIES:
+        return headless.POLICIES[spec]
+    module_name, _, attr = spec.partition(':')
+    if not attr:
+        raise ValueError(f"bot inconnu: '{spec}' (attendu: {sorted(headless.POLICIES)} ou module:fabrique)")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def _init_worker():
+    """Initialisation de chaque processus : images chargées une fois (masques)."""
+    main.init_headless()
+
+
+def play(seed, overrides, policy_spec, max_seconds, engine_name):
+    """Joue une partie avec les constantes surchargées (restaurées ensuite) ; tourne dans un processus du pool."""
+    saved = {name: getattr(main, name) for name in overrides}
+    try:
+        for name, value in overrides.items():
+            setattr(main, name, value)
+        start = time.perf_counter()
+        result = headless.run_game(resolve_policy(policy_spec)(), seed, max_seconds, engine_name)
+        result['wall_time'] = round(time.perf_counter() - start, 4)
+    finally:
+        for name, value in saved.items():
+            setattr(main, name, value)
+    result['overrides'] = overrides
+    return result
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Parties sans affichage en parallèle, résultats en JSONL")
+    parser.add_argument('--games', type=int, default=100, help="parties par combinaison de constantes")
+    parser.add_argument('--seed', type=int, default=0, help="graine de la première partie")
+    parser.add_argument('--bot', default='dodge', help="nom de bot ou module:fabrique")
+    parser.add_argument('--max-seconds', type=float, default=300, help="durée simulée maximale par partie")
+    parser.add_argument('--engine', choices=main.ENTITY_ENGINES, default=main.ENTITY_ENGINE)
+    parser.add_argument('--set', dest='overrides', type=parse_override, action='append', default=[],
+                        metavar='NOM=v1,v2', help="constante de main à balayer (répétable)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--out', default='-', help="fichier JSONL de sortie ('-' : sortie standard)")
+    args = parser.parse_args()
+
+    resolve_policy(args.bot) # Erreur immédiate si le bot est introuvable
+    tasks = [(seed, combo) for combo in override_grid(args.overrides)
+             for seed in range(args.seed, args.seed + args.games)]
+
+    out = sys.stdout if args.out == '-' else open(args.out, 'w', encoding='utf-8')
+    start = time.perf_counter()
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(play, seed, combo, args.bot, args.max_seconds, args.engine)
+                       for seed, combo in tasks]
+            for future in as_completed(futures):
+                out.write(json.dumps(future.result()) + '\n')
+                out.flush() # Résultats visibles au fil de l'eau
+                done += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"{done} parties en {elapsed:.1f} s avec {args.workers} processus : "
+          f"{done / elapsed:.1f} parties/s, {done / elapsed / args.workers:.2f} parties/s par cœur",
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main_cli()
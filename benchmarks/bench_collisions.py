@@ -0,0 +1,107 @@
+"""
+Benchmark des collisions : parcours linéaire contre grille spatiale.
+
+Des entités de taille zombie/météorite sont réparties dans une arène et
+avancent à chaque image ; on mesure par image le coût de la mise à jour de
+la grille et de la requête « qui touche le joueur ? », pour des nombres
+d'entités croissants. La revue de la grille parcourt tous les sprites : au
+total elle perd contre le parcours linéaire, d'où SPATIAL_GRID (main.py) qui
+ne la réserve qu'au moteur numpy.
+    python benchmarks/bench_collisions.py [--counts 100 1000 10000] [--frames 200]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from main import METEORITE_WIDTH, PLAYER_TARGET_SIZE, SPATIAL_CELL_SIZE, ZOMBIE_WIDTH
+from spatial_hash import SpatialGroup
+
+
+class Mover(pygame.sprite.Sprite):
+    """Entité minimale : un rectangle qui avance en ligne droite en rebondissant."""
+    def __init__(self, rng, arena):
+        super().__init__()
+        size = rng.choice((ZOMBIE_WIDTH, METEORITE_WIDTH))
+        self.arena = arena
+        self.rect = pygame.Rect(rng.randrange(arena.width - size), rng.randrange(arena.height - size), size, size)
+        self.dx = rng.choice((-3, -2, -1, 1, 2, 3))
+        self.dy = rng.choice((-3, -2, -1, 1, 2, 3))
+
+    def update(self):
+        self.rect.x += self.dx
+        self.rect.y += self.dy
+        if not self.arena.contains(self.rect):
+            self.dx, self.dy = -self.dx, -self.dy
+            self.rect.clamp_ip(self.arena)
+
+
+def run(count, frames, use_grid, seed=0):
+    """Retourne le temps moyen par image (µs) : mise à jour + requête de collision."""
+    rng = random.Random(seed)
+    # Arène dont la surface croît avec le nombre d'entités (densité constante)
+    side = max(800, int((count * 4000) ** 0.5))
+    arena = pygame.Rect(0, 0, side, side)
+    group = SpatialGroup(SPATIAL_CELL_SIZE) if use_grid else pygame.sprite.Group()
+    group.add(Mover(rng, arena) for _ in range(count))
+    player = pygame.sprite.Sprite()
+    player.rect = pygame.Rect((0, 0), PLAYER_TARGET_SIZE)
+    player.rect.center = arena.center
+
+    hits = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        group.update()
+        if use_grid:
+            hits += len(group.query_rect(player.rect))
+        else:
+            hits += len(pygame.sprite.spritecollide(player, group, False))
+    elapsed = time.perf_counter() - start
+    return elapsed / frames * 1e6, hits
+
+
+def query_cost(count, use_grid, repeats=200, seed=0):
+    """Coût (µs) d'une requête de collision seule, sans mise à jour des entités."""
+    rng = random.Random(seed)
+    side = max(800, int((count * 4000) ** 0.5))
+    arena = pygame.Rect(0, 0, side, side)
+    group = SpatialGroup(SPATIAL_CELL_SIZE) if use_grid else pygame.sprite.Group()
+    group.add(Mover(rng, arena) for _ in range(count))
+    player = pygame.sprite.Sprite()
+    player.rect = pygame.Rect((0, 0), PLAYER_TARGET_SIZE)
+    player.rect.center = arena.center
+    start = time.perf_counter()
+    for _ in range(repeats):
+        if use_grid:
+            group.query_rect(player.rect)
+        else:
+            pygame.sprite.spritecollide(player, group, False)
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--counts', type=int, nargs='+', default=[100, 1000, 5000, 20000])
+    parser.add_argument('--frames', type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'entités':>8} | {'linéaire (µs/image)':>20} | {'grille (µs/image)':>18} | {'requête seule':>14}")
+    for count in args.counts:
+        linear_us, linear_hits = run(count, args.frames, use_grid=False)
+        grid_us, grid_hits = run(count, args.frames, use_grid=True)
+        assert linear_hits == grid_hits, "la grille doit trouver les mêmes collisions"
+        query_linear = query_cost(count, use_grid=False)
+        query_grid = query_cost(count, use_grid=True)
+        print(f"{count:>8} | {linear_us:>20.0f} | {grid_us:>18.0f} | "
+              f"{query_linear:>6.1f} -> {query_grid:.1f} µs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark des moteurs de simulation : 'objects' contre 'numpy'.
+
+Pour chaque population cible, les deux moteurs rejouent la même partie
+(même graine, mêmes touches) : la population est maintenue en faisant
+apparaître de nouvelles entités à chaque image. On vérifie que les positions
+de toutes les entités sont identiques image par image, et que les grilles
+spatiales contiennent exactement les sprites vivants, chacun dans les cellules
+de son rectangle ; puis on compare le temps de simulation par image.
+    python benchmarks/bench_engines.py [--counts 100 1000 5000] [--frames 200]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import main
+
+
+class ScriptedKeys:
+    """Remplace `pygame.key.get_pressed()` : touches enfoncées selon l'image."""
+    PATTERN = (pygame.K_LEFT, pygame.K_UP, pygame.K_RIGHT, pygame.K_DOWN)
+
+    def __init__(self):
+        self.pressed = ()
+
+    def at_frame(self, frame):
+        self.pressed = (self.PATTERN[(frame // 45) % len(self.PATTERN)],)
+        return self
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+def run(engine_name, population, frames, seed=0):
+    """
+    Joue `frames` images ; retourne (temps de simulation par image en µs,
+    empreintes par image, incohérences des grilles avec l'image de la première).
+    """
+    rng = random.Random(seed)
+    zombies = main.SpatialGroup(main.SPATIAL_CELL_SIZE)
+    meteorites = main.SpatialGroup(main.SPATIAL_CELL_SIZE)
+    player = main.Player()
+    engine = main.create_entity_engine(zombies, meteorites, engine_name)
+    keys = ScriptedKeys()
+
+    fingerprints = []
+    grid_problems = []
+    simulated = 0.0
+    for frame in range(frames):
+        # Maintenir la population (même séquence aléatoire pour les deux moteurs)
+        while len(zombies) + len(meteorites) < population:
+            roll = rng.random()
+            if roll < 0.2:
+                sprite, group = main.TrackingZombie(rng), zombies
+            elif roll < 0.7:
+                sprite, group = main.Zombie(rng), zombies
+            else:
+                sprite, group = main.Meteorite(rng.choice(main.METEORITE_TYPES), rng), meteorites
+            group.add(sprite)
+            if engine is not None:
+                engine.add(sprite)
+
+        start = time.perf_counter()
+        player.update(keys.at_frame(frame))
+        if engine is not None:
+            engine.step(player)
+        else:
+            zombies.update(player)
+            meteorites.update()
+        simulated += time.perf_counter() - start
+
+        fingerprints.append(hash(tuple(sorted(
+            (type(s).__name__, tuple(s.rect), getattr(s, 'direction', ''))
+            for s in (*zombies, *meteorites)))))
+        if not grid_problems:
+            grid_problems = [(frame, problem) for group in (zombies, meteorites) for problem in group.check_grid()]
+    return simulated / frames * 1e6, fingerprints, grid_problems
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--counts', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'entités':>8} | {'objects (µs/image)':>19} | {'numpy (µs/image)':>17} | {'gain':>5} | identiques")
+    for count in args.counts:
+        objects_us, objects_prints, objects_problems = run('objects', count, args.frames, args.seed)
+        numpy_us, numpy_prints, numpy_problems = run('numpy', count, args.frames, args.seed)
+        identical = objects_prints == numpy_prints and not objects_problems and not numpy_problems
+        print(f"{count:>8} | {objects_us:>19.0f} | {numpy_us:>17.0f} | "
+              f"{objects_us / numpy_us:>4.1f}x | {'oui' if identical else 'NON'}")
+        if not identical:
+            for engine_name, problems in (('objects', objects_problems), ('numpy', numpy_problems)):
+                for frame, problem in problems[:5]:
+                    print(f"Grille ({engine_name}), image {frame} : {problem}")
+            if objects_prints != numpy_prints:
+                first = next(i for i, (a, b) in enumerate(zip(objects_prints, numpy_prints)) if a != b)
+                print(f"Divergence à l'image {first}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main_cli()
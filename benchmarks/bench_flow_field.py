@@ -0,0 +1,126 @@
+"""
+Benchmark du champ de flux : coût par pas de la poursuite de 10 à 10 000
+zombies traqueurs dans une grande arène avec obstacles.
+
+Le joueur avance en continu (il change de cellule toutes les quelques
+images, et le champ est refait à chaque fois). On mesure séparément le coût
+du champ (indépendant du nombre de traqueurs), celui du déplacement des
+traqueurs (lecture du champ en O(1) chacun) avec les deux moteurs, et, pour
+comparaison, celui d'une recherche de chemin par traqueur à chaque pas.
+    python benchmarks/bench_flow_field.py [--counts 10 100 1000 10000] [--steps 120]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import main
+from flow_field import FlowField
+from spatial_hash import SpatialGroup
+
+WORLD_SIZE = (8000, 6000)
+# Recherche individuelle mesurée seulement jusqu'à ce nombre de traqueurs (trop lente au-delà)
+MAX_PER_TRACKER_SEARCH = 100
+
+
+class HoldRight:
+    """Touches : flèche droite enfoncée en permanence."""
+    def __getitem__(self, key):
+        return key == pygame.K_RIGHT
+
+
+def scatter_obstacles(rng, count, player_rect):
+    """Murs aléatoires (horizontaux ou verticaux) autour de la zone de départ, hors du chemin du joueur."""
+    lane = pygame.Rect(player_rect.left - 100, player_rect.top - 40, 2300, player_rect.height + 80)
+    obstacles = []
+    while len(obstacles) < count:
+        x = player_rect.centerx + rng.randint(-700, 700)
+        y = player_rect.centery + rng.randint(-500, 500)
+        size = (rng.randint(100, 300), 32) if rng.random() < 0.5 else (32, rng.randint(100, 300))
+        wall = pygame.Rect((x, y), size)
+        if not wall.colliderect(lane):
+            obstacles.append(wall)
+    return obstacles
+
+
+def spawn_trackers(count, rng, view):
+    """`count` traqueurs placés au hasard autour de la vue (dans la portée du champ)."""
+    area = view.inflate(400, 400)
+    trackers = []
+    for _ in range(count):
+        tracker = main.TrackingZombie(rng, view)
+        tracker.place(rng.uniform(area.left, area.right), rng.uniform(area.top, area.bottom))
+        trackers.append(tracker)
+    return trackers
+
+
+def run(engine_name, count, steps, seed=0, search=False):
+    """µs par pas : (champ de flux, traqueurs)."""
+    rng = random.Random(seed)
+    player = main.Player()
+    obstacles = scatter_obstacles(rng, 40, player.rect)
+    field = FlowField(WORLD_SIZE, main.FLOW_FIELD_CELL_SIZE, obstacles, main.FLOW_FIELD_RADIUS)
+    zombies, meteorites = SpatialGroup(main.SPATIAL_CELL_SIZE), SpatialGroup(main.SPATIAL_CELL_SIZE)
+    view = main.camera_view(*player.rect.center)
+    zombies.add(spawn_trackers(count, rng, view))
+    engine = main.create_entity_engine(zombies, meteorites, engine_name)
+    if engine is not None:
+        for tracker in zombies:
+            engine.add(tracker)
+    keys = HoldRight()
+    field_time = tracker_time = 0.0
+    for _ in range(steps):
+        player.update(keys, 1.0, obstacles)
+        main.camera_view(*player.rect.center, view)
+        start = time.perf_counter()
+        field.update(*player.rect.center)
+        middle = time.perf_counter()
+        if search: # Sans champ partagé : un parcours par traqueur (depuis sa cellule)
+            for tracker in zombies:
+                field._build(field.cell_index(*tracker.rect.center))
+            field.goal = None # Remettre le champ du joueur pour le déplacement
+            field.update(*player.rect.center)
+        if engine is not None:
+            engine.step(player, 1.0, view, field)
+        else:
+            zombies.update(player, 1.0, view, field)
+        end = time.perf_counter()
+        field_time += middle - start
+        tracker_time += end - middle
+    return field_time / steps * 1e6, tracker_time / steps * 1e6, field.stats()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--counts', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--steps', type=int, default=120)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    main.WORLD_WIDTH, main.WORLD_HEIGHT = WORLD_SIZE
+    main.init_headless()
+    print(f"{'traqueurs':>9} | {'champ (µs/pas)':>14} | {'objets (µs/pas)':>15} | {'µs/traqueur':>11} | "
+          f"{'numpy (µs/pas)':>14} | {'µs/traqueur':>11} | {'un parcours par traqueur (µs/pas)':>33}")
+    for count in args.counts:
+        field_us, objects_us, stats = run('objects', count, args.steps, args.seed)
+        _, numpy_us, _ = run('numpy', count, args.steps, args.seed)
+        if count <= MAX_PER_TRACKER_SEARCH:
+            _, search_us, _ = run('objects', count, max(1, args.steps // 10), args.seed, search=True)
+            search = f"{search_us:>33.0f}"
+        else:
+            search = f"{'-':>33}"
+        print(f"{count:>9} | {field_us:>14.0f} | {objects_us:>15.0f} | {objects_us / count:>11.2f} | "
+              f"{numpy_us:>14.0f} | {numpy_us / count:>11.2f} | {search}")
+    print(f"Champ : {stats['cells']} cellules, {stats['blocked']} bloquées, "
+          f"{stats['visited']} atteintes par parcours, {stats['rebuilds']} parcours en {args.steps} pas")
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,94 @@
+"""
+Benchmark des niveaux de détail (LOD_LEVELS) : coût par pas du déplacement
+de nombreux zombies traqueurs dispersés dans une grande arène (presque tous
+« lointains »), à chaque niveau et avec les deux moteurs, et nombre
+d'entités admises par le budget.
+
+Seul le pas des entités est mesuré (moteur ou `update()` des sprites) : c'est
+la part que les mises à jour espacées des traqueurs lointains allègent. Le
+nombre de traqueurs est le même à tous les niveaux (ni budget ni disparition
+pendant la mesure), le ramasse-miettes est suspendu, et les essais alternent
+les niveaux pour que la dérive de la machine ne favorise aucun d'eux.
+Avec numpy, le gain est plus faible qu'avec les objets : les tableaux de
+tous les traqueurs sont calculés à chaque pas, seule la recopie vers les
+sprites en attente est évitée.
+    python benchmarks/bench_lod.py [--trackers 3000] [--steps 60] [--repeat 5]
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+WORLD_SIZE = (8000, 6000)
+
+
+def scatter_trackers(simulation, count, seed):
+    """`count` traqueurs placés au hasard dans toute l'arène."""
+    rng = random.Random(seed)
+    width, height = WORLD_SIZE
+    for _ in range(count):
+        tracker = simulation.pool.acquire(main.TrackingZombie, rng, simulation.view)
+        tracker.place(rng.uniform(0, width - main.ZOMBIE_WIDTH), rng.uniform(0, height - main.ZOMBIE_HEIGHT))
+        simulation._spawn(tracker, simulation.zombies)
+
+
+def run(engine_name, level, count, steps, seed=0):
+    """µs par pas pour le déplacement des traqueurs au niveau `level`."""
+    simulation = main.Simulation(engine_name, seed)
+    simulation.lod_level = level
+    scatter_trackers(simulation, count, seed)
+    period = main.LOD_LEVELS[level][0]
+    player, view, engine = simulation.player, simulation.view, simulation.engine
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(steps):
+            simulation.steps += 1
+            lod = (period, simulation.steps, main.LOD_TRACKER_DISTANCE) if period > 1 else None # Comme Simulation.step
+            if engine is not None:
+                engine.step(player, 1.0, view, None, lod)
+            else:
+                simulation.zombies.update(player, 1.0, view, None, lod)
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+    assert len(simulation.zombies) == count, "le nombre de traqueurs doit rester fixe"
+    return elapsed / steps * 1e6
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--trackers', type=int, default=3000)
+    parser.add_argument('--steps', type=int, default=60)
+    parser.add_argument('--repeat', type=int, default=5, help="essais par mesure (on garde le meilleur)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    main.WORLD_WIDTH, main.WORLD_HEIGHT = WORLD_SIZE
+    main.DESPAWN_DISTANCE = None # Garder les traqueurs lointains : ce sont eux qu'on mesure
+    main.init_headless()
+    levels = list(range(len(main.LOD_LEVELS)))
+    best = {}
+    for attempt in range(args.repeat): # Niveaux alternés d'un essai à l'autre
+        for level in levels[attempt % len(levels):] + levels[:attempt % len(levels)]:
+            for engine in main.ENTITY_ENGINES:
+                us = run(engine, level, args.trackers, args.steps, args.seed)
+                best[engine, level] = min(best.get((engine, level), us), us)
+    print(f"{'niveau':>6} | {'période':>7} | {'budget':>6} | {'objets (µs/pas)':>15} | {'numpy (µs/pas)':>14}")
+    for level, (period, share) in enumerate(main.LOD_LEVELS):
+        objects_us, numpy_us = (best[engine, level] for engine in main.ENTITY_ENGINES)
+        budget = int(main.ENTITY_BUDGET * share) if main.ENTITY_BUDGET is not None and share is not None else '-'
+        print(f"{level:>6} | {period:>7} | {budget:>6} | {objects_us:>15.0f} | {numpy_us:>14.0f}")
+
+
+if __name__ == '__main__':
+    main_cli()
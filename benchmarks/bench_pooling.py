@@ -0,0 +1,107 @@
+"""
+Benchmark du pool d'entités : allocations et ramasse-miettes à forte cadence
+d'apparition.
+
+La simulation tourne avec des délais d'apparition minimaux (des centaines de
+zombies et de météorites créés puis détruits chaque seconde) et un joueur
+invincible, avec et sans réutilisation des entités mortes. On mesure le
+temps par pas, le pic de mémoire Python (tracemalloc), le nombre de
+collectes du ramasse-miettes et leur durée cumulée.
+    python benchmarks/bench_pooling.py [--steps 3000] [--spawn-delay 10]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from headless import NO_KEYS
+
+
+class GcWatch:
+    """Compte les collectes du ramasse-miettes (par génération) et leur durée."""
+    def __init__(self):
+        self.collections = [0, 0, 0]
+        self.pause = 0.0
+        self._start = None
+
+    def __call__(self, phase, info):
+        if phase == 'start':
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            self.pause += time.perf_counter() - self._start
+            self.collections[info['generation']] += 1
+            self._start = None
+
+    def __enter__(self):
+        gc.callbacks.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        gc.callbacks.remove(self)
+
+
+def run(pooling, steps, spawn_delay, seed=0, trace=False):
+    """Joue `steps` pas ; retourne un dictionnaire de mesures."""
+    saved = {name: getattr(main, name) for name in (
+        'ENTITY_POOLING', 'INITIAL_ZOMBIE_SPAWN_DELAY', 'MIN_ZOMBIE_SPAWN_DELAY',
+        'INITIAL_METEORITE_SPAWN_DELAY', 'MIN_METEORITE_SPAWN_DELAY')}
+    main.ENTITY_POOLING = pooling
+    main.INITIAL_ZOMBIE_SPAWN_DELAY = main.MIN_ZOMBIE_SPAWN_DELAY = spawn_delay
+    main.INITIAL_METEORITE_SPAWN_DELAY = main.MIN_METEORITE_SPAWN_DELAY = spawn_delay
+    try:
+        gc.collect()
+        if trace:
+            tracemalloc.start()
+        simulation = main.Simulation(seed=seed)
+        with GcWatch() as watch:
+            start = time.perf_counter()
+            for _ in range(steps):
+                simulation.step(NO_KEYS)
+                simulation.game_over = False # Joueur invincible : la cadence reste maximale
+            elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace else None
+    finally:
+        if trace:
+            tracemalloc.stop()
+        for name, value in saved.items():
+            setattr(main, name, value)
+    return {
+        'us_per_step': elapsed / steps * 1e6,
+        'peak_kib': peak / 1024 if peak is not None else None,
+        'gc': watch.collections,
+        'gc_ms': watch.pause * 1000,
+        'pool': simulation.pool.stats(),
+        'peak_entities': simulation.peak_entities,
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--steps', type=int, default=3000)
+    parser.add_argument('--spawn-delay', type=int, default=10, help="délai d'apparition (ms)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    main.init_headless()
+    print(f"{'pool':>5} | {'µs/pas':>7} | {'pic mémoire':>12} | {'collectes gc (0/1/2)':>20} | "
+          f"{'pause gc':>9} | {'créées':>7} | {'réutilisées':>11} | {'pic vivantes':>12}")
+    for pooling in (False, True):
+        # Temps et ramasse-miettes mesurés sans tracemalloc (qui ralentit tout)
+        timing = run(pooling, args.steps, args.spawn_delay, args.seed)
+        memory = run(pooling, args.steps, args.spawn_delay, args.seed, trace=True)
+        pool = timing['pool']
+        collections = '/'.join(str(count) for count in timing['gc'])
+        print(f"{'oui' if pooling else 'non':>5} | {timing['us_per_step']:>7.0f} | "
+              f"{memory['peak_kib']:>8.0f} Kio | {collections:>20} | {timing['gc_ms']:>6.1f} ms | "
+              f"{pool['misses']:>7} | {pool['hits']:>11} | {pool['peak_live']:>12}")
+
+
+if __name__ == '__main__':
+    main_cli()
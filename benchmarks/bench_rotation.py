@@ -0,0 +1,69 @@
+"""
+Benchmark de la rotation des météorites : rotation à chaque image contre
+images tournées précalculées.
+
+Pour N météorites qui tournent, on compare par image le coût de
+`pygame.transform.rotozoom` + `pygame.mask.from_surface` (ce qu'il faudrait
+faire sans cache) à celui de la sélection de l'image et du masque précalculés
+(`Meteorite.update`), et on affiche la mémoire occupée par le cache selon le
+nombre d'angles.
+    python benchmarks/bench_rotation.py [--counts 10 100 1000] [--frames 100]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import main
+
+
+def rotate_every_frame(meteorites, frames):
+    """µs par image : rotation et masque recalculés pour chaque météorite."""
+    base = {sprite: sprite.frames[0] for sprite in meteorites}
+    start = time.perf_counter()
+    for _ in range(frames):
+        for sprite in meteorites:
+            sprite.angle = (sprite.angle + sprite.spin) % 360.0
+            sprite.image = pygame.transform.rotozoom(base[sprite], sprite.angle, 1)
+            sprite.mask = pygame.mask.from_surface(sprite.image)
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def cached_frames(meteorites, frames):
+    """µs par image : `Meteorite.update` (déplacement compris) avec les images précalculées."""
+    start = time.perf_counter()
+    for _ in range(frames):
+        for sprite in meteorites:
+            sprite.update()
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--counts', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    main.init_display()
+    stats = main.assets.stats()
+    print(f"Cache : {main.meteorite_rotation_steps()} angles, {stats['rotation_frames']} images, "
+          f"{stats['rotation_bytes'] / 1024:.0f} Kio (budget {main.METEORITE_ROTATION_BUDGET / 1024:.0f} Kio)")
+    print(f"{'météorites':>10} | {'rotation (µs/image)':>19} | {'cache (µs/image)':>16} | {'gain':>6}")
+    for count in args.counts:
+        rng = random.Random(args.seed)
+        meteorites = [main.Meteorite(rng.choice(main.METEORITE_TYPES), rng) for _ in range(count)]
+        rotated_us = rotate_every_frame(meteorites, args.frames)
+        cached_us = cached_frames(meteorites, args.frames)
+        print(f"{count:>10} | {rotated_us:>19.0f} | {cached_us:>16.0f} | {rotated_us / cached_us:>5.1f}x")
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,70 @@
+"""
+Benchmark du démarrage : PNG sources contre pack pré-redimensionné.
+
+Chaque mesure lance un interpréteur neuf qui importe `main`, ouvre la
+fenêtre (pilote SDL factice) et charge toutes les images en tâche de fond
+comme le jeu, puis rapporte le temps jusqu'au premier affichage (écran de
+chargement), le temps total et la mémoire résidente maximale (RSS). Le pack
+doit avoir été construit avant :
+    python asset_pack.py
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, resource, time
+start = time.perf_counter()
+import main
+main.init_display(wait=False)
+main.draw_loading_screen(main.screen, main.asset_loader.progress)
+first_frame = time.perf_counter() - start
+main.asset_loader.wait()
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({'first_frame_s': first_frame, 'import_s': elapsed, 'rss_kb': rss_kb, 'stats': main.assets.stats(),
+                  'pack': main.assets.pack is not None}))
+"""
+
+
+def measure(use_pack):
+    """Lance un import de `main` dans un processus séparé et retourne ses mesures."""
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy',
+               PYGAME_HIDE_SUPPORT_PROMPT='1', ZOMBIE_ASSET_PACK='1' if use_pack else '0')
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=5, help="nombre de démarrages par variante")
+    args = parser.parse_args()
+
+    results = {}
+    for label, use_pack in (('png', False), ('pack', True)):
+        runs = [measure(use_pack) for _ in range(args.runs)]
+        if use_pack and not runs[0]['pack']:
+            print("Pack introuvable : lancer d'abord 'python asset_pack.py'.")
+            sys.exit(1)
+        results[label] = {
+            'first_frame_s': statistics.median(r['first_frame_s'] for r in runs),
+            'import_s': statistics.median(r['import_s'] for r in runs),
+            'rss_kb': statistics.median(r['rss_kb'] for r in runs),
+        }
+        print(f"{label:>5}: premier affichage {results[label]['first_frame_s'] * 1000:7.1f} ms, "
+              f"images chargées {results[label]['import_s'] * 1000:8.1f} ms, "
+              f"RSS max {results[label]['rss_kb'] / 1024:7.1f} Mo")
+
+    speedup = results['png']['import_s'] / results['pack']['import_s']
+    print(f"Démarrage {speedup:.1f}x plus rapide avec le pack")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+Test d'endurance des redémarrages : des milliers de parties enchaînées dans
+une même `GameSession` (menu -> partie -> game over -> 'R' -> partie ...).
+
+Sans fenêtre réelle (pilote vidéo 'dummy'), avec une horloge simulée qui
+avance de MAX_STEPS_PER_FRAME pas par image sans dormir, et des constantes
+qui font mourir le joueur (immobile) en quelques secondes simulées. On
+relève régulièrement la mémoire du processus (ou, avec --tracemalloc, la
+mémoire Python allouée : plus précis, mais dix fois plus lent), le nombre
+d'objets suivis par le ramasse-miettes et la profondeur de pile maximale
+lors des changements d'état : tout doit rester plat. Code de sortie 1 si
+la mémoire croît de plus de --max-growth Kio entre la fin de l'échauffement
+et la fin du test.
+    python benchmarks/soak_sessions.py [--restarts 2000] [--sample-every 200] [--tracemalloc]
+"""
+import argparse
+import gc
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import main
+
+# Parties courtes : des traqueurs qui apparaissent sans cesse
+FAST_DEATH = {
+    'INITIAL_ZOMBIE_SPAWN_DELAY': 50,
+    'MIN_ZOMBIE_SPAWN_DELAY': 50,
+    'INITIAL_TRACKING_ZOMBIE_CHANCE': 1.0,
+}
+
+
+class SimulatedClock:
+    """
+    Remplace `pygame.time.Clock` : chaque image dure le maximum rattrapable,
+    sans attente. Le temps de travail (`get_rawtime`, lu par LODGovernor) est
+    cette même durée simulée : le régulateur voit une machine saturée et
+    monte jusqu'au niveau le plus grossier, que le test parcourt donc aussi.
+    """
+    def tick(self, framerate=0):
+        return main.MAX_STEPS_PER_FRAME * main.FIXED_DELTA_TIME
+
+    def get_rawtime(self):
+        return main.MAX_STEPS_PER_FRAME * main.FIXED_DELTA_TIME
+
+    def get_fps(self):
+        return 0.0
+
+
+def stack_depth():
+    frame, depth = sys._getframe(1), 0
+    while frame is not None:
+        frame, depth = frame.f_back, depth + 1
+    return depth
+
+
+def memory_kib(traced):
+    """Mémoire Python allouée (tracemalloc actif) ou mémoire résidente du processus, en Kio."""
+    if traced:
+        return tracemalloc.get_traced_memory()[0] / 1024
+    try:
+        with open('/proc/self/statm') as statm: # Linux : mémoire résidente actuelle
+            return int(statm.read().split()[1]) * resource.getpagesize() / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss # Pic (Kio sous Linux)
+
+
+def press(key):
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode='', scancode=0))
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--restarts', type=int, default=2000)
+    parser.add_argument('--sample-every', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=200, help="redémarrages avant la mesure de référence")
+    parser.add_argument('--max-growth', type=float, default=1024, help="croissance mémoire tolérée (Kio)")
+    parser.add_argument('--tracemalloc', action='store_true', help="mesurer la mémoire Python allouée")
+    args = parser.parse_args()
+
+    for name, value in FAST_DEATH.items():
+        setattr(main, name, value)
+    main.init_display()
+    session = main.GameSession(main.screen, main.background_img, clock=SimulatedClock())
+
+    # Profondeur de pile à chaque changement d'état (l'ancien game_loop s'appelait lui-même)
+    base_depth = stack_depth()
+    max_depth = 0
+    enter = session.enter
+    def traced_enter(state):
+        nonlocal max_depth
+        max_depth = max(max_depth, stack_depth() - base_depth)
+        enter(state)
+    session.enter = traced_enter
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    press(pygame.K_RETURN) # Quitter le menu
+    print(f"{'parties':>8} | {'mémoire':>10} | {'objets gc':>9} | {'pile':>4} | {'parties/s':>9}")
+    reference = None
+    start = time.perf_counter()
+    while session.games_played < args.restarts:
+        session.run_frame()
+        if session.state == session.GAME_OVER:
+            games = session.games_played
+            if games % args.sample_every == 0 or games == args.warmup:
+                gc.collect()
+                current = memory_kib(args.tracemalloc)
+                if games == args.warmup:
+                    reference = current
+                elapsed = time.perf_counter() - start
+                print(f"{games:>8} | {current:>6.0f} Kio | {len(gc.get_objects()):>9} | "
+                      f"{max_depth:>4} | {games / elapsed:>9.1f}")
+            press(pygame.K_r) # Rejouer
+    session.close()
+
+    gc.collect()
+    growth = memory_kib(args.tracemalloc) - (reference or 0)
+    if args.tracemalloc:
+        tracemalloc.stop()
+    print(f"Croissance mémoire après échauffement : {growth:+.0f} Kio")
+    if reference is not None and growth > args.max_growth:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,289 @@
+"""
+Suite de benchmarks reproductibles, sans fenêtre (pilote vidéo 'dummy').
+
+Micro-benchmarks (µs par opération) : load_image, draw_text, `update` de
+chaque type de sprite, collisions par masques et `all_sprites.draw`.
+Scénarios (µs par pas) : parties à graine fixe jouées par le bot d'esquive,
+joueur invincible, avec un nombre croissant d'entités au départ, simulation
+et affichage compris, pour chaque moteur.
+
+Chaque mesure est le meilleur de --repeat essais (le moins sensible au bruit
+de la machine), ramasse-miettes suspendu pendant la mesure. Les résultats
+sont écrits en JSON (--output). Avec --baseline, chaque mesure est comparée
+à la référence enregistrée : code de sortie 1 si l'une d'elles est plus
+lente de plus de --tolerance. Une référence ne vaut que pour la machine qui
+l'a produite (--save-baseline pour la refaire).
+    python benchmarks/suite.py [--only motif] [--output resultats.json]
+    python benchmarks/suite.py --baseline benchmarks/baseline.json
+    python benchmarks/suite.py --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import fnmatch
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import main
+from headless import DodgeBot, KeyState
+from spatial_hash import SpatialGroup
+
+SEED = 1234
+SPRITES_PER_BATCH = 100      # Sprites mis à jour par appel dans les micro-benchmarks
+SCENARIO_COUNTS = (25, 100, 400, 1600)
+SCENARIO_STEPS = 200
+SCENARIO_MIX = (('traqueur', 0.4), ('zombie', 0.4), ('meteorite', 0.2))
+
+# nom -> (catégorie, unité, fabrique, appels par essai) ; la fabrique prépare
+# l'état (hors mesure) et retourne (fonction mesurée, opérations par appel)
+BENCHMARKS = {}
+
+
+def benchmark(name, category='micro', unit='µs/op', calls=1000):
+    def register(factory):
+        BENCHMARKS[name] = (category, unit, factory, calls)
+        return factory
+    return register
+
+
+# --- Micro-benchmarks ---
+
+@benchmark('load_image', calls=20000)
+def bench_load_image():
+    """Image déjà en cache (cas de la partie)."""
+    return (lambda: main.load_image('zombie_sud.png', main.ZOMBIE_TARGET_SIZE)), 1
+
+
+@benchmark('load_image_disque', calls=20)
+def bench_load_image_disk():
+    """Décodage et redimensionnement depuis le PNG, sans cache ni pack."""
+    return (lambda: main._load_image_from_disk('background.png', (main.SCREEN_WIDTH, main.SCREEN_HEIGHT))), 1
+
+
+@benchmark('draw_text', calls=5000)
+def bench_draw_text():
+    surface = pygame.Surface((main.SCREEN_WIDTH, main.SCREEN_HEIGHT))
+    return (lambda: main.draw_text(surface, "GAME OVER !", 64, 400, 150, main.RED)), 1
+
+
+@benchmark('draw_number', calls=5000)
+def bench_draw_number():
+    """Score du HUD : valeur différente à chaque appel."""
+    surface = pygame.Surface((main.SCREEN_WIDTH, main.SCREEN_HEIGHT))
+    values = iter(range(10 ** 9))
+    return (lambda: main.text_renderer.draw_number(surface, "Temps: ", next(values) / 60, 24, 400, 10,
+                                                   main.BLACK)), 1
+
+
+def _batch_update(sprites, *args):
+    def run():
+        for sprite in sprites:
+            sprite.update(*args)
+    return run, len(sprites)
+
+
+@benchmark('update_joueur', calls=200)
+def bench_update_player():
+    keys = [KeyState((key,)) for key in (pygame.K_LEFT, pygame.K_UP, pygame.K_RIGHT, pygame.K_DOWN)]
+    players = [main.Player() for _ in range(SPRITES_PER_BATCH)]
+    def run():
+        for i, player in enumerate(players):
+            player.update(keys[i % 4])
+    return run, len(players)
+
+
+@benchmark('update_zombie', calls=200)
+def bench_update_zombie():
+    rng = random.Random(SEED)
+    return _batch_update([main.Zombie(rng) for _ in range(SPRITES_PER_BATCH)], main.Player())
+
+
+@benchmark('update_traqueur', calls=200)
+def bench_update_tracker():
+    rng = random.Random(SEED)
+    return _batch_update([main.TrackingZombie(rng) for _ in range(SPRITES_PER_BATCH)], main.Player())
+
+
+@benchmark('update_meteorite', calls=200)
+def bench_update_meteorite():
+    rng = random.Random(SEED)
+    return _batch_update([main.Meteorite(rng.choice(main.METEORITE_TYPES), rng)
+                          for _ in range(SPRITES_PER_BATCH)])
+
+
+@benchmark('collisions_masques', calls=2000)
+def bench_mask_collisions():
+    """Joueur au milieu de 500 zombies dont une partie le chevauche (phase large + masques)."""
+    rng = random.Random(SEED)
+    player = main.Player()
+    group = SpatialGroup(main.SPATIAL_CELL_SIZE)
+    for _ in range(500):
+        zombie = main.Zombie(rng)
+        zombie.place(player.rect.centerx + rng.randint(-200, 200), player.rect.centery + rng.randint(-200, 200))
+        group.add(zombie)
+    return (lambda: main.spritecollide_mask(player, group, False)), 1
+
+
+@benchmark('all_sprites_draw', calls=200)
+def bench_group_draw():
+    """`pygame.sprite.Group.draw` de 300 entités sur l'écran."""
+    rng = random.Random(SEED)
+    group = pygame.sprite.Group()
+    for i in range(300):
+        sprite = main.Meteorite(rng.choice(main.METEORITE_TYPES), rng) if i % 3 == 0 else main.Zombie(rng)
+        sprite.place(rng.randint(0, main.SCREEN_WIDTH - 60), rng.randint(0, main.SCREEN_HEIGHT - 60))
+        group.add(sprite)
+    return (lambda: group.draw(main.screen)), 1
+
+
+# --- Scénarios ---
+
+def prefill(simulation, count):
+    """Ajoute `count` entités (SCENARIO_MIX) à des positions tirées dans la vue."""
+    rng, view = simulation.rng, simulation.view
+    for i in range(count):
+        fraction = (i + 0.5) / count
+        for kind, share in SCENARIO_MIX:
+            fraction -= share
+            if fraction <= 0:
+                break
+        if kind == 'meteorite':
+            sprite = simulation.pool.acquire(main.Meteorite, rng.choice(main.METEORITE_TYPES), rng, view)
+            group = simulation.meteorites
+        else:
+            cls = main.TrackingZombie if kind == 'traqueur' else main.Zombie
+            sprite = simulation.pool.acquire(cls, rng, view)
+            group = simulation.zombies
+        sprite.place(rng.uniform(view.left, view.right - 60), rng.uniform(view.top, view.bottom - 60))
+        simulation._spawn(sprite, group)
+
+
+def scenario(engine_name, count):
+    def factory():
+        simulation = main.Simulation(engine_name, seed=SEED)
+        prefill(simulation, count)
+        renderer = main.DirtyRectRenderer(main.screen, main.background_img)
+        bot = DodgeBot()
+        def run():
+            for _ in range(SCENARIO_STEPS):
+                simulation.step(bot(simulation))
+                simulation.game_over = False # Joueur invincible : la charge reste celle du scénario
+                renderer.render(simulation.all_sprites, lambda surface: [])
+        return run, SCENARIO_STEPS
+    return factory
+
+
+for _engine in main.ENTITY_ENGINES:
+    for _count in SCENARIO_COUNTS:
+        benchmark(f'partie_{_engine}_{_count}', 'scenario', 'µs/pas', calls=1)(scenario(_engine, _count))
+
+
+# --- Mesure et comparaison ---
+
+def measure(factory, calls, repeat):
+    """Meilleur temps par opération (µs) sur `repeat` essais de `calls` appels."""
+    best = float('inf')
+    for _ in range(repeat):
+        func, ops = factory() # Préparation hors mesure (état neuf à chaque essai)
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(calls):
+                func()
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = min(best, elapsed / (calls * ops) * 1e6)
+    return best
+
+
+def environment():
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'numpy': numpy_version,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'video_driver': os.environ.get('SDL_VIDEODRIVER'),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Liste des (nom, actuel, référence, ratio) plus lents que la référence de plus de `tolerance`."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get('results', {}).get(name)
+        if reference is None:
+            continue
+        ratio = result['value'] / reference['value']
+        result['baseline'] = reference['value']
+        result['ratio'] = round(ratio, 3)
+        if ratio > 1 + tolerance:
+            regressions.append((name, result['value'], reference['value'], ratio))
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--only', nargs='+', metavar='MOTIF', help="mesures à lancer (motifs fnmatch)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', metavar='FICHIER', help="écrire les résultats en JSON")
+    parser.add_argument('--baseline', metavar='FICHIER', help="comparer à cette référence (JSON)")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="ralentissement toléré (0.25 : +25 %%)")
+    parser.add_argument('--save-baseline', metavar='FICHIER', help="enregistrer les résultats comme référence")
+    parser.add_argument('--list', action='store_true', help="lister les mesures et quitter")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS
+             if not args.only or any(fnmatch.fnmatch(name, pattern) for pattern in args.only)]
+    if args.list:
+        print('\n'.join(names))
+        return
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+
+    main.init_display()
+    results = {}
+    for name in names:
+        category, unit, factory, calls = BENCHMARKS[name]
+        value = measure(factory, calls, args.repeat)
+        results[name] = {'category': category, 'unit': unit, 'value': round(value, 3)}
+        reference = baseline.get('results', {}).get(name) if baseline else None
+        versus = f"  (référence {reference['value']:.2f}, x{value / reference['value']:.2f})" if reference else ''
+        print(f"{name:<28} {value:>12.2f} {unit}{versus}", flush=True)
+
+    report = {'environment': environment(), 'seed': SEED, 'repeat': args.repeat, 'results': results}
+    regressions = compare(results, baseline, args.tolerance) if baseline else []
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2, ensure_ascii=False)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2, ensure_ascii=False)
+        print(f"Référence enregistrée : {args.save_baseline}")
+    if regressions:
+        print(f"Régressions (> +{args.tolerance:.0%}) :")
+        for name, value, reference, ratio in regressions:
+            print(f"  {name} : {value:.2f} contre {reference:.2f} (x{ratio:.2f})")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main_cli()
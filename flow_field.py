@@ -0,0 +1,159 @@
+"""
+Champ de flux (flow field) partagé pour la poursuite du joueur.
+
+Plutôt que de chercher un chemin pour chaque zombie traqueur (coût en
+zombies x longueur du chemin), l'arène est découpée en cellules de
+`cell_size` pixels et un seul parcours en largeur part de la cellule du
+joueur : chaque cellule atteinte retient la cellule voisine par laquelle on
+s'en rapproche (`next_cell`). Un traqueur n'a plus qu'à lire la cellule où
+il se trouve et à viser le centre de la suivante : O(1) par traqueur, quel
+que soit leur nombre.
+
+Le parcours contourne les cellules bloquées par les obstacles (rectangles
+fixes) et ne coupe pas leurs coins en diagonale. Il n'est refait que lorsque
+le joueur change de cellule, et se limite à `radius` cellules autour de lui :
+son coût ne dépend ni de la taille de l'arène ni du nombre de traqueurs. Hors
+de cette zone (ou dans la cellule du joueur), `next_cell` vaut NO_CELL et les
+traqueurs visent directement le joueur.
+
+La grille est entourée d'une bordure de cellules bloquées (`stride` =
+colonnes + 2) et, le temps d'un parcours, le tour de la zone de portée est
+bloqué lui aussi : la boucle n'a aucun bord à tester. Les tableaux
+(`array`) peuvent être lus sans copie par NumPy (`np.frombuffer`), ce que
+fait le moteur vectorisé.
+"""
+from array import array
+from collections import deque
+
+NO_CELL = -1 # Pas de cellule suivante : viser le joueur directement
+
+# Voisins (dx, dy) : orthogonaux d'abord, pour des chemins sans zigzag inutile
+NEIGHBOURS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1))
+
+
+class FlowField:
+    """
+    Directions vers une cible (le joueur) sur une grille de l'arène.
+
+    Args:
+        world_size (tuple): (largeur, hauteur) de l'arène en pixels.
+        cell_size (int): côté d'une cellule en pixels.
+        obstacles (iterable): rectangles (x, y, largeur, hauteur) infranchissables ;
+            toute cellule qu'ils touchent est bloquée.
+        radius (int): portée du parcours, en cellules autour de la cible
+            (carré de 2 * radius + 1 cellules de côté).
+    """
+    def __init__(self, world_size, cell_size, obstacles=(), radius=24):
+        self.cell_size = cell_size
+        self.radius = radius
+        self.cols = max(1, -(-world_size[0] // cell_size))
+        self.rows = max(1, -(-world_size[1] // cell_size))
+        stride = self.stride = self.cols + 2
+        count = stride * (self.rows + 2)
+        # Bordure bloquée, intérieur libre sauf obstacles
+        self.blocked = bytearray(b'\x01') * count
+        for row in range(self.rows):
+            self.blocked[(row + 1) * stride + 1:(row + 1) * stride + 1 + self.cols] = bytes(self.cols)
+        for x, y, width, height in obstacles:
+            for row in range(max(0, y // cell_size), min(self.rows, (y + height - 1) // cell_size + 1)):
+                for col in range(max(0, x // cell_size), min(self.cols, (x + width - 1) // cell_size + 1)):
+                    self.blocked[(row + 1) * stride + col + 1] = 1
+        # Par voisin : décalage d'indice, et pour une diagonale les deux cellules à ne pas couper
+        self._offsets = tuple((dy * stride + dx, dx, dy * stride) if dx and dy else (dy * stride + dx, 0, 0)
+                              for dx, dy in NEIGHBOURS)
+        # Valables seulement là où stamp == generation (pas de remise à zéro entre deux parcours)
+        self.next_cell = array('l', [NO_CELL]) * count
+        self.distance = array('l', [0]) * count
+        self.stamp = array('l', [0]) * count
+        self.generation = 0
+        self.goal = None   # Cellule de la cible au dernier parcours
+        self.rebuilds = 0
+        self.visited = 0   # Cellules atteintes au dernier parcours
+
+    def cell_index(self, x, y):
+        """Indice de la cellule contenant le point (x, y), ramené dans la grille."""
+        size = self.cell_size
+        col = min(self.cols - 1, max(0, int(x // size)))
+        row = min(self.rows - 1, max(0, int(y // size)))
+        return (row + 1) * self.stride + col + 1
+
+    def update(self, x, y):
+        """Suit la cible en (x, y) ; ne refait le parcours que si elle a changé de cellule."""
+        goal = self.cell_index(x, y)
+        if goal == self.goal:
+            return False
+        self.goal = goal
+        self._build(goal)
+        return True
+
+    def _ring(self, goal):
+        """Cellules (grille bordée) du tour du carré de portée centré sur `goal`."""
+        stride, radius = self.stride, self.radius + 1
+        col, row = goal % stride, goal // stride
+        left, right = max(0, col - radius), min(stride - 1, col + radius)
+        top, bottom = max(0, row - radius), min(self.rows + 1, row + radius)
+        ring = []
+        if row - radius >= 0:
+            ring.extend(range(top * stride + left, top * stride + right + 1))
+        if row + radius <= self.rows + 1:
+            ring.extend(range(bottom * stride + left, bottom * stride + right + 1))
+        for r in range(top, bottom + 1):
+            if col - radius >= 0:
+                ring.append(r * stride + left)
+            if col + radius <= stride - 1:
+                ring.append(r * stride + right)
+        return ring
+
+    def _build(self, goal):
+        """Parcours en largeur depuis `goal` (8 voisins, sans couper les coins), limité au carré de portée."""
+        self.generation += 1
+        generation, offsets = self.generation, self._offsets
+        blocked, next_cell, distance, stamp = self.blocked, self.next_cell, self.distance, self.stamp
+        # Fermer le carré de portée le temps du parcours
+        ring = self._ring(goal)
+        saved = bytes(blocked[cell] for cell in ring)
+        for cell in ring:
+            blocked[cell] = 1
+
+        stamp[goal], next_cell[goal], distance[goal] = generation, NO_CELL, 0
+        queue = deque([goal])
+        visited = 1
+        while queue:
+            cell = queue.popleft()
+            step = distance[cell] + 1
+            for offset, side_x, side_y in offsets:
+                neighbour = cell + offset
+                if stamp[neighbour] == generation or blocked[neighbour]:
+                    continue
+                # Diagonale : les deux cellules orthogonales doivent être libres
+                if side_x and (blocked[cell + side_x] or blocked[cell + side_y]):
+                    continue
+                stamp[neighbour], next_cell[neighbour], distance[neighbour] = generation, cell, step
+                queue.append(neighbour)
+                visited += 1
+        for cell, value in zip(ring, saved):
+            blocked[cell] = value
+        self.rebuilds += 1
+        self.visited = visited
+
+    def next_target(self, x, y):
+        """
+        Point à viser depuis (x, y) : centre de la cellule suivante, ou None
+        pour viser directement la cible (même cellule, ou hors de portée).
+        """
+        cell = self.cell_index(x, y)
+        if self.stamp[cell] != self.generation:
+            return None
+        following = self.next_cell[cell]
+        if following == NO_CELL:
+            return None
+        size, stride = self.cell_size, self.stride
+        return ((following % stride - 0.5) * size, (following // stride - 0.5) * size)
+
+    def stats(self):
+        return {
+            'cells': self.cols * self.rows,
+            'blocked': sum(self.blocked) - 2 * (self.cols + self.rows + 2), # Sans la bordure
+            'rebuilds': self.rebuilds,
+            'visited': self.visited,
+        }
@@ -0,0 +1,176 @@
+"""
+Simulation sans affichage : fait tourner des parties complètes aussi vite que
+possible, pilotées par un script ou un bot au lieu du clavier.
+
+    python headless.py --games 5 --seed 0 --bot dodge
+    python headless.py --bot idle --max-seconds 120 --engine numpy
+    python headless.py --games 5 --lod 2   # niveau de détail fixe (voir main.LOD_LEVELS)
+    python headless.py --games 5 --obstacles piliers
+
+Une « entrée » est un objet appelable `policy(simulation)` qui retourne, à
+chaque pas, l'état des touches (indexable par les constantes Pygame, comme
+`pygame.key.get_pressed()`).
+"""
+import argparse
+import math
+import os
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+
+import main
+
+# Touches de déplacement lues par Player.update
+MOVE_KEYS = {
+    'left': pygame.K_LEFT,
+    'right': pygame.K_RIGHT,
+    'up': pygame.K_UP,
+    'down': pygame.K_DOWN,
+}
+
+
+class KeyState:
+    """État de clavier minimal : un ensemble de touches enfoncées."""
+    __slots__ = ('pressed',)
+
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+    def __eq__(self, other):
+        return isinstance(other, KeyState) and self.pressed == other.pressed
+
+    def __hash__(self):
+        return hash(self.pressed)
+
+
+NO_KEYS = KeyState()
+
+
+def idle_policy(simulation):
+    """Ne touche à rien : le joueur reste au centre."""
+    return NO_KEYS
+
+
+class ScriptedInput:
+    """
+    Rejoue une suite de segments (nombre de pas, touches enfoncées) ;
+    après le dernier segment, plus aucune touche n'est enfoncée.
+    """
+    def __init__(self, segments):
+        self.segments = [(steps, KeyState(keys)) for steps, keys in segments]
+        self._index = 0
+        self._remaining = self.segments[0][0] if self.segments else 0
+
+    def __call__(self, simulation):
+        while self._index < len(self.segments) and self._remaining <= 0:
+            self._index += 1
+            if self._index < len(self.segments):
+                self._remaining = self.segments[self._index][0]
+        if self._index >= len(self.segments):
+            return NO_KEYS
+        self._remaining -= 1
+        return self.segments[self._index][1]
+
+
+class DodgeBot:
+    """
+    Bot simple : s'éloigne des menaces proches (somme des répulsions en 1/d²)
+    tout en restant attiré vers le centre de l'arène.
+    """
+    def __init__(self, danger_radius=150, center_pull=0.00002):
+        self.danger_radius = danger_radius
+        self.center_pull = center_pull
+        self._states = {}
+
+    def __call__(self, simulation):
+        cx, cy = simulation.player.rect.center
+        # Sommes exactes (fsum) : le résultat ne dépend pas de l'ordre des sprites,
+        # qui diffère entre grille spatiale et parcours linéaire
+        pushes_x = [(main.WORLD_WIDTH / 2 - cx) * self.center_pull]
+        pushes_y = [(main.WORLD_HEIGHT / 2 - cy) * self.center_pull]
+        for group in (simulation.zombies, simulation.meteorites):
+            for sprite in group.query_radius((cx, cy), self.danger_radius):
+                dx = cx - sprite.rect.centerx
+                dy = cy - sprite.rect.centery
+                distance_sq = max(dx * dx + dy * dy, 1)
+                pushes_x.append(dx / distance_sq)
+                pushes_y.append(dy / distance_sq)
+        push_x, push_y = math.fsum(pushes_x), math.fsum(pushes_y)
+        pressed = []
+        threshold = 0.001
+        if push_x < -threshold: pressed.append(MOVE_KEYS['left'])
+        elif push_x > threshold: pressed.append(MOVE_KEYS['right'])
+        if push_y < -threshold: pressed.append(MOVE_KEYS['up'])
+        elif push_y > threshold: pressed.append(MOVE_KEYS['down'])
+        key = tuple(pressed)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = KeyState(pressed)
+        return state
+
+
+POLICIES = {
+    'idle': lambda: idle_policy,
+    'dodge': DodgeBot,
+}
+
+
+def run_game(policy=idle_policy, seed=None, max_seconds=None, engine_name=None, lod_level=0):
+    """
+    Joue une partie sans affichage jusqu'à la mort du joueur (ou `max_seconds`
+    de temps simulé), au niveau de détail `lod_level`. Retourne un
+    dictionnaire de résultats.
+    """
+    simulation = main.Simulation(engine_name, seed)
+    simulation.lod_level = lod_level
+    max_steps = math.ceil(max_seconds * 1000 / main.FIXED_DELTA_TIME) if max_seconds else None
+    while not simulation.game_over and (max_steps is None or simulation.steps < max_steps):
+        simulation.step(policy(simulation))
+    return {
+        'seed': simulation.seed,
+        'score': round(simulation.score, 3),
+        'steps': simulation.steps,
+        'cause_of_death': simulation.cause_of_death,
+        'peak_zombies': simulation.peak_zombies,
+        'peak_meteorites': simulation.peak_meteorites,
+        'peak_entities': simulation.peak_entities,
+        'skipped_spawns': simulation.skipped_spawns,
+        'broad_tests': simulation.collision_stats.total_broad,
+        'narrow_tests': simulation.collision_stats.total_narrow,
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Parties sans affichage, à vitesse maximale")
+    parser.add_argument('--games', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0, help="graine de la première partie")
+    parser.add_argument('--bot', choices=sorted(POLICIES), default='dodge')
+    parser.add_argument('--max-seconds', type=float, default=None, help="durée simulée maximale par partie")
+    parser.add_argument('--engine', choices=main.ENTITY_ENGINES, default=main.ENTITY_ENGINE)
+    parser.add_argument('--lod', type=int, choices=range(len(main.LOD_LEVELS)), default=0,
+                        help="niveau de détail de la simulation (0 : le plus fin)")
+    parser.add_argument('--obstacles', choices=sorted(main.OBSTACLE_PRESETS), default=None,
+                        help="obstacles prédéfinis dans l'arène (voir main.OBSTACLE_PRESETS)")
+    args = parser.parse_args()
+
+    if args.obstacles:
+        main.ARENA_OBSTACLES = main.obstacle_preset(args.obstacles)
+    main.init_headless()
+    total_steps = 0
+    start = time.perf_counter()
+    for game in range(args.games):
+        result = run_game(POLICIES[args.bot](), args.seed + game, args.max_seconds, args.engine, args.lod)
+        total_steps += result['steps']
+        print(result)
+    elapsed = time.perf_counter() - start
+    print(f"{args.games} partie(s), {total_steps} pas en {elapsed:.2f} s : "
+          f"{total_steps / elapsed:.0f} pas/s ({total_steps / elapsed / main.FPS:.0f}x le temps réel)")
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -1,11 +1,16 @@
 import pygame
 import random
 import sys
+import argparse
 import math
 import os
+from collections import OrderedDict
+from concurrent import futures
 
-# --- Initialisation de Pygame ---
-pygame.init()
+import asset_pack
+from flow_field import FlowField
+from profiler import FrameProfiler
+from spatial_hash import LinearGroup, SpatialGroup
 
 # --- Constantes ---
 
@@ -14,11 +19,37 @@ SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 GAME_TITLE = "Zombie Survival + Meteors Mania!"
 
+# --- Monde ---
+# Arène de jeu ; plus grande que l'écran, la caméra suit le joueur
+WORLD_WIDTH = SCREEN_WIDTH
+WORLD_HEIGHT = SCREEN_HEIGHT
+# Fond découpé en morceaux carrés construits à la demande (voir ChunkedBackground)
+BACKGROUND_CHUNK_SIZE = 256
+BACKGROUND_MAX_CHUNKS = 48 # Morceaux gardés en mémoire au plus (> morceaux visibles)
+# Obstacles fixes de l'arène : rectangles (x, y, largeur, hauteur) que le
+# joueur ne traverse pas et que les traqueurs contournent (champ de flux)
+ARENA_OBSTACLES = ()
+# Obstacles prédéfinis (--obstacles) : rectangles en fractions de l'arène,
+# le centre (départ du joueur) restant libre
+OBSTACLE_PRESETS = {
+    'aucun': (),
+    'piliers': ((0.22, 0.22, 0.06, 0.08), (0.72, 0.22, 0.06, 0.08),
+                (0.22, 0.70, 0.06, 0.08), (0.72, 0.70, 0.06, 0.08)),
+    'couloirs': ((0.15, 0.28, 0.70, 0.04), (0.15, 0.68, 0.70, 0.04)),
+}
+FLOW_FIELD_CELL_SIZE = 32 # Côté d'une cellule du champ de flux (pixels)
+FLOW_FIELD_RADIUS = 24    # Portée du champ autour du joueur (cellules) ; au-delà, poursuite directe
+# Zombies et météorites disparaissent à plus de cette distance (pixels) de la
+# zone vue par la caméra : leur nombre ne croît pas avec la taille de l'arène
+# (None : seulement en sortant de l'arène)
+DESPAWN_DISTANCE = 600
+
 # Couleurs
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 RED = (255, 0, 0)
 GREEN = (0, 255, 0)
+OBSTACLE_COLOR = (70, 60, 50)
 BLUE = (0, 0, 255)
 GRAY = (128, 128, 128)
 MAGENTA_FALLBACK = (255, 0, 255) # Pour images manquantes
@@ -46,9 +77,30 @@ METEORITE_MAX_SPEED = 6
 METEORITE_DIAG_FACTOR_MIN = 0.3 # Influence l'angle des diagonales
 METEORITE_DIAG_FACTOR_MAX = 0.7
 METEORITE_TYPES = ['straight', 'diag_left', 'diag_right']
+METEORITE_IMAGES = {
+    'straight': 'meteorite_straight.png',
+    'diag_left': 'meteorite_diag_gauche.png',
+    'diag_right': 'meteorite_diag_droite.png',
+}
+
+# Directions des images des personnages
+DIRECTIONS = ('nord', 'sud', 'est', 'ouest')
+# Rotation des météorites : images tournées précalculées (voir AssetCache.get_rotations)
+METEORITE_ROTATION_STEPS = 36    # Angles distincts (pas de 10°) ; 1 : pas de rotation
+METEORITE_ROTATION_BUDGET = 4 * 1024 * 1024 # Octets au plus pour toutes les images tournées
+METEORITE_SPIN_FACTOR = 0.5      # Degrés de rotation par pixel de chute (sens selon la dérive)
 
 # Gameplay
 FPS = 60
+# Pas fixe de la simulation : un pas = une image à FPS (en millisecondes)
+FIXED_DELTA_TIME = 1000 / FPS
+MAX_STEPS_PER_FRAME = 5 # Évite la spirale de rattrapage si l'affichage rame
+# Les vitesses sont exprimées en pixels par 1/60 s, quel que soit le pas de simulation
+SPEED_TIME_UNIT = 1000 / 60
+# Affichage : images sautées (jamais la simulation) quand la machine est chargée
+MAX_FRAME_SKIP = 4          # Images sautées d'affilée au maximum
+FRAME_SKIP_TOLERANCE = 1.25 # Image « en retard » : plus de 125% du budget de 1/FPS
+RENDER_FPS = None           # Cadence d'affichage maximale (None : FPS)
 INITIAL_ZOMBIE_SPAWN_DELAY = 1500 # ms
 MIN_ZOMBIE_SPAWN_DELAY = 250      # ms
 ZOMBIE_SPAWN_DECREASE_RATE = 40   # ms par intervalle de difficulté
@@ -60,49 +112,540 @@ METEORITE_SPAWN_DECREASE_RATE = 60   # ms par intervalle de difficulté
 
 DIFFICULTY_INCREASE_INTERVAL = 5000 # ms
 
+# Taille des cellules de la grille spatiale : un zombie ou une météorite
+# recouvre au plus 2x2 cellules
+SPATIAL_CELL_SIZE = max(METEORITE_WIDTH, ZOMBIE_WIDTH)
+
+# Moteur de simulation des zombies et météorites :
+# 'objects' (update() de chaque sprite) ou 'numpy' (vectorisé, voir vector_engine.py)
+ENTITY_ENGINES = ('objects', 'numpy')
+ENTITY_ENGINE = 'objects'
+
+# Grille spatiale pour les collisions : True / False pour l'imposer, None pour
+# ne l'utiliser qu'avec le moteur 'numpy' (avec 'objects', la revue de la
+# grille à chaque pas coûte plus que les requêtes linéaires qu'elle évite)
+SPATIAL_GRID = None
+
+# Affichage par rectangles modifiés : au-delà de cette fraction de l'écran
+# à mettre à jour, on repasse à un flip complet (moins coûteux dans ce cas)
+DIRTY_RECT_FULL_REDRAW_RATIO = 0.5
+
+# Réutilisation des zombies et météorites morts (voir EntityPool)
+ENTITY_POOLING = True
+
+# Niveaux de détail (LOD) de la simulation, du plus fin au plus grossier :
+# (période de mise à jour des traqueurs lointains en pas, part du budget d'entités).
+# Le niveau est choisi par LODGovernor selon le temps mesuré par image ; au
+# niveau 0 (part None), aucun budget : le jeu normal n'est jamais plafonné.
+LOD_LEVELS = ((1, None), (2, 0.75), (4, 0.5), (8, 0.35))
+LOD_TRACKER_DISTANCE = 400 # px entre centres : au-delà, un traqueur est « lointain »
+ENTITY_BUDGET = 300        # Zombies + météorites vivants au plus, au niveau 1 et au-delà (None : pas de limite)
+LOD_GOVERNOR = True        # Adapter le niveau à la machine pendant les parties en fenêtre
+LOD_RAISE_RATIO = 0.9      # Niveau suivant au-delà de 90% du budget de 1/FPS...
+LOD_LOWER_RATIO = 0.5      # ...niveau précédent en deçà de 50%
+LOD_HOLD_FRAMES = 30       # Images au moins entre deux changements de niveau
+LOD_SMOOTHING = 0.1        # Poids de la dernière image dans la moyenne glissante
+
+# Profileur d'images (touche F3) : actif dès le départ, et fichier où
+# l'exporter en quittant ('.csv' ou trace Chrome '.json')
+PROFILING = False
+PROFILE_PATH = None
+PROFILER_OVERLAY_REFRESH = 30 # Images entre deux recalculs de l'overlay
+# Phases mesurées, dans l'ordre d'une image
+PROFILER_PHASES = ('evenements', 'joueur', 'entites', 'apparitions', 'collisions_zombies',
+                   'collisions_meteorites', 'dessin', 'hud', 'affichage')
+
+# Dossier où enregistrer un replay de chaque partie jouée (None : pas d'enregistrement)
+REPLAY_DIR = None
+
+# Statistiques (caches, affichage, pool, niveau de détail...) affichées dans
+# la console à chaque fin de partie
+VERBOSE = False
+
+# Diffusion de la partie aux spectateurs (voir spectator.py) :
+# ('hôte', port) ou chemin d'un socket Unix ; None : pas de serveur
+SPECTATOR_ADDRESS = None
+
+# Threads qui lisent, décodent et redimensionnent les images au démarrage
+ASSET_LOADER_WORKERS = min(4, os.cpu_count() or 1)
+
 # --- Configuration de l'écran et Horloge ---
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption(GAME_TITLE)
+# L'écran n'est créé que par init_display() : importer ce module n'ouvre pas
+# de fenêtre, ce qui permet de faire tourner la simulation sans affichage.
+screen = None
+background_img = None
+asset_loader = None # AssetLoader du démarrage, si les images se chargent en tâche de fond
 clock = pygame.time.Clock()
 
 # --- Fonctions Utilitaires ---
 
-def load_image(filename, target_size=None):
+def _decode_image(filename, target_size=None, pack=None):
+    """
+    Première étape du chargement, sans besoin de la fenêtre (appelable depuis
+    un autre thread : pygame relâche le GIL pendant la lecture, le décodage et
+    le redimensionnement). Retourne une surface indépendante, ou None si
+    l'image n'a pas pu être chargée.
+    """
+    if pack is not None:
+        packed = pack.load(filename, target_size)
+        if packed is not None:
+            return packed.copy() # Copie : ne dépend plus du pack
+    filepath = os.path.join(os.path.dirname(__file__), filename)
+    try:
+        image = pygame.image.load(filepath)
+        if target_size:
+             image = pygame.transform.scale(image, target_size)
+        return image
+    except pygame.error as e:
+        print(f"Erreur: Impossible de charger/redimensionner '{filename}': {e}")
+        return None
+
+def _finish_image(image, target_size=None):
+    """
+    Seconde étape, dans le thread principal : conversion au format de l'écran
+    (si la fenêtre existe), ou surface de secours si le décodage a échoué.
+    """
+    if image is not None:
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha() # convert_alpha pour transparence
+        return image
+    fallback_size = target_size if target_size else (30, 30)
+    fallback_surface = pygame.Surface(fallback_size, pygame.SRCALPHA)
+    # Dessine un cercle gris comme fallback simple
+    try:
+        pygame.draw.circle(fallback_surface, GRAY, fallback_surface.get_rect().center, min(fallback_size)//2)
+    except Exception as draw_error:
+         print(f"Erreur dessin fallback: {draw_error}")
+         fallback_surface.fill(MAGENTA_FALLBACK) # Magenta si tout échoue
+    return fallback_surface
+
+def _load_image_from_disk(filename, target_size=None, pack=None):
     """
     Charge une image depuis un fichier, la convertit pour Pygame,
     la redimensionne optionnellement et gère les erreurs de chargement.
+    Si un pack pré-redimensionné est fourni et contient l'image, il est
+    utilisé à la place du PNG source. Sans fenêtre (simulation sans
+    affichage), l'image n'est pas convertie.
 
     Args:
         filename (str): Le nom du fichier image (doit être dans le même dossier).
         target_size (tuple, optional): (width, height) pour redimensionner. Défaut à None.
+        pack (asset_pack.AssetPack, optional): pack d'images à essayer en premier.
 
     Returns:
         pygame.Surface: La surface de l'image chargée (ou une surface de secours).
     """
-    filepath = os.path.join(os.path.dirname(__file__), filename)
-    try:
-        image = pygame.image.load(filepath).convert_alpha() # convert_alpha pour transparence
-        if target_size:
-             image = pygame.transform.scale(image, target_size)
-        return image
-    except pygame.error as e:
-        print(f"Erreur: Impossible de charger/redimensionner '{filename}': {e}")
-        fallback_size = target_size if target_size else (30, 30)
-        fallback_surface = pygame.Surface(fallback_size, pygame.SRCALPHA)
-        # Dessine un cercle gris comme fallback simple
-        try:
-            pygame.draw.circle(fallback_surface, GRAY, fallback_surface.get_rect().center, min(fallback_size)//2)
-        except Exception as draw_error:
-             print(f"Erreur dessin fallback: {draw_error}")
-             fallback_surface.fill(MAGENTA_FALLBACK) # Magenta si tout échoue
-        return fallback_surface
+    return _finish_image(_decode_image(filename, target_size, pack), target_size)
+
+class AssetCache:
+    """
+    Registre partagé des images du jeu.
+
+    Chaque couple (fichier, taille cible) n'est décodé, converti et redimensionné
+    qu'une seule fois ; toutes les instances de sprites reçoivent ensuite la même
+    surface (et le même masque de collision). Les compteurs `hits`/`misses`
+    permettent de vérifier qu'aucun accès disque n'a lieu pendant la partie :
+    après `preload()`, `misses` doit rester à 0.
+    Si un pack d'images (voir asset_pack.py) est disponible, il est préféré
+    aux PNG sources.
+    """
+    def __init__(self, pack=None):
+        self.pack = pack      # asset_pack.AssetPack ou None
+        self._surfaces = {}   # (filename, target_size) -> pygame.Surface
+        self._masks = {}      # (filename, target_size) -> pygame.mask.Mask
+        self._surface_masks = {} # pygame.Surface partagée -> pygame.mask.Mask
+        self._rotations = {}  # (filename, target_size, steps) -> (images, masques) tournés
+        self.rotation_bytes = 0 # Mémoire occupée par les images tournées (et leurs masques)
+        self.hits = 0         # Images servies depuis le cache
+        self.misses = 0       # Images chargées depuis le disque hors préchargement
+        self.preloaded = 0    # Images chargées pendant la phase de préchargement
+
+    @staticmethod
+    def _key(filename, target_size):
+        return (filename, tuple(target_size) if target_size else None)
+
+    def __contains__(self, key):
+        return key in self._surfaces
+
+    def _load(self, key):
+        """Charge une image depuis le disque et calcule son masque."""
+        return self._store(key, _load_image_from_disk(*key, pack=self.pack))
+
+    def _store(self, key, surface):
+        """Range une image chargée (et son masque) dans le cache."""
+        mask = pygame.mask.from_surface(surface)
+        self._surfaces[key] = surface
+        self._masks[key] = mask
+        self._surface_masks[surface] = mask
+        return surface
+
+    def get(self, filename, target_size=None):
+        """Retourne la surface partagée pour (filename, target_size)."""
+        key = self._key(filename, target_size)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+        return self._load(key)
+
+    def get_mask(self, filename, target_size=None):
+        """Retourne le masque précalculé de l'image (la charge si besoin)."""
+        key = self._key(filename, target_size)
+        if key not in self._masks:
+            self.get(filename, target_size)
+        return self._masks[key]
+
+    def mask_for(self, surface):
+        """
+        Retourne le masque précalculé d'une surface du cache. Pour une surface
+        inconnue (image de secours), le masque est calculé sans être gardé.
+        """
+        mask = self._surface_masks.get(surface)
+        if mask is None:
+            mask = pygame.mask.from_surface(surface)
+        return mask
+
+    def get_rotations(self, filename, target_size, steps):
+        """
+        Retourne (images, masques) : l'image tournée de 0, 360/steps, 2*360/steps...
+        degrés (sens trigonométrique) et le masque de chaque angle, calculés une
+        seule fois. Chaque image tournée est plus grande que l'originale (coins).
+        """
+        key = (*self._key(filename, target_size), steps)
+        rotations = self._rotations.get(key)
+        if rotations is None:
+            base = self.get(filename, target_size)
+            frames = [base]
+            for i in range(1, steps):
+                frames.append(pygame.transform.rotozoom(base, i * 360 / steps, 1))
+            masks = [self._surface_masks.get(frame) or pygame.mask.from_surface(frame) for frame in frames]
+            for frame, mask in zip(frames[1:], masks[1:]):
+                self._surface_masks[frame] = mask
+                width, height = frame.get_size()
+                self.rotation_bytes += frame.get_pitch() * height + width * height // 8
+            rotations = self._rotations[key] = (tuple(frames), tuple(masks))
+        return rotations
+
+    def preload(self, manifest):
+        """
+        Charge d'avance toutes les images listées dans `manifest`
+        (itérable de couples (filename, target_size)). Ces chargements
+        ne sont pas comptés comme des `misses`.
+        """
+        for filename, target_size in manifest:
+            key = self._key(filename, target_size)
+            if key not in self._surfaces:
+                self._load(key)
+                self.preloaded += 1
+
+    def add_decoded(self, key, image):
+        """Termine dans le thread principal une image décodée ailleurs (voir AssetLoader)."""
+        if key not in self._surfaces:
+            self._store(key, _finish_image(image, key[1]))
+            self.preloaded += 1
+
+    def stats(self):
+        """Retourne les compteurs du cache sous forme de dictionnaire."""
+        return {
+            'entries': len(self._surfaces),
+            'preloaded': self.preloaded,
+            'hits': self.hits,
+            'misses': self.misses,
+            'rotation_frames': sum(len(frames) for frames, _ in self._rotations.values()),
+            'rotation_bytes': self.rotation_bytes,
+        }
+
+# Instance unique partagée par tous les sprites
+assets = AssetCache(asset_pack.open_pack())
+
+# Liste de toutes les images utilisées en jeu, chargées avant la première partie
+ASSET_MANIFEST = [
+    ('background.png', (SCREEN_WIDTH, SCREEN_HEIGHT)),
+    *[(f'player_{d}.png', PLAYER_TARGET_SIZE) for d in DIRECTIONS],
+    *[(f'zombie_{d}.png', ZOMBIE_TARGET_SIZE) for d in DIRECTIONS],
+    *[(f'zombie_tracking_{d}.png', ZOMBIE_TARGET_SIZE) for d in DIRECTIONS],
+    *[(filename, METEORITE_TARGET_SIZE) for filename in METEORITE_IMAGES.values()],
+]
+
+def meteorite_rotation_steps():
+    """
+    Nombre d'angles précalculés par image de météorite : METEORITE_ROTATION_STEPS,
+    réduit si besoin pour que toutes les images tournées tiennent dans
+    METEORITE_ROTATION_BUDGET octets.
+    """
+    width, height = METEORITE_TARGET_SIZE
+    side = math.ceil(math.hypot(width, height)) + 2   # Plus grande image tournée (à 45°)
+    frame_bytes = side * side * 4 + side * side // 8  # Surface 32 bits + masque 1 bit
+    fit = METEORITE_ROTATION_BUDGET // (frame_bytes * len(set(METEORITE_IMAGES.values())))
+    return max(1, min(METEORITE_ROTATION_STEPS, fit))
+
+class AssetLoader:
+    """
+    Préchargement des images en tâche de fond.
+
+    Lecture des fichiers, décodage des PNG et redimensionnement se font dans
+    un pool de `workers` threads. Le thread principal, à chaque `poll()`
+    (entre deux images de l'écran de chargement), range dans le cache les
+    images prêtes : conversion au format de l'écran et masque, qui doivent
+    rester dans ce thread. Viennent ensuite les images tournées des
+    météorites, une image source par `poll()`.
+    """
+    def __init__(self, cache, manifest, workers=ASSET_LOADER_WORKERS):
+        self.cache = cache
+        keys = [key for key in dict.fromkeys(cache._key(*entry) for entry in manifest) if key not in cache]
+        self._executor = futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='assets')
+        self._pending = {self._executor.submit(_decode_image, *key, cache.pack): key for key in keys}
+        self._rotations = list(dict.fromkeys(METEORITE_IMAGES.values()))
+        self.total = len(self._pending) + len(self._rotations)
+        self.loaded = 0
+
+    @property
+    def progress(self):
+        """Part du travail terminée (0..1)."""
+        return self.loaded / self.total if self.total else 1.0
+
+    @property
+    def done(self):
+        return self.loaded == self.total
+
+    def poll(self, timeout=0):
+        """
+        Range dans le cache ce qui est prêt, en attendant au plus `timeout`
+        secondes qu'une image soit décodée. Retourne True quand tout est chargé.
+        """
+        if self._pending:
+            ready, _ = futures.wait(self._pending, timeout, futures.FIRST_COMPLETED)
+            for future in ready:
+                self.cache.add_decoded(self._pending.pop(future), future.result())
+                self.loaded += 1
+        elif self._rotations: # Images de base toutes en cache : rotations
+            self.cache.get_rotations(self._rotations.pop(0), METEORITE_TARGET_SIZE, meteorite_rotation_steps())
+            self.loaded += 1
+        if self.done:
+            self._executor.shutdown(wait=False)
+        return self.done
+
+    def wait(self):
+        """Charge tout, en bloquant."""
+        while not self.poll(timeout=None):
+            pass
+
+def load_image(filename, target_size=None):
+    """
+    Retourne l'image demandée depuis le cache partagé `assets`
+    (chargée depuis le disque uniquement au premier appel).
+
+    Args:
+        filename (str): Le nom du fichier image (doit être dans le même dossier).
+        target_size (tuple, optional): (width, height) pour redimensionner. Défaut à None.
+
+    Returns:
+        pygame.Surface: La surface partagée (ne pas la modifier).
+    """
+    return assets.get(filename, target_size)
+
+_directional_images = {} # (prefix, target_size) -> dictionnaire partagé direction -> surface
+
+def load_directional_images(prefix, target_size):
+    """
+    Retourne le dictionnaire direction -> surface pour les images '<prefix>_<direction>.png'.
+    Le même dictionnaire est partagé par tous les sprites (ne pas le modifier).
+    """
+    key = (prefix, target_size)
+    images = _directional_images.get(key)
+    if images is None:
+        images = {d: load_image(f'{prefix}_{d}.png', target_size) for d in DIRECTIONS}
+        _directional_images[key] = images
+    return images
+
+class TextRenderer:
+    """
+    Rendu de texte avec caches.
+
+    - `match_font` n'est appelé qu'une fois (il parcourt les polices du système).
+    - Un `Font` est créé une seule fois par taille.
+    - Les surfaces des textes répétés sont gardées (cache LRU borné).
+    - Les nombres qui changent à chaque image (le score) sont composés à partir
+      d'un atlas de glyphes pré-rendus : quelques blits, aucun rendu de police.
+    """
+    ATLAS_CHARS = '0123456789.-'
+
+    def __init__(self, font_name='arial', max_cached_texts=128):
+        self.font_name = font_name
+        self.max_cached_texts = max_cached_texts
+        self._font_path = None
+        self._font_path_resolved = False
+        self._fonts = {}                       # size -> pygame.font.Font
+        self._texts = OrderedDict()            # (text, size, color) -> Surface
+        self._atlases = {}                     # (size, color) -> (Surface, {char: Rect})
+
+    def get_font(self, size):
+        """Retourne la police (mise en cache) pour une taille donnée."""
+        font = self._fonts.get(size)
+        if font is None:
+            if not self._font_path_resolved:
+                self._font_path = pygame.font.match_font(self.font_name)
+                self._font_path_resolved = True
+            font = pygame.font.Font(self._font_path, size)
+            self._fonts[size] = font
+        return font
+
+    def render(self, text, size, color):
+        """Retourne la surface du texte, rendue une seule fois par (texte, taille, couleur)."""
+        key = (text, size, color)
+        text_surface = self._texts.get(key)
+        if text_surface is not None:
+            self._texts.move_to_end(key)
+            return text_surface
+        text_surface = self.get_font(size).render(text, True, color)
+        self._texts[key] = text_surface
+        if len(self._texts) > self.max_cached_texts:
+            self._texts.popitem(last=False) # Retirer le moins récemment utilisé
+        return text_surface
+
+    def _get_atlas(self, size, color):
+        """Construit (une fois) l'atlas des glyphes numériques pour (taille, couleur)."""
+        key = (size, color)
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            font = self.get_font(size)
+            glyphs = [font.render(char, True, color) for char in self.ATLAS_CHARS]
+            width = sum(glyph.get_width() for glyph in glyphs)
+            height = max(glyph.get_height() for glyph in glyphs)
+            atlas_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            areas = {}
+            x = 0
+            for char, glyph in zip(self.ATLAS_CHARS, glyphs):
+                atlas_surface.blit(glyph, (x, 0))
+                areas[char] = pygame.Rect(x, 0, glyph.get_width(), glyph.get_height())
+                x += glyph.get_width()
+            atlas = (atlas_surface, areas)
+            self._atlases[key] = atlas
+        return atlas
+
+    def draw_number(self, surface, prefix, value, size, x, y, color, fmt='.2f'):
+        """
+        Affiche `prefix` suivi de `value` (formaté avec `fmt`), centré en haut sur (x, y).
+        Le préfixe vient du cache de textes, les chiffres de l'atlas de glyphes.
+        Retourne le rectangle occupé par le texte.
+        """
+        prefix_surface = self.render(prefix, size, color)
+        atlas_surface, areas = self._get_atlas(size, color)
+        digits = format(value, fmt)
+        width = prefix_surface.get_width()
+        for char in digits:
+            width += areas[char].width
+        left = int(x - width / 2)
+        text_rect = pygame.Rect(left, y, width, max(prefix_surface.get_height(), atlas_surface.get_height()))
+        surface.blit(prefix_surface, (left, y))
+        left += prefix_surface.get_width()
+        for char in digits:
+            area = areas[char]
+            surface.blit(atlas_surface, (left, y), area)
+            left += area.width
+        return text_rect
+
+# Instance unique partagée pour tous les textes du jeu
+text_renderer = TextRenderer()
 
 def draw_text(surface, text, size, x, y, color):
-    """Affiche du texte simple sur une surface donnée."""
-    font = pygame.font.Font(pygame.font.match_font('arial'), size)
-    text_surface = font.render(text, True, color)
+    """Affiche du texte simple sur une surface donnée ; retourne le rectangle occupé."""
+    text_surface = text_renderer.render(text, size, color)
     text_rect = text_surface.get_rect(midtop=(x, y))
     surface.blit(text_surface, text_rect)
+    return text_rect
+
+class CollisionStats:
+    """
+    Compteurs des tests de collision d'une partie, par pas de simulation (un
+    pas = deux requêtes : zombies puis météorites ; une image peut compter
+    plusieurs pas).
+    """
+    def __init__(self):
+        self.broad_tests = 0    # Tests rectangle contre rectangle
+        self.narrow_tests = 0   # Tests pixel par pixel (masques)
+        self.last_step = (0, 0) # (broad_tests, narrow_tests) du dernier pas terminé
+        self.steps = 0          # Pas archivés depuis la création
+        self.total_broad = 0
+        self.total_narrow = 0
+
+    def end_step(self):
+        """Archive les compteurs du pas qui se termine et les remet à zéro."""
+        self.last_step = (self.broad_tests, self.narrow_tests)
+        self.steps += 1
+        self.total_broad += self.broad_tests
+        self.total_narrow += self.narrow_tests
+        self.broad_tests = 0
+        self.narrow_tests = 0
+
+    def stats(self):
+        """Moyennes par pas depuis la création."""
+        steps = max(1, self.steps)
+        return {
+            'steps': self.steps,
+            'broad_per_step': round(self.total_broad / steps, 1),
+            'narrow_per_step': round(self.total_narrow / steps, 2),
+        }
+
+def spritecollide_mask(sprite, group, dokill, stats=None):
+    """
+    Comme `pygame.sprite.spritecollide(..., collide_mask)`, mais en deux phases :
+    une phase large par rectangles (boucle Python, `colliderect` en C), puis le
+    test pixel par pixel uniquement sur les sprites dont le rectangle chevauche
+    celui de `sprite`.
+    Les sprites doivent porter un attribut `mask` précalculé.
+    Si `group` est un `SpatialGroup`, la phase large ne regarde que les
+    sprites des cellules voisines au lieu de tout le groupe.
+    Les tests des deux phases sont comptés dans `stats` (CollisionStats) s'il est fourni.
+    """
+    if isinstance(group, SpatialGroup):
+        candidates = group.nearby(sprite.rect)
+        broad_tests = len(candidates)
+        colliderect = sprite.rect.colliderect
+        candidates = [other for other in candidates if colliderect(other.rect)]
+    else:
+        broad_tests = len(group)
+        candidates = pygame.sprite.spritecollide(sprite, group, False)
+    if stats is not None:
+        stats.broad_tests += broad_tests
+        stats.narrow_tests += len(candidates)
+    hits = [other for other in candidates if pygame.sprite.collide_mask(sprite, other)]
+    if dokill:
+        for other in hits:
+            other.kill()
+    return hits
+
+# --- Monde et caméra ---
+
+def world_rect():
+    """Rectangle de l'arène (coordonnées du monde)."""
+    return pygame.Rect(0, 0, WORLD_WIDTH, WORLD_HEIGHT)
+
+def obstacle_preset(name, world_size=None):
+    """Obstacles de OBSTACLE_PRESETS[name] en pixels, pour une arène de `world_size` (défaut : l'actuelle)."""
+    width, height = world_size or (WORLD_WIDTH, WORLD_HEIGHT)
+    return tuple((round(x * width), round(y * height), round(w * width), round(h * height))
+                 for x, y, w, h in OBSTACLE_PRESETS[name])
+
+def beyond_despawn_distance(rect, view):
+    """Vrai si `rect` est à plus de DESPAWN_DISTANCE de `view` (zone de la caméra, None : jamais)."""
+    distance = DESPAWN_DISTANCE
+    if view is None or distance is None:
+        return False
+    return (rect.right < view.left - distance or rect.left > view.right + distance or
+            rect.bottom < view.top - distance or rect.top > view.bottom + distance)
+
+def camera_view(center_x, center_y, view=None):
+    """
+    Zone du monde vue par la caméra (taille de l'écran) centrée sur
+    (center_x, center_y) sans sortir de l'arène. Met à jour `view` s'il est fourni.
+    """
+    if view is None:
+        view = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+    view.center = (center_x, center_y)
+    view.clamp_ip(world_rect())
+    return view
 
 # --- Classes du Jeu ---
 
@@ -112,16 +655,16 @@ class Player(pygame.sprite.Sprite):
         """Initialise le joueur, charge ses images et le positionne."""
         super().__init__()
         # Charger et redimensionner les images directionnelles
-        self.images = {
-            'nord': load_image('player_nord.png', PLAYER_TARGET_SIZE),
-            'sud': load_image('player_sud.png', PLAYER_TARGET_SIZE),
-            'est': load_image('player_est.png', PLAYER_TARGET_SIZE),
-            'ouest': load_image('player_ouest.png', PLAYER_TARGET_SIZE)
-        }
+        self.images = load_directional_images('player', PLAYER_TARGET_SIZE)
         self.direction = 'sud' # Direction initiale
         self.image = self._get_initial_image()
-        self.rect = self.image.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+        self.mask = assets.mask_for(self.image) # Masque précalculé, changé avec l'image
+        self.rect = self.image.get_rect(center=(WORLD_WIDTH // 2, WORLD_HEIGHT // 2))
         self.speed = PLAYER_SPEED
+        # Position exacte (coin haut-gauche) ; `rect` en est l'arrondi au pixel.
+        # prev_* : position au pas précédent, pour l'interpolation à l'affichage.
+        self.pos_x, self.pos_y = float(self.rect.x), float(self.rect.y)
+        self.prev_x, self.prev_y = self.pos_x, self.pos_y
 
     def _get_initial_image(self):
         """Retourne l'image initiale ou une image de secours."""
@@ -138,8 +681,13 @@ class Player(pygame.sprite.Sprite):
                 fallback.fill(WHITE)
                 return fallback
 
-    def update(self, keys):
-        """Met à jour la position et l'image du joueur en fonction des touches."""
+    def update(self, keys, scale=1.0, obstacles=()):
+        """
+        Met à jour la position et l'image du joueur en fonction des touches.
+        `scale` : durée du pas en unités de SPEED_TIME_UNIT ; `obstacles` :
+        rectangles que le joueur ne peut pas traverser.
+        """
+        self.prev_x, self.prev_y = self.pos_x, self.pos_y
         move_x, move_y = 0, 0
         new_direction = self.direction
 
@@ -162,53 +710,104 @@ class Player(pygame.sprite.Sprite):
              if new_image: # Vérifier si l'image pour cette direction existe
                 self.direction = new_direction
                 self.image = new_image
+                self.mask = assets.mask_for(new_image)
                 # Important: garder le centre lors du changement d'image pour éviter les sauts
-                center = self.rect.center
-                self.rect = self.image.get_rect(center=center)
+                width, height = self.image.get_size()
+                self.pos_x += (self.rect.width - width) / 2
+                self.pos_y += (self.rect.height - height) / 2
+                self.rect.size = (width, height)
 
         # Appliquer le mouvement
-        self.rect.x += move_x
-        self.rect.y += move_y
-
-        # Garder le joueur dans l'écran
-        self.rect.left = max(0, self.rect.left)
-        self.rect.right = min(SCREEN_WIDTH, self.rect.right)
-        self.rect.top = max(0, self.rect.top)
-        self.rect.bottom = min(SCREEN_HEIGHT, self.rect.bottom)
-
-class Zombie(pygame.sprite.Sprite):
-    """Représente un zombie standard qui se déplace en ligne droite."""
+        start_x, start_y = self.pos_x, self.pos_y
+        self.pos_x += move_x * scale
+        self.pos_y += move_y * scale
+
+        # Garder le joueur dans l'arène
+        self.pos_x = max(0.0, min(WORLD_WIDTH - self.rect.width, self.pos_x))
+        self.pos_y = max(0.0, min(WORLD_HEIGHT - self.rect.height, self.pos_y))
+        self.rect.topleft = (self.pos_x, self.pos_y)
+
+        # Obstacle heurté : annuler le déplacement sur l'axe bloqué (glisse le long de l'autre)
+        if obstacles and self.rect.collidelist(obstacles) != -1:
+            self.rect.topleft = (self.pos_x, start_y)
+            if self.rect.collidelist(obstacles) != -1:
+                self.pos_x = start_x
+            self.rect.topleft = (self.pos_x, self.pos_y)
+            if self.rect.collidelist(obstacles) != -1:
+                self.pos_y = start_y
+            self.rect.topleft = (self.pos_x, self.pos_y)
+
+class PooledSprite(pygame.sprite.Sprite):
+    """
+    Sprite réutilisable : s'il appartient à un `EntityPool`, il y retourne à
+    sa mort (`kill()`) au lieu d'être laissé au ramasse-miettes, et sera
+    réinitialisé par `reset()` lors d'une prochaine apparition.
+
+    Comme pour le joueur, la position exacte est dans `pos_x`/`pos_y`
+    (flottants, coin haut-gauche) et `rect` en est l'arrondi au pixel ;
+    `prev_x`/`prev_y` gardent la position du pas précédent.
+
+    Les entités apparaissent autour de `area` (la zone vue par la caméra ;
+    l'écran par défaut), en coordonnées du monde. `update()` reçoit aussi
+    cette zone (`view`) : hors caméra, seul le déplacement est calculé, pas
+    les changements d'image (rattrapés dès que l'entité redevient visible).
+    """
     def __init__(self):
-        """Initialise le zombie, charge ses images, définit sa trajectoire."""
         super().__init__()
-        # Charger images
-        self.images = {
-            'nord': load_image('zombie_nord.png', ZOMBIE_TARGET_SIZE),
-            'sud': load_image('zombie_sud.png', ZOMBIE_TARGET_SIZE),
-            'est': load_image('zombie_est.png', ZOMBIE_TARGET_SIZE),
-            'ouest': load_image('zombie_ouest.png', ZOMBIE_TARGET_SIZE)
-        }
+        self.pool = None # EntityPool propriétaire (None : pas de réutilisation)
+        self.entity_id = 0 # Numéro donné à chaque apparition par la Simulation
+
+    def kill(self):
+        was_alive = self.alive()
+        super().kill()
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
+
+    def place(self, x, y):
+        """Pose l'entité en (x, y) sans mouvement à interpoler (apparition)."""
+        self.pos_x = self.prev_x = float(x)
+        self.pos_y = self.prev_y = float(y)
+        self.rect.topleft = (x, y)
+
+class Zombie(PooledSprite):
+    """Représente un zombie standard qui se déplace en ligne droite."""
+    despawn_margin = 50 # Distance hors écran au-delà de laquelle le zombie disparaît
+    snapshot_kind = 0   # Type d'entité dans le flux des spectateurs (spectator.py)
 
+    def __init__(self, rng=random, area=None):
+        """
+        Initialise le zombie, charge ses images, définit sa trajectoire.
+        `rng` : générateur aléatoire à utiliser (module `random` par défaut).
+        """
+        super().__init__()
+        # Images partagées (depuis le cache, pas de disque)
+        self.images = load_directional_images('zombie', ZOMBIE_TARGET_SIZE)
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(rng, area)
+
+    def reset(self, rng=random, area=None):
+        """Tire une nouvelle trajectoire (apparition, ou réutilisation depuis un EntityPool)."""
+        left, top, width, height = area or (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
         # Déterminer la position et vitesse de départ
-        spawn_side = random.randint(0, 3)
-        speed = random.uniform(ZOMBIE_MIN_SPEED, ZOMBIE_MAX_SPEED)
+        spawn_side = rng.randint(0, 3)
+        speed = rng.uniform(ZOMBIE_MIN_SPEED, ZOMBIE_MAX_SPEED)
         dx, dy = 0, 0
         start_x, start_y = 0, 0
         w, h = ZOMBIE_TARGET_SIZE # Dimensions pour le positionnement initial
 
-        # Calcul basé sur le côté d'apparition (0:Haut, 1:Bas, 2:Gauche, 3:Droite)
+        # Calcul basé sur le côté d'apparition (0:Haut, 1:Bas, 2:Gauche, 3:Droite) de la zone
         if spawn_side == 0: # Haut
-            start_x = random.randint(0, SCREEN_WIDTH - w); start_y = -h
-            dy = speed; dx = random.uniform(-0.5, 0.5) * speed # Principalement bas
+            start_x = left + rng.randint(0, width - w); start_y = top - h
+            dy = speed; dx = rng.uniform(-0.5, 0.5) * speed # Principalement bas
         elif spawn_side == 1: # Bas
-            start_x = random.randint(0, SCREEN_WIDTH - w); start_y = SCREEN_HEIGHT
-            dy = -speed; dx = random.uniform(-0.5, 0.5) * speed # Principalement haut
+            start_x = left + rng.randint(0, width - w); start_y = top + height
+            dy = -speed; dx = rng.uniform(-0.5, 0.5) * speed # Principalement haut
         elif spawn_side == 2: # Gauche
-            start_x = -w; start_y = random.randint(0, SCREEN_HEIGHT - h)
-            dx = speed; dy = random.uniform(-0.5, 0.5) * speed # Principalement droite
+            start_x = left - w; start_y = top + rng.randint(0, height - h)
+            dx = speed; dy = rng.uniform(-0.5, 0.5) * speed # Principalement droite
         else: # Droite
-            start_x = SCREEN_WIDTH; start_y = random.randint(0, SCREEN_HEIGHT - h)
-            dx = -speed; dy = random.uniform(-0.5, 0.5) * speed # Principalement gauche
+            start_x = left + width; start_y = top + rng.randint(0, height - h)
+            dx = -speed; dy = rng.uniform(-0.5, 0.5) * speed # Principalement gauche
 
         self.dx, self.dy = dx, dy # Stocker les vitesses pour l'update
 
@@ -223,43 +822,52 @@ class Zombie(pygame.sprite.Sprite):
         if not self.image:
             print(f"Avertissement: Image manquante pour Zombie direction {self.direction}. Carré rouge.")
             self.image = pygame.Surface(ZOMBIE_TARGET_SIZE); self.image.fill(RED)
+        self.mask = assets.mask_for(self.image)
 
-        self.rect = self.image.get_rect(topleft=(start_x, start_y))
+        self.rect.size = self.image.get_size()
+        self.place(start_x, start_y)
 
-    def update(self, player): # Accepte 'player' pour cohérence, mais ne l'utilise pas
+    def update(self, player, scale=1.0, view=None, field=None, lod=None): # Accepte player, field et lod pour cohérence, sans les utiliser
         """Met à jour la position du zombie selon sa trajectoire initiale."""
-        self.rect.x += self.dx
-        self.rect.y += self.dy
-
-        # Supprimer le zombie s'il est trop loin hors de l'écran
-        margin = 50 # Marge de sécurité
-        if (self.rect.right < -margin or self.rect.left > SCREEN_WIDTH + margin or
-            self.rect.bottom < -margin or self.rect.top > SCREEN_HEIGHT + margin):
+        self.prev_x, self.prev_y = self.pos_x, self.pos_y
+        self.pos_x += self.dx * scale
+        self.pos_y += self.dy * scale
+        self.rect.topleft = (self.pos_x, self.pos_y)
+
+        # Supprimer le zombie s'il est trop loin hors de l'arène ou de la caméra
+        margin = self.despawn_margin # Marge de sécurité
+        if (self.rect.right < -margin or self.rect.left > WORLD_WIDTH + margin or
+            self.rect.bottom < -margin or self.rect.top > WORLD_HEIGHT + margin or
+            beyond_despawn_distance(self.rect, view)):
             self.kill() # Se retire de tous les groupes
 
-class TrackingZombie(pygame.sprite.Sprite):
+class TrackingZombie(PooledSprite):
     """Représente un zombie qui suit activement le joueur."""
-    def __init__(self):
-        """Initialise le zombie traqueur, charge ses images et le positionne."""
+    despawn_margin = 150
+    snapshot_kind = 1
+
+    def __init__(self, rng=random, area=None):
+        """Initialise le zombie traqueur, charge ses images et le positionne (tirages via `rng`)."""
         super().__init__()
-        # Charger images spécifiques
-        self.images = {
-            'nord': load_image('zombie_tracking_nord.png', ZOMBIE_TARGET_SIZE),
-            'sud': load_image('zombie_tracking_sud.png', ZOMBIE_TARGET_SIZE),
-            'est': load_image('zombie_tracking_est.png', ZOMBIE_TARGET_SIZE),
-            'ouest': load_image('zombie_tracking_ouest.png', ZOMBIE_TARGET_SIZE)
-        }
+        # Images spécifiques partagées (depuis le cache)
+        self.images = load_directional_images('zombie_tracking', ZOMBIE_TARGET_SIZE)
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(rng, area)
+
+    def reset(self, rng=random, area=None):
+        """Replace le traqueur sur un bord de `area` (apparition, ou réutilisation depuis un EntityPool)."""
+        left, top, width, height = area or (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
         self.speed = TRACKING_ZOMBIE_SPEED
         self.direction = 'sud' # Direction initiale par défaut
 
         # Position de départ aléatoire sur les bords (similaire à Zombie)
-        spawn_side = random.randint(0, 3)
+        spawn_side = rng.randint(0, 3)
         start_x, start_y = 0, 0
         w, h = ZOMBIE_TARGET_SIZE
-        if spawn_side == 0: start_x = random.randint(0,SCREEN_WIDTH-w); start_y = -h
-        elif spawn_side == 1: start_x = random.randint(0,SCREEN_WIDTH-w); start_y = SCREEN_HEIGHT
-        elif spawn_side == 2: start_x = -w; start_y = random.randint(0, SCREEN_HEIGHT-h)
-        else: start_x = SCREEN_WIDTH; start_y = random.randint(0, SCREEN_HEIGHT-h)
+        if spawn_side == 0: start_x = left + rng.randint(0, width-w); start_y = top - h
+        elif spawn_side == 1: start_x = left + rng.randint(0, width-w); start_y = top + height
+        elif spawn_side == 2: start_x = left - w; start_y = top + rng.randint(0, height-h)
+        else: start_x = left + width; start_y = top + rng.randint(0, height-h)
 
         # Définir l'image initiale ou fallback
         self.image = self.images.get(self.direction)
@@ -268,16 +876,46 @@ class TrackingZombie(pygame.sprite.Sprite):
             except StopIteration:
                  print("Avertissement: Aucune image zombie traqueur. Carré bleu.")
                  self.image = pygame.Surface(ZOMBIE_TARGET_SIZE); self.image.fill(BLUE)
+        self.mask = assets.mask_for(self.image)
 
-        self.rect = self.image.get_rect(topleft=(start_x, start_y))
+        self.rect.size = self.image.get_size()
+        self.place(start_x, start_y)
         # dx/dy sont calculés dynamiquement dans update
 
-    def update(self, player):
-        """Met à jour la position et l'image du zombie pour suivre le joueur."""
-        # Calculer vecteur direction vers le centre du joueur
-        dx = player.rect.centerx - self.rect.centerx
-        dy = player.rect.centery - self.rect.centery
-        distance = math.hypot(dx, dy) # Distance euclidienne
+    def update(self, player, scale=1.0, view=None, field=None, lod=None):
+        """
+        Met à jour la position et l'image du zombie pour suivre le joueur.
+        Avec un champ de flux (`field`, obstacles dans l'arène), vise le
+        centre de la cellule suivante du chemin plutôt que le joueur.
+        `lod` : (période, pas, distance) ; plus loin que `distance` du joueur,
+        le traqueur ne bouge qu'un pas sur `période` (décalé selon son numéro),
+        d'autant plus loin (None : à chaque pas).
+        """
+        self.prev_x, self.prev_y = self.pos_x, self.pos_y
+        center_x = self.pos_x + self.rect.width / 2
+        center_y = self.pos_y + self.rect.height / 2
+        # Centre du joueur (positions exactes)
+        player_x = player.pos_x + player.rect.width / 2
+        player_y = player.pos_y + player.rect.height / 2
+        if lod is not None:
+            period, step, far = lod
+            dx = player_x - center_x
+            dy = player_y - center_y
+            if dx * dx + dy * dy > far * far:
+                if (step + self.entity_id) % period:
+                    # Rattrapé à sa prochaine mise à jour, mais supprimé au même pas que
+                    # dans le moteur NumPy
+                    self.despawn_if_far(view)
+                    return
+                scale *= period
+        target = field.next_target(center_x, center_y) if field is not None else None
+        if target is None:
+            target = (player_x, player_y)
+        # Calculer vecteur direction vers la cible
+        dx = target[0] - center_x
+        dy = target[1] - center_y
+        # Distance euclidienne (sqrt plutôt que hypot : même arrondi que le moteur NumPy)
+        distance = math.sqrt(dx * dx + dy * dy)
 
         if distance > 0: # Éviter division par zéro
             # Normaliser le vecteur (longueur 1)
@@ -289,10 +927,12 @@ class TrackingZombie(pygame.sprite.Sprite):
             move_y = norm_dy * self.speed
 
             # Appliquer le déplacement
-            self.rect.x += move_x
-            self.rect.y += move_y
+            self.pos_x += move_x * scale
+            self.pos_y += move_y * scale
+            self.rect.topleft = (self.pos_x, self.pos_y)
 
-            # --- Mise à jour de l'image directionnelle ---
+        # --- Mise à jour de l'image directionnelle (inutile hors caméra) ---
+        if distance > 0 and (view is None or view.colliderect(self.rect)):
             new_direction = self.direction
             # Déterminer la direction principale du mouvement
             if abs(move_y) > abs(move_x): # Vertical dominant
@@ -303,76 +943,207 @@ class TrackingZombie(pygame.sprite.Sprite):
 
             # Changer l'image si la direction a changé
             if new_direction != self.direction:
-                new_image = self.images.get(new_direction)
-                if new_image:
-                    self.direction = new_direction
-                    self.image = new_image
-                    # Garder le centre constant
-                    center = self.rect.center
-                    self.rect = self.image.get_rect(center=center)
-
-        # Supprimer si trop loin (peut arriver si le joueur est très rapide)
-        margin = 150
-        if (self.rect.right < -margin or self.rect.left > SCREEN_WIDTH + margin or
-            self.rect.bottom < -margin or self.rect.top > SCREEN_HEIGHT + margin):
+                self.set_direction(new_direction)
+
+        self.despawn_if_far(view)
+
+    def despawn_if_far(self, view=None):
+        """Supprime le zombie s'il est trop loin (peut arriver si le joueur est très rapide)."""
+        margin = self.despawn_margin
+        if (self.rect.right < -margin or self.rect.left > WORLD_WIDTH + margin or
+            self.rect.bottom < -margin or self.rect.top > WORLD_HEIGHT + margin or
+            beyond_despawn_distance(self.rect, view)):
             self.kill()
 
-class Meteorite(pygame.sprite.Sprite):
-    """Représente une météorite tombant du ciel avec différentes trajectoires."""
-    def __init__(self, meteor_type='straight'):
+    def set_direction(self, new_direction):
+        """Change l'image (et son masque) selon la direction, en gardant le centre."""
+        new_image = self.images.get(new_direction)
+        if new_image:
+            self.direction = new_direction
+            self.image = new_image
+            self.mask = assets.mask_for(new_image)
+            # Garder le centre constant
+            width, height = new_image.get_size()
+            self.pos_x += (self.rect.width - width) / 2
+            self.pos_y += (self.rect.height - height) / 2
+            self.rect.size = (width, height)
+            self.rect.topleft = (self.pos_x, self.pos_y)
+
+class Meteorite(PooledSprite):
+    """
+    Représente une météorite tombant du ciel avec différentes trajectoires.
+    Elle tourne sur elle-même : l'image (et le masque) de l'angle courant est
+    prise parmi les images tournées précalculées, sans rotation pendant la partie.
+    `pos_x`/`pos_y` restent le coin de l'image non tournée ; `rect` (taille de
+    l'image tournée) est centré dessus grâce à `offset_x`/`offset_y`, si bien
+    qu'un changement d'image ne déplace jamais la météorite.
+    """
+    despawn_margin = 10 # Marge sous le bas de l'arène
+    snapshot_kind = 2
+
+    def __init__(self, meteor_type='straight', rng=random, area=None):
         """
         Initialise une météorite d'un type donné ('straight', 'diag_left', 'diag_right').
-        Charge l'image appropriée et définit la trajectoire.
+        Charge l'image appropriée et définit la trajectoire (tirages via `rng`).
         """
         super().__init__()
-        self.meteor_type = meteor_type
-
-        # Charger l'image et définir la taille cible selon le type
-        if self.meteor_type == 'diag_left':
-            image_file = 'meteorite_diag_gauche.png'
-            target_size = METEORITE_TARGET_SIZE # Adapter si tailles différentes
-        elif self.meteor_type == 'diag_right':
-            image_file = 'meteorite_diag_droite.png'
-            target_size = METEORITE_TARGET_SIZE
-        else: # 'straight' ou type inconnu
-            image_file = 'meteorite_straight.png'
-            target_size = METEORITE_TARGET_SIZE
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(meteor_type, rng, area)
 
-        self.image = load_image(image_file, target_size)
-        self.rect = self.image.get_rect()
+    def reset(self, meteor_type='straight', rng=random, area=None):
+        """Choisit l'image et tire la trajectoire (apparition, ou réutilisation depuis un EntityPool)."""
+        left, top, width, height = area or (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.meteor_type = meteor_type
 
-        # Position de départ aléatoire en haut, hors de l'écran
-        self.rect.x = random.randint(0, SCREEN_WIDTH - self.rect.width)
-        self.rect.y = random.randint(-150, -self.rect.height - 10) # Commence bien au-dessus
+        # Images tournées partagées selon le type ('straight' pour un type inconnu)
+        image_file = METEORITE_IMAGES.get(self.meteor_type, METEORITE_IMAGES['straight'])
+        self.frames, self.masks = assets.get_rotations(image_file, METEORITE_TARGET_SIZE,
+                                                       meteorite_rotation_steps())
+        self.angle = 0.0
+        self.frame = 0
+        self.image = self.frames[0]
+        self.mask = self.masks[0]
+        self.rect.size = self.image.get_size()
+        self.offset_x = self.offset_y = 0.0
+
+        # Position de départ aléatoire au-dessus de la zone, hors de vue
+        start_x = left + rng.randint(0, width - self.rect.width)
+        start_y = top + rng.randint(-150, -self.rect.height - 10) # Commence bien au-dessus
+        self.place(start_x, start_y)
 
         # Définir la vitesse verticale (dy) et horizontale (dx) selon le type
-        self.dy = random.uniform(METEORITE_MIN_SPEED, METEORITE_MAX_SPEED)
-        diag_factor = random.uniform(METEORITE_DIAG_FACTOR_MIN, METEORITE_DIAG_FACTOR_MAX)
+        self.dy = rng.uniform(METEORITE_MIN_SPEED, METEORITE_MAX_SPEED)
+        diag_factor = rng.uniform(METEORITE_DIAG_FACTOR_MIN, METEORITE_DIAG_FACTOR_MAX)
 
         if self.meteor_type == 'diag_left':
             self.dx = -diag_factor * self.dy # Vers la gauche, proportionnel à dy
         elif self.meteor_type == 'diag_right':
             self.dx = diag_factor * self.dy  # Vers la droite, proportionnel à dy
         else: # 'straight'
-            self.dx = random.uniform(-0.3, 0.3) # Très faible dérive aléatoire
-
-    def update(self):
-        """Met à jour la position de la météorite."""
-        self.rect.y += self.dy
-        self.rect.x += self.dx
-
-        # Supprimer si sorti par le bas de l'écran
-        if self.rect.top > SCREEN_HEIGHT + 10: # Marge de 10px
+            self.dx = rng.uniform(-0.3, 0.3) # Très faible dérive aléatoire
+
+        # Rotation proportionnelle à la vitesse de chute, dans le sens de la dérive
+        self.spin = METEORITE_SPIN_FACTOR * (self.dy if self.dx >= 0 else -self.dy)
+
+    def update(self, scale=1.0, view=None):
+        """Met à jour la position (la dérive sous-pixel s'accumule) et l'angle de la météorite."""
+        self.prev_x, self.prev_y = self.pos_x, self.pos_y
+        self.pos_x += self.dx * scale
+        self.pos_y += self.dy * scale
+        self.angle = (self.angle + self.spin * scale) % 360.0
+        self.rect.topleft = (self.pos_x + self.offset_x, self.pos_y + self.offset_y)
+        # Image de l'angle courant, seulement si visible (l'angle avance de toute façon)
+        if view is None or view.colliderect(self.rect):
+            frame = int(self.angle * len(self.frames) / 360.0) % len(self.frames)
+            if frame != self.frame:
+                self.set_frame(frame)
+
+        # Supprimer si sorti par le bas de l'arène, ou trop loin de la caméra
+        if self.rect.top > WORLD_HEIGHT + self.despawn_margin or beyond_despawn_distance(self.rect, view):
             self.kill()
         # Optionnel: Supprimer si sorti par les côtés (utile pour diagonales)
-        # if self.rect.right < -10 or self.rect.left > SCREEN_WIDTH + 10:
+        # if self.rect.right < -10 or self.rect.left > WORLD_WIDTH + 10:
         #     self.kill()
 
+    def set_frame(self, frame):
+        """Passe à l'image tournée `frame` (et son masque), centrée sur l'image non tournée."""
+        self.frame = frame
+        self.image = self.frames[frame]
+        self.mask = self.masks[frame]
+        base_width, base_height = self.frames[0].get_size()
+        width, height = self.image.get_size()
+        self.offset_x = (base_width - width) / 2
+        self.offset_y = (base_height - height) / 2
+        self.rect.size = (width, height)
+        self.rect.topleft = (self.pos_x + self.offset_x, self.pos_y + self.offset_y)
+
+
+class EntityPool:
+    """
+    Listes libres par type d'entité : un zombie ou une météorite mort est
+    gardé puis réinitialisé (`reset`) à la prochaine apparition de son type,
+    au lieu d'allouer un nouveau sprite et de laisser l'ancien au
+    ramasse-miettes.
+
+    Les sprites morts ne redeviennent disponibles qu'après `recycle()`
+    (appelé une fois par pas de simulation) : un sprite tué pendant un pas
+    ne peut pas être réutilisé avant que tout le monde (moteur vectorisé
+    compris) ait constaté sa disparition.
+    """
+    def __init__(self, enabled=True):
+        self.enabled = enabled # False : compteurs seulement, pas de réutilisation
+        self._free = {}        # classe -> [sprites prêts à resservir]
+        self._released = []    # Morts depuis le dernier recycle()
+        self.hits = 0          # Apparitions servies par un sprite réutilisé
+        self.misses = 0        # Apparitions ayant dû créer un sprite
+        self.live = 0          # Entités vivantes issues du pool
+        self.peak_live = 0
+
+    def acquire(self, cls, *args):
+        """Retourne une entité de type `cls` initialisée avec `args` (réutilisée si possible)."""
+        free = self._free.get(cls)
+        if free:
+            sprite = free.pop()
+            sprite.reset(*args)
+            self.hits += 1
+        else:
+            sprite = cls(*args)
+            sprite.pool = self
+            self.misses += 1
+        self.live += 1
+        if self.live > self.peak_live:
+            self.peak_live = self.live
+        return sprite
+
+    def release(self, sprite):
+        """Appelé par `PooledSprite.kill()`."""
+        self.live -= 1
+        if self.enabled:
+            self._released.append(sprite)
+
+    def recycle(self):
+        """Rend réutilisables les sprites morts depuis le dernier appel."""
+        if self._released:
+            for sprite in self._released:
+                self._free.setdefault(type(sprite), []).append(sprite)
+            self._released.clear()
+
+    def stats(self):
+        """Compteurs du pool sous forme de dictionnaire."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'live': self.live,
+            'peak_live': self.peak_live,
+            'free': sum(len(free) for free in self._free.values()),
+        }
+
 
 # --- Écran de Game Over ---
 
-def show_game_over_screen(current_screen, score):
-    """Affiche l'écran de fin de partie et attend une action."""
+def draw_loading_screen(current_screen, progress):
+    """Affiche l'écran de chargement : barre de progression (`progress` de 0 à 1)."""
+    current_screen.fill(BLACK)
+    draw_text(current_screen, GAME_TITLE, 48, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 4, GREEN)
+    bar = pygame.Rect(0, 0, SCREEN_WIDTH // 2, 24)
+    bar.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+    pygame.draw.rect(current_screen, WHITE, bar, 2)
+    filled = bar.inflate(-8, -8)
+    filled.width = round(filled.width * progress)
+    pygame.draw.rect(current_screen, GREEN, filled)
+    draw_text(current_screen, f"Chargement... {progress:.0%}", 18, SCREEN_WIDTH / 2, bar.bottom + 16, WHITE)
+    pygame.display.flip()
+
+def draw_menu_screen(current_screen):
+    """Affiche l'écran titre (la session attend ensuite une touche)."""
+    current_screen.fill(BLACK) # Fond noir simple
+    draw_text(current_screen, GAME_TITLE, 48, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 4, GREEN)
+    draw_text(current_screen, "Flèches ou ZQSD pour esquiver zombies et météorites", 22, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, WHITE)
+    draw_text(current_screen, "Appuyez sur 'Entrée' pour Jouer ou 'Q' pour Quitter", 18, SCREEN_WIDTH / 2, SCREEN_HEIGHT * 3 / 4, WHITE)
+    pygame.display.flip() # Mettre à jour l'écran
+
+def draw_game_over_screen(current_screen, score):
+    """Affiche l'écran de fin de partie (la session attend ensuite une action)."""
     # Option: Dessiner le fond du jeu derrière le texte ?
     # current_screen.blit(background_img, (0,0)) # Décommenter si background_img est accessible ici
 
@@ -382,166 +1153,918 @@ def show_game_over_screen(current_screen, score):
     draw_text(current_screen, "Appuyez sur 'R' pour Rejouer ou 'Q' pour Quitter", 18, SCREEN_WIDTH / 2, SCREEN_HEIGHT * 3 / 4, WHITE)
     pygame.display.flip() # Mettre à jour l'écran
 
-    waiting = True
-    while waiting:
-        clock.tick(FPS / 2) # Moins de FPS ici, pas besoin de 60
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_q: # Quitter
-                    pygame.quit()
-                    sys.exit()
-                if event.key == pygame.K_r: # Rejouer
-                    waiting = False # Sortir de la boucle pour relancer game_loop
-
-# --- Chargement Image de Fond ---
-try:
-    background_img = load_image('background.png', (SCREEN_WIDTH, SCREEN_HEIGHT))
-except Exception as e: # Attrape aussi les erreurs potentielles de load_image
-    print(f"Erreur chargement background.png: {e}. Utilisation fond vert.")
-    background_img = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-    background_img.fill(GREEN)
-
-
-# --- Boucle Principale du Jeu ---
+# --- Initialisation ---
 
-def game_loop():
-    """Lance et gère une partie complète."""
+def init_display(wait=True):
+    """
+    Initialise Pygame, ouvre la fenêtre et lance le chargement des images
+    (converties pour l'écran). Avec `wait`, attend qu'elles soient toutes en
+    mémoire ; sinon le chargement continue en tâche de fond et `game_loop()`
+    affiche une barre de progression en attendant. Retourne la surface de l'écran.
+    """
+    global screen, asset_loader
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption(GAME_TITLE)
+
+    # --- Préchargement des Images ---
+    # Toutes les images sont décodées ici une fois pour toutes : aucun accès
+    # disque ne doit avoir lieu pendant la partie (voir assets.stats()).
+    asset_loader = AssetLoader(assets, ASSET_MANIFEST)
+    if wait:
+        asset_loader.wait()
+        _init_background()
+    return screen
+
+def _init_background():
+    """Image de fond, une fois les images chargées."""
+    global background_img
+    # --- Chargement Image de Fond ---
+    try:
+        background_img = load_image('background.png', (SCREEN_WIDTH, SCREEN_HEIGHT))
+    except Exception as e: # Attrape aussi les erreurs potentielles de load_image
+        print(f"Erreur chargement background.png: {e}. Utilisation fond vert.")
+        background_img = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        background_img.fill(GREEN)
+
+def init_headless():
+    """Précharge les images pour une simulation sans fenêtre (masques de collision)."""
+    AssetLoader(assets, ASSET_MANIFEST).wait()
+
+
+# --- Cœur de la Simulation ---
+
+def create_collision_group(engine_name=None):
+    """Groupe des zombies ou des météorites : grille spatiale ou parcours linéaire (voir SPATIAL_GRID)."""
+    use_grid = SPATIAL_GRID if SPATIAL_GRID is not None else (engine_name or ENTITY_ENGINE) == 'numpy'
+    return SpatialGroup(SPATIAL_CELL_SIZE) if use_grid else LinearGroup()
+
+def create_entity_engine(zombies, meteorites, engine_name=None):
+    """
+    Crée le moteur vectorisé si `engine_name` (défaut: ENTITY_ENGINE) vaut 'numpy'.
+    Retourne None pour le moteur 'objects' : les sprites se mettent alors
+    à jour eux-mêmes.
+    """
+    engine_name = engine_name or ENTITY_ENGINE
+    if engine_name == 'objects':
+        return None
+    import vector_engine # NumPy n'est requis que pour ce moteur
+    return vector_engine.VectorEngine(
+        (zombies, meteorites),
+        {Zombie: vector_engine.ZOMBIE, TrackingZombie: vector_engine.TRACKER,
+         Meteorite: vector_engine.METEORITE},
+        (WORLD_WIDTH, WORLD_HEIGHT), DESPAWN_DISTANCE)
+
+class Simulation:
+    """
+    Une partie complète, sans affichage ni clavier : apparitions, difficulté,
+    déplacements, collisions et score.
+
+    `step(keys)` avance la partie d'un pas fixe de `delta_time` millisecondes
+    (FIXED_DELTA_TIME par défaut). `keys` est tout objet indexable par les
+    constantes de touches Pygame (`pygame.key.get_pressed()`, un script, un bot).
+    Le score est le temps simulé, indépendant de l'horloge réelle.
+
+    Tout l'aléatoire de la partie passe par `self.rng`, initialisé avec `seed`
+    (tirée au hasard si absente) : même graine + mêmes touches = même partie.
+
+    L'arène fait WORLD_WIDTH x WORLD_HEIGHT ; `self.view` est la zone (taille
+    de l'écran) centrée sur le joueur que montre la caméra. Les entités
+    apparaissent autour d'elle, et hors d'elle ne font que se déplacer.
+    Avec des obstacles (ARENA_OBSTACLES), les traqueurs suivent un champ de
+    flux partagé (`self.flow_field`, refait quand le joueur change de cellule).
+
+    `self.lod_level` (indice dans LOD_LEVELS, 0 par défaut) règle le niveau de
+    détail : mises à jour espacées des traqueurs lointains et budget
+    d'entités réduit. C'est une entrée de la partie comme les touches (choisi
+    par LODGovernor, enregistré dans les replays), jamais lu sur l'horloge.
+    """
+    def __init__(self, engine_name=None, seed=None):
+        # --- Aléatoire propre à la partie ---
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+
+        # --- Initialisation de la partie ---
+        self.all_sprites = pygame.sprite.Group()   # Tous les éléments à dessiner
+        self.zombies = create_collision_group(engine_name)    # Pour collisions avec zombies
+        self.meteorites = create_collision_group(engine_name) # Pour collisions avec météorites
+
+        self.player = Player()
+        self.all_sprites.add(self.player)
+        self.view = camera_view(*self.player.rect.center)
+
+        # Obstacles fixes ; sans obstacle, les traqueurs vont droit sur le joueur
+        self.obstacles = [pygame.Rect(obstacle) for obstacle in ARENA_OBSTACLES]
+        self.flow_field = FlowField((WORLD_WIDTH, WORLD_HEIGHT), FLOW_FIELD_CELL_SIZE,
+                                    self.obstacles, FLOW_FIELD_RADIUS) if self.obstacles else None
+
+        # None : chaque sprite se met à jour lui-même
+        self.engine = create_entity_engine(self.zombies, self.meteorites, engine_name)
+
+        # Zombies et météorites morts, réutilisés aux apparitions suivantes
+        self.pool = EntityPool(ENTITY_POOLING)
+
+        # FrameProfiler recevant le temps de chaque phase (None : pas de mesure)
+        self.profiler = None
+
+        # Niveau de détail (indice dans LOD_LEVELS)
+        self.lod_level = 0
+        self.skipped_spawns = 0 # Apparitions refusées par le budget d'entités
+
+        # Variables de jeu
+        self.game_over = False
+        self.cause_of_death = None # 'zombie' ou 'meteorite'
+        self.elapsed_time = 0      # ms simulées depuis le début de la partie
+        self.steps = 0
+        self.next_entity_id = 1
+        # Nombre maximal d'entités vivantes en même temps (statistiques)
+        self.peak_zombies = 0
+        self.peak_meteorites = 0
+        self.peak_entities = 0
+        # Tests de collision de cette partie (phases large et fine)
+        self.collision_stats = CollisionStats()
+
+        # Configuration du spawn des zombies
+        self.zombie_spawn_timer = 0
+        self.zombie_spawn_delay = INITIAL_ZOMBIE_SPAWN_DELAY
+        self.tracking_zombie_chance = INITIAL_TRACKING_ZOMBIE_CHANCE
+
+        # Configuration du spawn des météorites
+        self.meteorite_spawn_timer = 0
+        self.meteorite_spawn_delay = INITIAL_METEORITE_SPAWN_DELAY
+
+        # Timer pour augmenter la difficulté
+        self.difficulty_increase_timer = 0
+
+    @property
+    def score(self):
+        """Temps survécu en secondes."""
+        return self.elapsed_time / 1000.0
+
+    def entity_budget(self):
+        """Nombre maximal de zombies et météorites vivants au niveau de détail actuel (None : illimité)."""
+        share = LOD_LEVELS[self.lod_level][1]
+        if ENTITY_BUDGET is None or share is None:
+            return None
+        return int(ENTITY_BUDGET * share)
+
+    def _spawn(self, sprite, group):
+        """Ajoute une nouvelle entité aux groupes (et au moteur vectorisé s'il existe)."""
+        # Numéro propre à cette apparition (un sprite réutilisé en change)
+        sprite.entity_id = self.next_entity_id
+        self.next_entity_id += 1
+        self.all_sprites.add(sprite)
+        group.add(sprite)
+        if self.engine is not None:
+            self.engine.add(sprite)
+
+    def step(self, keys, delta_time=None):
+        """Avance la partie d'un pas. Sans effet une fois la partie terminée."""
+        if self.game_over:
+            return
+        if delta_time is None:
+            delta_time = FIXED_DELTA_TIME # Lu à chaque pas : modifiable par batch.py --set
+        self.steps += 1
+        self.elapsed_time += delta_time
+        player = self.player
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.mark()
+        # Déplacements proportionnels à la durée du pas (1.0 au pas par défaut)
+        scale = delta_time / SPEED_TIME_UNIT
+
+        # --- Mises à jour des Sprites ---
+        player.update(keys, scale, self.obstacles)
+        view = camera_view(*player.rect.center, self.view) # La caméra suit le joueur
+        field = self.flow_field
+        if field is not None:
+            field.update(*player.rect.center) # Parcours refait seulement si le joueur change de cellule
+        # Traqueurs lointains mis à jour un pas sur `period` (None : tous à chaque pas)
+        period = LOD_LEVELS[self.lod_level][0]
+        lod = (period, self.steps, LOD_TRACKER_DISTANCE) if period > 1 else None
+        if profiler is not None:
+            profiler.lap('joueur')
+        if self.engine is not None:
+            self.engine.step(player, scale, view, field, lod) # Zombies et météorites avancés en lot
+        else:
+            self.zombies.update(player, scale, view, field, lod) # Les zombies ont besoin de connaître la position du joueur
+            self.meteorites.update(scale, view)      # Les météorites bougent indépendamment
+        # Les entités mortes au pas précédent peuvent maintenant resservir
+        self.pool.recycle()
+        if profiler is not None:
+            profiler.lap('entites')
+
+        # --- Augmentation de la Difficulté ---
+        self.difficulty_increase_timer += delta_time
+        if self.difficulty_increase_timer > DIFFICULTY_INCREASE_INTERVAL:
+            self.difficulty_increase_timer = 0 # Réinitialiser le timer
+            # Rendre le spawn des zombies plus rapide
+            self.zombie_spawn_delay = max(MIN_ZOMBIE_SPAWN_DELAY, self.zombie_spawn_delay - ZOMBIE_SPAWN_DECREASE_RATE)
+            # Rendre le spawn des météorites plus rapide
+            self.meteorite_spawn_delay = max(MIN_METEORITE_SPAWN_DELAY, self.meteorite_spawn_delay - METEORITE_SPAWN_DECREASE_RATE)
+            # Optionnel: augmenter la chance des traqueurs ?
+            # self.tracking_zombie_chance = min(0.5, self.tracking_zombie_chance + 0.01)
+
+        # --- Apparition des Zombies ---
+        # Au-delà du budget d'entités, l'apparition est refusée (le timer repart quand même)
+        budget = self.entity_budget()
+        self.zombie_spawn_timer += delta_time
+        if self.zombie_spawn_timer > self.zombie_spawn_delay:
+            self.zombie_spawn_timer = 0 # Réinitialiser le timer de spawn zombie
+            if budget is not None and len(self.zombies) + len(self.meteorites) >= budget:
+                self.skipped_spawns += 1
+            else:
+                # Choisir aléatoirement le type de zombie
+                if self.rng.random() < self.tracking_zombie_chance:
+                    new_zombie = self.pool.acquire(TrackingZombie, self.rng, view)
+                else:
+                    new_zombie = self.pool.acquire(Zombie, self.rng, view)
+                self._spawn(new_zombie, self.zombies)
+
+        # --- Apparition des Météorites ---
+        self.meteorite_spawn_timer += delta_time
+        if self.meteorite_spawn_timer > self.meteorite_spawn_delay:
+            self.meteorite_spawn_timer = 0 # Réinitialiser le timer de spawn météorite
+            if budget is not None and len(self.zombies) + len(self.meteorites) >= budget:
+                self.skipped_spawns += 1
+            else:
+                # Choisir aléatoirement le type de météorite
+                chosen_type = self.rng.choice(METEORITE_TYPES)
+                self._spawn(self.pool.acquire(Meteorite, chosen_type, self.rng, view), self.meteorites)
+
+        zombie_count, meteorite_count = len(self.zombies), len(self.meteorites)
+        self.peak_zombies = max(self.peak_zombies, zombie_count)
+        self.peak_meteorites = max(self.peak_meteorites, meteorite_count)
+        self.peak_entities = max(self.peak_entities, zombie_count + meteorite_count)
+        if profiler is not None:
+            profiler.lap('apparitions')
+
+        # --- Vérification des Collisions ---
+        # Collision joueur vs zombies
+        # Phase large par rectangles, puis masques précalculés sur les seuls candidats
+        if spritecollide_mask(player, self.zombies, False, self.collision_stats):
+            self.game_over = True
+            self.cause_of_death = 'zombie'
+        if profiler is not None:
+            profiler.lap('collisions_zombies')
+
+        # Collision joueur vs météorites
+        # dokill=True supprime la météorite du groupe lors de la collision
+        if spritecollide_mask(player, self.meteorites, True, self.collision_stats):
+            self.game_over = True
+            self.cause_of_death = 'meteorite'
+        self.collision_stats.end_step() # Totaux à jour dès la fin du pas, dernier pas compris
+        if profiler is not None:
+            profiler.lap('collisions_meteorites')
+
+
+# --- Affichage ---
+
+def merge_rects(rects, bounds):
+    """Découpe les rectangles à `bounds` et fusionne ceux qui se chevauchent."""
+    merged = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if not rect.width or not rect.height:
+            continue
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect.union_ip(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+class ChunkedBackground:
+    """
+    Fond d'une arène de taille quelconque, découpé en morceaux carrés de
+    `chunk_size` pixels construits à la demande (le motif `tile` répété,
+    aligné sur l'origine du monde, avec les `obstacles` par-dessus). Au plus
+    `max_chunks` morceaux restent en mémoire : le moins récemment dessiné est
+    libéré en premier (LRU). La mémoire ne dépend donc que de la taille de
+    l'écran, pas de celle du monde.
+    """
+    def __init__(self, tile, chunk_size=BACKGROUND_CHUNK_SIZE, max_chunks=BACKGROUND_MAX_CHUNKS, obstacles=()):
+        self.tile = tile
+        self.obstacles = [pygame.Rect(obstacle) for obstacle in obstacles]
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self._chunks = OrderedDict() # (cx, cy) -> Surface, du moins au plus récent
+        self.built = 0
+        self.evicted = 0
+
+    def _chunk(self, cx, cy):
+        """Morceau (cx, cy), construit s'il n'est pas en mémoire."""
+        chunk = self._chunks.get((cx, cy))
+        if chunk is not None:
+            self._chunks.move_to_end((cx, cy))
+            return chunk
+        size = self.chunk_size
+        chunk = pygame.Surface((size, size))
+        if pygame.display.get_surface() is not None:
+            chunk = chunk.convert() # Même format que l'écran : blits rapides
+        tile_width, tile_height = self.tile.get_size()
+        left, top = cx * size, cy * size
+        for y in range(top - top % tile_height, top + size, tile_height):
+            for x in range(left - left % tile_width, left + size, tile_width):
+                chunk.blit(self.tile, (x - left, y - top))
+        for obstacle in self.obstacles:
+            chunk.fill(OBSTACLE_COLOR, obstacle.move(-left, -top)) # Découpé à la surface par fill
+        self._chunks[(cx, cy)] = chunk
+        self.built += 1
+        if len(self._chunks) > self.max_chunks:
+            self._chunks.popitem(last=False)
+            self.evicted += 1
+        return chunk
+
+    def draw(self, surface, rect, camera):
+        """Dessine dans `rect` (coordonnées écran) le fond vu par la caméra en `camera` (coin du monde)."""
+        size = self.chunk_size
+        area = rect.move(camera) # Zone du monde à dessiner
+        for cy in range(area.top // size, (area.bottom - 1) // size + 1):
+            for cx in range(area.left // size, (area.right - 1) // size + 1):
+                piece = area.clip((cx * size, cy * size, size, size))
+                surface.blit(self._chunk(cx, cy), (piece.x - camera[0], piece.y - camera[1]),
+                             piece.move(-cx * size, -cy * size))
+
+    def stats(self):
+        return {
+            'resident': len(self._chunks),
+            'built': self.built,
+            'evicted': self.evicted,
+            'bytes': len(self._chunks) * self.chunk_size * self.chunk_size * 4,
+        }
 
-    # --- Initialisation de la partie ---
-    all_sprites = pygame.sprite.Group()   # Tous les éléments à dessiner
-    zombies = pygame.sprite.Group()       # Pour collisions avec zombies
-    meteorites = pygame.sprite.Group()    # Pour collisions avec météorites
+class DirtyRectRenderer:
+    """
+    Affichage par rectangles modifiés (principe de `pygame.sprite.RenderUpdates`).
+
+    À chaque image, seuls les rectangles occupés à l'image précédente sont
+    effacés avec le fond, les sprites et le HUD sont redessinés, puis seuls
+    les rectangles modifiés (anciens + nouveaux, fusionnés) sont envoyés à
+    l'écran avec `pygame.display.update(rects)`. Si la surface modifiée
+    dépasse `full_redraw_ratio` de l'écran, un `flip()` complet est fait.
+
+    Les sprites sont dessinés à une position interpolée entre le pas de
+    simulation précédent (`prev_x`/`prev_y`) et le pas courant (`pos_x`/`pos_y`),
+    pour un mouvement fluide quelle que soit la cadence d'affichage.
+
+    Positions en coordonnées du monde, vues depuis la caméra (`camera` : coin
+    haut-gauche de la vue) ; les sprites hors de la vue ne sont pas dessinés.
+    Quand la caméra bouge, tout l'écran est redessiné. `background` : un
+    ChunkedBackground, ou une Surface (utilisée comme motif).
+    """
+    def __init__(self, screen, background, full_redraw_ratio=DIRTY_RECT_FULL_REDRAW_RATIO):
+        self.screen = screen
+        if isinstance(background, pygame.Surface):
+            background = ChunkedBackground(background)
+        self.background = background
+        self.full_redraw_ratio = full_redraw_ratio
+        self.bounds = screen.get_rect()
+        self._previous = []        # Rectangles dessinés à l'image précédente
+        self._needs_full = True    # Premier affichage : tout l'écran
+        self._camera = (0, 0)      # Caméra de l'image précédente
+        self.culled = 0            # Sprites hors de la vue à la dernière image
+        self.profiler = None       # FrameProfiler (None : pas de mesure)
+        # Statistiques
+        self.frames = 0
+        self.full_redraws = 0
+        self.pixels_pushed = 0     # Total depuis le début
+        self.last_pixels = 0       # Pixels envoyés à la dernière image
+
+    def invalidate(self):
+        """Force un affichage complet à la prochaine image (ex: après un autre écran)."""
+        self._needs_full = True
+
+    def render(self, sprites, draw_hud, alpha=1.0, camera=(0, 0)):
+        """
+        Dessine `sprites` puis le HUD (`draw_hud(screen)` doit retourner la
+        liste des rectangles qu'il a dessinés) et met l'écran à jour.
+        `alpha` (0..1) : fraction de pas écoulée depuis le dernier pas de
+        simulation (1.0 : positions du dernier pas, sans interpolation).
+        `camera` : coin haut-gauche de la vue, en coordonnées du monde.
+        """
+        screen, background = self.screen, self.background
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.mark()
+        if camera != self._camera: # Défilement : tout l'écran change
+            self._camera = camera
+            self._needs_full = True
+        if self._needs_full:
+            background.draw(screen, self.bounds, camera)
+        else:
+            # 1. Effacer les sprites et le HUD de l'image précédente
+            for rect in self._previous:
+                background.draw(screen, rect, camera)
+        # 2. Dessiner les sprites visibles (joueur, zombies, météorites), puis le HUD
+        cam_x, cam_y = camera
+        # Petite marge : un sprite interpolé peut dépasser un peu de son rect
+        view = self.bounds.move(camera).inflate(2 * ZOMBIE_TARGET_SIZE[0], 2 * ZOMBIE_TARGET_SIZE[1])
+        visible = [sprite for sprite in sprites if view.colliderect(sprite.rect)]
+        self.culled = len(sprites) - len(visible)
+        if alpha >= 1.0:
+            current = screen.blits([(sprite.image, sprite.rect.move(-cam_x, -cam_y)) for sprite in visible])
+        else:
+            # Le rect suit la position exacte (à son décalage près) : on le recule vers le pas précédent
+            back = 1.0 - alpha
+            current = screen.blits([
+                (sprite.image, (round(sprite.rect.x - (sprite.pos_x - sprite.prev_x) * back) - cam_x,
+                                round(sprite.rect.y - (sprite.pos_y - sprite.prev_y) * back) - cam_y))
+                for sprite in visible])
+        if profiler is not None:
+            profiler.lap('dessin')
+        current.extend(draw_hud(screen))
+        if profiler is not None:
+            profiler.lap('hud')
+
+        # 3. Envoyer à l'écran les seules zones modifiées
+        screen_area = self.bounds.width * self.bounds.height
+        dirty = merge_rects(self._previous + current, self.bounds)
+        dirty_area = sum(rect.width * rect.height for rect in dirty)
+        if self._needs_full or dirty_area > self.full_redraw_ratio * screen_area:
+            pygame.display.flip()
+            self.last_pixels = screen_area
+            self.full_redraws += 1
+            self._needs_full = False
+        else:
+            pygame.display.update(dirty)
+            self.last_pixels = dirty_area
+        self._previous = current
+        self.frames += 1
+        self.pixels_pushed += self.last_pixels
+        if profiler is not None:
+            profiler.lap('affichage')
+
+    def stats(self):
+        """Pixels envoyés à l'écran : moyenne par image et part de l'écran."""
+        screen_area = self.bounds.width * self.bounds.height
+        average = self.pixels_pushed / self.frames if self.frames else 0
+        return {
+            'frames': self.frames,
+            'full_redraws': self.full_redraws,
+            'last_pixels': self.last_pixels,
+            'average_pixels': round(average),
+            'average_screen_fraction': round(average / screen_area, 4),
+            'culled': self.culled,
+            'background': self.background.stats(),
+        }
 
-    player = Player()
-    all_sprites.add(player)
+class FrameSkipper:
+    """
+    Décide, image par image, s'il faut dessiner. La simulation avance
+    toujours de tous ses pas ; seul l'affichage est sauté :
+    - quand l'image précédente a dépassé `tolerance` fois le budget de 1/FPS
+      (machine chargée), au plus `max_skip` images d'affilée ;
+    - pour ne pas dépasser `render_fps` images affichées par seconde.
+    """
+    def __init__(self, max_skip=MAX_FRAME_SKIP, tolerance=FRAME_SKIP_TOLERANCE, render_fps=RENDER_FPS):
+        self.max_skip = max_skip
+        self.late_threshold = tolerance * 1000 / FPS
+        self.min_interval = 1000 / render_fps if render_fps else 0
+        self._skipped_in_row = 0  # Images sautées pour cause de charge, d'affilée
+        self._since_render = 0.0  # ms écoulées depuis le dernier affichage
+        # Statistiques
+        self.rendered = 0
+        self.skipped = 0
+
+    def should_render(self, delta_time):
+        """`delta_time` : durée de l'image précédente (ms), comme retournée par `clock.tick`."""
+        self._since_render += delta_time
+        if self._since_render < self.min_interval:
+            render = False # Cadence d'affichage limitée
+        elif delta_time > self.late_threshold and self._skipped_in_row < self.max_skip:
+            render = False # En retard : on laisse la simulation rattraper
+            self._skipped_in_row += 1
+        else:
+            render = True
+        if render:
+            self._skipped_in_row = 0
+            self._since_render = 0.0
+            self.rendered += 1
+        else:
+            self.skipped += 1
+        return render
 
-    # Variables de jeu
-    running = True
-    game_over = False
-    final_score = 0
-    start_time = pygame.time.get_ticks() # Temps de début de partie
-    current_score = 0
+    def stats(self):
+        return {'rendered': self.rendered, 'skipped': self.skipped}
 
-    # Configuration du spawn des zombies
-    zombie_spawn_timer = 0
-    zombie_spawn_delay = INITIAL_ZOMBIE_SPAWN_DELAY
-    tracking_zombie_chance = INITIAL_TRACKING_ZOMBIE_CHANCE
+class LODGovernor:
+    """
+    Choisit le niveau de détail de la simulation (indice dans LOD_LEVELS)
+    d'après le temps de travail de chaque image (`clock.get_rawtime()`, sans
+    l'attente de `clock.tick`), en moyenne glissante :
+    - au-delà de `raise_ratio` fois le budget de 1/FPS, niveau plus grossier ;
+    - en deçà de `lower_ratio` fois ce budget, retour vers un niveau plus fin ;
+    - au moins `hold` images entre deux changements, pour ne pas osciller.
+    `headroom` est la marge restante par image (négative : en retard).
+    """
+    def __init__(self, levels=len(LOD_LEVELS), raise_ratio=LOD_RAISE_RATIO, lower_ratio=LOD_LOWER_RATIO,
+                 hold=LOD_HOLD_FRAMES, smoothing=LOD_SMOOTHING):
+        self.max_level = levels - 1
+        self.budget = 1000 / FPS
+        self.raise_threshold = raise_ratio * self.budget
+        self.lower_threshold = lower_ratio * self.budget
+        self.hold = hold
+        self.smoothing = smoothing
+        self.level = 0
+        self.frame_time = None # Moyenne glissante (ms), None avant la première mesure
+        self._since_change = 0
+        # Statistiques
+        self.raises = 0
+        self.lowers = 0
+        self.frames_per_level = [0] * levels
+
+    @property
+    def headroom(self):
+        return self.budget - (self.frame_time or 0.0)
+
+    def update(self, work_time):
+        """`work_time` : temps de travail de l'image précédente (ms) ; retourne le niveau à appliquer."""
+        if self.frame_time is None:
+            self.frame_time = float(work_time)
+        else:
+            self.frame_time += self.smoothing * (work_time - self.frame_time)
+        self._since_change += 1
+        if self._since_change >= self.hold:
+            if self.frame_time > self.raise_threshold and self.level < self.max_level:
+                self.level += 1
+                self.raises += 1
+                self._since_change = 0
+            elif self.frame_time < self.lower_threshold and self.level > 0:
+                self.level -= 1
+                self.lowers += 1
+                self._since_change = 0
+        self.frames_per_level[self.level] += 1
+        return self.level
+
+    def stats(self):
+        return {
+            'level': self.level,
+            'frame_time_ms': round(self.frame_time or 0.0, 2),
+            'headroom_ms': round(self.headroom, 2),
+            'raises': self.raises,
+            'lowers': self.lowers,
+            'frames_per_level': self.frames_per_level,
+        }
 
-    # Configuration du spawn des météorites
-    meteorite_spawn_timer = 0
-    meteorite_spawn_delay = INITIAL_METEORITE_SPAWN_DELAY
+class ProfilerOverlay:
+    """
+    Panneau des temps par phase (moyenne / p95 / p99 en ms) et du nombre
+    d'entités. Le panneau est composé dans une surface, recalculée toutes les
+    `refresh` images seulement : l'afficher coûte un blit.
+    """
+    COLUMNS = (0, 170, 230, 290) # Abscisses des colonnes phase / moy / p95 / p99
+
+    def __init__(self, profiler, refresh=PROFILER_OVERLAY_REFRESH, size=16):
+        self.profiler = profiler
+        self.refresh = refresh
+        self.size = size
+        self._panel = None
+        self._built_at = 0
+
+    def _build(self, simulation, governor=None):
+        font = text_renderer.get_font(self.size)
+        rows = [('phase', 'moy', 'p95', 'p99')]
+        rows += [(phase, f"{mean:.2f}", f"{p95:.2f}", f"{p99:.2f}")
+                 for phase, mean, p95, p99 in self.profiler.summary()]
+        line_height = font.get_linesize()
+        footers = [f"zombies: {len(simulation.zombies)}  météorites: {len(simulation.meteorites)}"
+                   f"  fps: {clock.get_fps():.0f}"]
+        if governor is not None:
+            footers.append(f"LOD: {simulation.lod_level}  marge: {governor.headroom:.1f} ms"
+                           f"  budget: {simulation.entity_budget()}")
+        broad, narrow = simulation.collision_stats.last_step
+        footers.append(f"collisions/pas: {broad} rect.  {narrow} masques")
+        panel = pygame.Surface((self.COLUMNS[-1] + 60, line_height * (len(rows) + len(footers)) + 8),
+                               pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for row_index, row in enumerate(rows):
+            for x, cell in zip(self.COLUMNS, row):
+                panel.blit(font.render(cell, True, WHITE), (x + 4, 4 + row_index * line_height))
+        for index, footer in enumerate(footers, len(rows)):
+            panel.blit(font.render(footer, True, WHITE), (4, 4 + index * line_height))
+        self._panel = panel
+        self._built_at = self.profiler.frames
+
+    def draw(self, surface, simulation, governor=None):
+        """Affiche le panneau en haut à gauche ; retourne le rectangle occupé."""
+        if self._panel is None or self.profiler.frames - self._built_at >= self.refresh:
+            self._build(simulation, governor)
+        return surface.blit(self._panel, (10, 10))
+
+# --- Boucle Principale du Jeu (fenêtre) ---
+
+class GameSession:
+    """
+    Enchaîne les parties dans une seule boucle, pilotée par une machine à
+    états : MENU -> PLAYING -> GAME_OVER -> PLAYING -> ...
 
-    # Timer pour augmenter la difficulté
-    difficulty_increase_timer = 0
+    Ce qui dure toute la session (écran, fond, affichage par rectangles
+    modifiés, profileur ; images et polices sont dans les caches du module)
+    est créé une fois. Ce qui est propre à une partie (Simulation, sprites,
+    enregistreur de replay, accumulateur) est créé en entrant dans PLAYING
+    et entièrement libéré en la quittant : rejouer n'empile rien.
 
-    # --- Boucle de Jeu ---
-    while running:
-        # Contrôler le FPS et obtenir le temps delta (pour mouvements fluides si besoin)
-        delta_time = clock.tick(FPS) # en millisecondes
+    `run_frame()` traite une image (événements, puis l'état courant) et
+    retourne False quand la session est terminée ; `run()` boucle dessus.
+    """
+    MENU, PLAYING, GAME_OVER = 'menu', 'playing', 'game_over'
+
+    def __init__(self, screen, background, show_menu=True, clock=clock):
+        self.screen = screen
+        self.clock = clock
+        self.running = True
+        self.games_played = 0
+        self.last_score = 0.0
+
+        # Seules les zones modifiées sont redessinées et envoyées à l'écran
+        if isinstance(background, pygame.Surface): # Motif du fond, découpé en morceaux
+            background = ChunkedBackground(background, obstacles=ARENA_OBSTACLES)
+        self.renderer = DirtyRectRenderer(screen, background)
+        self.camera = camera_view(WORLD_WIDTH // 2, WORLD_HEIGHT // 2) # Vue affichée
+
+        # Profileur d'images (F3), branché sur la partie et l'affichage quand il est actif
+        self.profiling = PROFILING
+        self.profiler = FrameProfiler(phases=PROFILER_PHASES) if (PROFILING or PROFILE_PATH) else None
+        self.overlay = ProfilerOverlay(self.profiler) if self.profiler else None
+
+        # Serveur de spectateurs, ouvert pour toute la session
+        self.spectators = None
+        if SPECTATOR_ADDRESS is not None:
+            import spectator
+            self.spectators = spectator.SpectatorServer(SPECTATOR_ADDRESS)
+            try:
+                print(f"Spectateurs : {self.spectators.start()}")
+            except OSError as e:
+                print(f"Avertissement: serveur de spectateurs impossible ({e})")
+                self.spectators = None
+
+        # État propre à la partie en cours (None hors de PLAYING)
+        self.simulation = None
+        self.recorder = None
+        self.frame_skipper = None
+        self.governor = None
+        self.accumulator = 0.0 # Temps réel pas encore simulé (ms)
+
+        self.state = None
+        self._screen_drawn = False # Écrans fixes (menu, game over) : dessinés une fois
+        self.enter(self.MENU if show_menu else self.PLAYING)
+
+    # --- Transitions ---
+
+    def enter(self, state):
+        """Change d'état (en terminant / commençant la partie si besoin)."""
+        if self.state == self.PLAYING:
+            self._end_game()
+        if state == self.PLAYING:
+            self._start_game()
+        self.state = state
+        self._screen_drawn = False
+
+    def _start_game(self):
+        self.simulation = Simulation()
+        self.accumulator = 0.0
+        # Sous charge, on saute des affichages plutôt que de ralentir le jeu
+        self.frame_skipper = FrameSkipper(render_fps=RENDER_FPS)
+        # Niveau de détail adapté au temps mesuré par image
+        self.governor = LODGovernor() if LOD_GOVERNOR else None
+        # Enregistrement optionnel des touches pour relecture (voir replay.py)
+        if REPLAY_DIR:
+            import replay
+            self.recorder = replay.ReplayRecorder(self.simulation)
+        if self.spectators is not None:
+            self.spectators.new_game()
+        self.renderer.invalidate() # L'écran précédent (menu, game over) est à effacer
+        self._attach_profiler()
+
+    def _end_game(self):
+        simulation = self.simulation
+        self.games_played += 1
+        self.last_score = simulation.score
+        if simulation.game_over: # (et non fenêtre fermée en pleine partie)
+            if self.recorder:
+                replay_path = os.path.join(REPLAY_DIR, f"partie-{simulation.seed}.zsr")
+                self.recorder.save(replay_path)
+                print(f"Replay enregistré : {replay_path}")
+            if VERBOSE:
+                self._print_stats()
+
+        # Libérer tout l'état de la partie : vider les groupes casse les
+        # références croisées sprites <-> groupes sans attendre le ramasse-miettes
+        for group in (simulation.all_sprites, simulation.zombies, simulation.meteorites):
+            group.empty()
+        self.renderer.profiler = None
+        self.simulation = self.recorder = self.frame_skipper = self.governor = None
+
+    def _print_stats(self):
+        """Statistiques de la partie terminée et de la session (VERBOSE)."""
+        simulation = self.simulation
+        print(f"Fin de partie : {simulation.cause_of_death}")
+        print(f"Cache d'images : {assets.stats()}") # misses doit valoir 0
+        print(f"Affichage : {self.renderer.stats()}") # pixels envoyés par image
+        print(f"Pool d'entités : {simulation.pool.stats()}")
+        print(f"Tests de collision : {simulation.collision_stats.stats()}")
+        print(f"Images affichées / sautées : {self.frame_skipper.stats()}")
+        if self.governor is not None:
+            print(f"Niveau de détail : {self.governor.stats()}, "
+                  f"apparitions refusées : {simulation.skipped_spawns}")
+        if self.spectators is not None:
+            print(f"Spectateurs : {self.spectators.stats()}")
+
+    def _attach_profiler(self):
+        profiler = self.profiler if self.profiling else None
+        self.renderer.profiler = profiler
+        if self.simulation is not None:
+            self.simulation.profiler = profiler
+
+    def toggle_profiler(self):
+        """Affiche / masque le profileur (mesures actives seulement s'il est affiché)."""
+        self.profiling = not self.profiling
+        if self.profiler is None:
+            self.profiler = FrameProfiler(phases=PROFILER_PHASES)
+            self.overlay = ProfilerOverlay(self.profiler)
+        self._attach_profiler()
+
+    # --- Boucle ---
+
+    def run(self):
+        """Boucle jusqu'à ce que le joueur quitte."""
+        while self.run_frame():
+            pass
+        self.close()
+
+    def close(self):
+        """Termine la partie en cours et exporte le profil demandé."""
+        if self.state == self.PLAYING:
+            self._end_game()
+        self.state = None
+        if self.spectators is not None:
+            self.spectators.close()
+            self.spectators = None
+        if PROFILE_PATH and self.profiler is not None:
+            self.profiler.dump(PROFILE_PATH)
+            print(f"Profil enregistré : {PROFILE_PATH}")
+
+    def run_frame(self):
+        """Traite une image de l'état courant ; retourne False quand il faut quitter."""
+        if self.state == self.PLAYING:
+            self._frame_playing()
+        else:
+            self._frame_screen()
+        return self.running
+
+    def _frame_screen(self):
+        """Menu ou game over : écran fixe, on attend une touche."""
+        self.clock.tick(FPS / 2) # Moins de FPS ici, pas besoin de 60
+        if not self._screen_drawn:
+            if self.state == self.MENU:
+                draw_menu_screen(self.screen)
+            else:
+                draw_game_over_screen(self.screen, self.last_score)
+            self._screen_drawn = True
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key in (pygame.K_q, pygame.K_ESCAPE): # Quitter
+                    self.running = False
+                elif self.state == self.MENU and event.key in (pygame.K_RETURN, pygame.K_SPACE):
+                    self.enter(self.PLAYING)
+                    return # Les événements suivants seront lus par la partie
+                elif self.state == self.GAME_OVER and event.key == pygame.K_r: # Rejouer
+                    self.enter(self.PLAYING)
+                    return
+
+    def _draw_hud(self, surface):
+        # Score par-dessus les sprites (préfixe en cache + chiffres depuis l'atlas de glyphes)
+        simulation = self.simulation
+        rects = [text_renderer.draw_number(surface, "Temps: ", simulation.score, 24, SCREEN_WIDTH / 2, 10, BLACK)]
+        if self.profiling:
+            rects.append(self.overlay.draw(surface, simulation, self.governor))
+        return rects
+
+    def _frame_playing(self):
+        """Une image de partie : clavier, pas de simulation fixes, affichage."""
+        simulation = self.simulation
+        # Contrôler le FPS et obtenir le temps delta
+        delta_time = self.clock.tick(FPS) # en millisecondes
+        self.accumulator = min(self.accumulator + delta_time, MAX_STEPS_PER_FRAME * FIXED_DELTA_TIME)
+        if self.governor is not None: # Niveau des prochains pas, selon le travail de l'image précédente
+            simulation.lod_level = self.governor.update(self.clock.get_rawtime())
+        profiler = simulation.profiler
+        if profiler is not None:
+            profiler.begin_frame()
 
         # --- Gestion des Événements ---
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                running = False # Sortir de la boucle principale
-
-        # --- Logique du jeu (si pas game over) ---
-        if not game_over:
-
-            # --- Mises à jour des Sprites ---
-            keys = pygame.key.get_pressed()
-            player.update(keys)
-            zombies.update(player) # Les zombies ont besoin de connaître la position du joueur
-            meteorites.update()    # Les météorites bougent indépendamment
-
-            # --- Augmentation de la Difficulté ---
-            difficulty_increase_timer += delta_time
-            if difficulty_increase_timer > DIFFICULTY_INCREASE_INTERVAL:
-                difficulty_increase_timer = 0 # Réinitialiser le timer
-                # Rendre le spawn des zombies plus rapide
-                zombie_spawn_delay = max(MIN_ZOMBIE_SPAWN_DELAY, zombie_spawn_delay - ZOMBIE_SPAWN_DECREASE_RATE)
-                # Rendre le spawn des météorites plus rapide
-                meteorite_spawn_delay = max(MIN_METEORITE_SPAWN_DELAY, meteorite_spawn_delay - METEORITE_SPAWN_DECREASE_RATE)
-                # Optionnel: augmenter la chance des traqueurs ?
-                # tracking_zombie_chance = min(0.5, tracking_zombie_chance + 0.01)
-
-            # --- Apparition des Zombies ---
-            zombie_spawn_timer += delta_time
-            if zombie_spawn_timer > zombie_spawn_delay:
-                zombie_spawn_timer = 0 # Réinitialiser le timer de spawn zombie
-                # Choisir aléatoirement le type de zombie
-                if random.random() < tracking_zombie_chance:
-                    new_zombie = TrackingZombie()
-                else:
-                    new_zombie = Zombie()
-                # Ajouter le nouveau zombie aux groupes appropriés
-                all_sprites.add(new_zombie)
-                zombies.add(new_zombie)
-
-            # --- Apparition des Météorites ---
-            meteorite_spawn_timer += delta_time
-            if meteorite_spawn_timer > meteorite_spawn_delay:
-                meteorite_spawn_timer = 0 # Réinitialiser le timer de spawn météorite
-                # Choisir aléatoirement le type de météorite
-                chosen_type = random.choice(METEORITE_TYPES)
-                new_meteorite = Meteorite(meteor_type=chosen_type)
-                # Ajouter la nouvelle météorite aux groupes
-                all_sprites.add(new_meteorite)
-                meteorites.add(new_meteorite)
-
-            # --- Vérification des Collisions ---
-            # Collision joueur vs zombies
-            # collide_mask est plus précis mais plus lent que collide_rect
-            zombie_hits = pygame.sprite.spritecollide(player, zombies, False, pygame.sprite.collide_mask)
-            if zombie_hits:
-                game_over = True
-
-            # Collision joueur vs météorites
-            # dokill=True supprime la météorite du groupe lors de la collision
-            meteorite_hits = pygame.sprite.spritecollide(player, meteorites, True, pygame.sprite.collide_mask)
-            if meteorite_hits:
-                print("Touché par une météorite !") # Message de debug
-                game_over = True # Mettre game_over après la collision
-
-            # Calculer le score final seulement si on vient de mourir
-            if game_over:
-                final_score = (pygame.time.get_ticks() - start_time) / 1000.0
-
-            # --- Calcul du score en temps réel ---
-            if not game_over:
-                 current_score = (pygame.time.get_ticks() - start_time) / 1000.0
-
-            # --- Dessin ---
-            # 1. Dessiner le fond
-            screen.blit(background_img, (0, 0))
-            # 2. Dessiner tous les sprites (joueur, zombies, météorites)
-            all_sprites.draw(screen)
-            # 3. Dessiner le score par-dessus
-            draw_text(screen, f"Temps: {current_score:.2f}", 24, SCREEN_WIDTH / 2, 10, BLACK)
+                self.running = False # Sortir de la boucle principale
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.toggle_profiler()
+        if profiler is not None:
+            profiler.lap('evenements')
+        if not self.running:
+            return
+
+        # --- Logique du jeu ---
+        keys = pygame.key.get_pressed()
+        recorder, spectators = self.recorder, self.spectators
+        while self.accumulator >= FIXED_DELTA_TIME and not simulation.game_over:
+            simulation.step(recorder.sample(keys) if recorder else keys)
+            self.accumulator -= FIXED_DELTA_TIME
+            if spectators is not None:
+                spectators.publish(simulation) # Non bloquant, même si un spectateur rame
+
+        # --- Dessin et mise à jour de l'écran ---
+        # (toujours dessiner la dernière image d'une partie)
+        if self.frame_skipper.should_render(delta_time) or simulation.game_over:
+            # Positions interpolées : le temps pas encore simulé est une fraction de pas
+            alpha = 1.0 if simulation.game_over else self.accumulator / FIXED_DELTA_TIME
+            # Caméra centrée sur la position interpolée du joueur (comme son dessin)
+            player, back = simulation.player, 1.0 - alpha
+            camera = camera_view(round(player.rect.centerx - (player.pos_x - player.prev_x) * back),
+                                 round(player.rect.centery - (player.pos_y - player.prev_y) * back),
+                                 self.camera)
+            self.renderer.render(simulation.all_sprites, self._draw_hud, alpha, camera.topleft)
+        if profiler is not None:
+            profiler.end_frame(zombies=len(simulation.zombies), meteorites=len(simulation.meteorites))
 
         # --- Logique de Fin de Partie ---
-        else: # si game_over est True
-             if running: # Assure qu'on n'a pas déjà cliqué sur Quitter
-                 show_game_over_screen(screen, final_score)
-                 # Si l'utilisateur appuie sur 'R', show_game_over_screen se termine.
-                 # On relance alors une nouvelle partie.
-                 game_loop() # Appel récursif pour recommencer
-                 # Après l'appel récursif, il faut quitter cette instance de game_loop
-                 return # Quitte cette exécution de game_loop proprement
-
-        # --- Mettre à jour l'affichage final ---
-        pygame.display.flip()
-
-    # --- Fin de la boucle principale (si running devient False) ---
+        if simulation.game_over:
+            self.enter(self.GAME_OVER)
+
+def wait_for_assets(loader):
+    """
+    Écran de chargement jusqu'à ce que toutes les images soient en mémoire.
+    Retourne False si le joueur ferme la fenêtre entre-temps.
+    """
+    while not loader.poll(timeout=1 / FPS): # Redessine au moins FPS fois par seconde
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+        draw_loading_screen(screen, loader.progress)
+    _init_background()
+    return True
+
+def game_loop():
+    """Lance la session de jeu (parties successives) puis quitte le programme."""
+    # Le jeu ne démarre qu'une fois les images en mémoire (chargement en tâche de fond)
+    if background_img is not None or wait_for_assets(asset_loader):
+        GameSession(screen, background_img).run()
+    # --- Fin de la boucle principale ---
     pygame.quit() # Nettoyer Pygame
     sys.exit()  # Quitter le programme
 
 # --- Point d'Entrée Principal ---
 if __name__ == '__main__':
+    # Les modules annexes (replay, ...) font `import main` : qu'ils retrouvent ce
+    # module-ci plutôt que d'en charger une seconde copie
+    sys.modules.setdefault('main', sys.modules[__name__])
+
+    parser = argparse.ArgumentParser(description=GAME_TITLE)
+    parser.add_argument('--engine', choices=ENTITY_ENGINES, default=ENTITY_ENGINE,
+                        help="moteur de simulation des zombies et météorites")
+    parser.add_argument('--record', metavar='DOSSIER', default=None,
+                        help="enregistrer un replay de chaque partie dans ce dossier")
+    parser.add_argument('--render-fps', type=int, default=RENDER_FPS,
+                        help="cadence d'affichage maximale (la simulation reste à FPS pas par seconde)")
+    parser.add_argument('--profile', metavar='FICHIER', default=None,
+                        help="profiler chaque image et exporter en quittant (.csv ou trace Chrome .json)")
+    parser.add_argument('--world', metavar='LARGEURxHAUTEUR', default=None,
+                        help="taille de l'arène en pixels (par défaut celle de l'écran)")
+    parser.add_argument('--obstacles', choices=sorted(OBSTACLE_PRESETS), default=None,
+                        help="obstacles prédéfinis dans l'arène (contournés par les traqueurs)")
+    parser.add_argument('--serve', metavar='ADRESSE', default=None,
+                        help="diffuser la partie aux spectateurs (hôte:port ou unix:/chemin, voir spectator.py)")
+    parser.add_argument('--verbose', action='store_true',
+                        help="afficher les statistiques (caches, affichage, pool...) à chaque fin de partie")
+    args = parser.parse_args()
+    if args.world:
+        try:
+            WORLD_WIDTH, WORLD_HEIGHT = (max(int(v), size) for v, size in
+                                         zip(args.world.lower().split('x'), (SCREEN_WIDTH, SCREEN_HEIGHT)))
+        except ValueError:
+            parser.error("--world attend LARGEURxHAUTEUR, ex: 4000x3000")
+    if args.obstacles:
+        ARENA_OBSTACLES = obstacle_preset(args.obstacles)
+    ENTITY_ENGINE = args.engine
+    REPLAY_DIR = args.record
+    RENDER_FPS = args.render_fps
+    PROFILE_PATH = args.profile
+    PROFILING = PROFILE_PATH is not None
+    VERBOSE = args.verbose
+    if args.serve:
+        import spectator
+        try:
+            SPECTATOR_ADDRESS = spectator.parse_address(args.serve)
+        except ValueError:
+            parser.error("--serve attend hôte:port ou unix:/chemin, ex: 127.0.0.1:8765")
+    if REPLAY_DIR:
+        os.makedirs(REPLAY_DIR, exist_ok=True)
+
     # Utiliser un bloc try...except pour attraper les erreurs imprévues globales
     try:
+        init_display(wait=False) # Images chargées en tâche de fond, derrière une barre de progression
         game_loop() # Lancer la boucle principale du jeu
     except Exception as main_error:
         print(f"Une erreur non gérée est survenue: {main_error}")
@@ -0,0 +1,172 @@
+"""
+Profileur d'images : temps passé dans chaque phase de la boucle de jeu.
+
+Les durées sont gardées dans des tampons circulaires de taille fixe (les
+`capacity` dernières images), sans allocation pendant la partie. On peut en
+tirer moyenne / p95 / p99 par phase (overlay à l'écran, touche F3) et les
+exporter en CSV (une ligne par image) ou au format Chrome trace
+(chrome://tracing, https://ui.perfetto.dev).
+
+Utilisation dans une image :
+
+    profiler.begin_frame()
+    ...                       # travail de la phase 'evenements'
+    profiler.lap('evenements')
+    profiler.mark()           # ignorer ce qui précède (ex: hors mesure)
+    ...
+    profiler.lap('dessin')
+    profiler.end_frame(zombies=12, meteorites=3)
+
+`lap(phase)` attribue à `phase` le temps écoulé depuis le dernier repère
+(`begin_frame`, `mark` ou `lap`). Une phase mesurée plusieurs fois dans la
+même image (plusieurs pas de simulation) voit ses durées additionnées.
+
+Désactivé, le profileur ne doit pas être appelé du tout : `Simulation` et
+`DirtyRectRenderer` ne le consultent que si leur attribut `profiler` n'est
+pas None.
+"""
+import csv
+import json
+import time
+from array import array
+
+# Nombre maximal de mesures individuelles gardées par image (trace Chrome)
+EVENTS_PER_FRAME = 32
+
+
+def percentile(sorted_values, fraction):
+    """Valeur au rang `fraction` (0..1) d'une liste triée (rang le plus proche)."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))]
+
+
+class FrameProfiler:
+    """Durées par phase des `capacity` dernières images, en tampons circulaires."""
+    COUNTERS = ('zombies', 'meteorites')
+
+    def __init__(self, capacity=600, phases=()):
+        """`phases` : noms de phases connus d'avance, pour fixer leur ordre d'affichage."""
+        self.capacity = capacity
+        self.frames = 0                      # Images commencées depuis le début
+        self.phases = []                     # Noms des phases, dans l'ordre d'apparition
+        self._phase_index = {}               # nom -> indice dans self.phases
+        self._durations = []                 # Par phase : array de `capacity` durées (ms)
+        self._frame_start = array('d', [0.0]) * capacity    # ms depuis l'origine
+        self._frame_duration = array('d', [0.0]) * capacity # ms
+        self._counters = {name: array('l', [0]) * capacity for name in self.COUNTERS}
+        # Mesures individuelles pour la trace Chrome : (phase, début, durée)
+        event_capacity = capacity * EVENTS_PER_FRAME
+        self._event_phase = array('H', [0]) * event_capacity
+        self._event_start = array('d', [0.0]) * event_capacity
+        self._event_duration = array('d', [0.0]) * event_capacity
+        self._events = 0
+        self._origin = time.perf_counter()
+        self._slot = 0
+        self._open = False                   # Image commencée mais pas terminée
+        self._begin = self._last = self._origin
+        for phase in phases:
+            self._register(phase)
+
+    # --- Mesure ---
+
+    def _register(self, phase):
+        index = self._phase_index[phase] = len(self.phases)
+        self.phases.append(phase)
+        self._durations.append(array('d', [0.0]) * self.capacity)
+        return index
+
+    def begin_frame(self):
+        """Commence une nouvelle image (écrase la plus ancienne du tampon)."""
+        slot = self._slot = self.frames % self.capacity
+        self.frames += 1
+        self._open = True
+        for durations in self._durations:
+            durations[slot] = 0.0
+        self._begin = self._last = now = time.perf_counter()
+        self._frame_start[slot] = (now - self._origin) * 1000
+
+    def mark(self):
+        """Place le repère à maintenant sans rien attribuer."""
+        self._last = time.perf_counter()
+
+    def lap(self, phase):
+        """Attribue à `phase` le temps écoulé depuis le dernier repère."""
+        now = time.perf_counter()
+        index = self._phase_index.get(phase)
+        if index is None:
+            index = self._register(phase)
+        duration = (now - self._last) * 1000
+        self._durations[index][self._slot] += duration
+        event = self._events % len(self._event_phase)
+        self._event_phase[event] = index
+        self._event_start[event] = (self._last - self._origin) * 1000
+        self._event_duration[event] = duration
+        self._events += 1
+        self._last = now
+
+    def end_frame(self, **counters):
+        """Termine l'image ; `counters` : nombres d'entités (voir COUNTERS)."""
+        slot = self._slot
+        self._frame_duration[slot] = (time.perf_counter() - self._begin) * 1000
+        for name, value in counters.items():
+            self._counters[name][slot] = value
+        self._open = False
+
+    # --- Lecture ---
+
+    def _recent_slots(self):
+        """Indices des images terminées présentes dans le tampon, de la plus ancienne à la plus récente."""
+        done = self.frames - self._open
+        count = min(done, self.capacity - self._open)
+        return [(done - count + i) % self.capacity for i in range(count)]
+
+    def summary(self):
+        """Liste de (phase, moyenne, p95, p99) en ms, puis la ligne 'image' (durée totale)."""
+        slots = self._recent_slots()
+        rows = []
+        for phase, durations in zip(self.phases + ['image'], self._durations + [self._frame_duration]):
+            values = sorted(durations[slot] for slot in slots)
+            mean = sum(values) / len(values) if values else 0.0
+            rows.append((phase, mean, percentile(values, 0.95), percentile(values, 0.99)))
+        return rows
+
+    # --- Export ---
+
+    def dump_csv(self, path):
+        """Une ligne par image gardée : début, durée totale, durée de chaque phase, compteurs."""
+        with open(path, 'w', newline='', encoding='utf-8') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(['frame', 'start_ms', 'frame_ms', *self.phases, *self.COUNTERS])
+            slots = self._recent_slots()
+            first = self.frames - self._open - len(slots)
+            for offset, slot in enumerate(slots):
+                writer.writerow([first + offset, f"{self._frame_start[slot]:.3f}", f"{self._frame_duration[slot]:.3f}",
+                                 *(f"{durations[slot]:.3f}" for durations in self._durations),
+                                 *(self._counters[name][slot] for name in self.COUNTERS)])
+
+    def dump_chrome_trace(self, path):
+        """Trace au format Chrome (événements 'X' : images et phases, en µs)."""
+        events = []
+        slots = self._recent_slots()
+        for slot in slots:
+            events.append({'name': 'image', 'ph': 'X', 'pid': 1, 'tid': 1,
+                           'ts': self._frame_start[slot] * 1000, 'dur': self._frame_duration[slot] * 1000,
+                           'args': {name: self._counters[name][slot] for name in self.COUNTERS}})
+        oldest_frame = self._frame_start[slots[0]] if slots else 0.0
+        event_capacity = len(self._event_phase)
+        for i in range(max(0, self._events - event_capacity), self._events):
+            event = i % event_capacity
+            if self._event_start[event] < oldest_frame:
+                continue # Mesure d'une image sortie du tampon
+            events.append({'name': self.phases[self._event_phase[event]], 'ph': 'X', 'pid': 1, 'tid': 1,
+                           'ts': self._event_start[event] * 1000, 'dur': self._event_duration[event] * 1000})
+        with open(path, 'w', encoding='utf-8') as trace_file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, trace_file)
+
+    def dump(self, path):
+        """Exporte selon l'extension : '.csv' en CSV, sinon trace Chrome (JSON)."""
+        if path.lower().endswith('.csv'):
+            self.dump_csv(path)
+        else:
+            self.dump_chrome_trace(path)
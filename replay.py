@@ -0,0 +1,289 @@
+"""
+Enregistrement et relecture de parties.
+
+Une partie est entièrement déterminée par la graine de son générateur
+aléatoire, les constantes de jeu, les touches lues par `Player.update` et le
+niveau de détail (`Simulation.lod_level`) à chaque pas de simulation. Un
+fichier de replay ne contient donc que cela :
+
+    en-tête   : b'ZSRP', version (u8), graine (u64)
+    config    : longueur (u16) + JSON des constantes de jeu et du moteur
+    résultat  : temps simulé final (f64, ms), nombre de pas (u32), partie
+                finie (u8), position du joueur (2 x f64), entités vivantes (u32)
+    touches   : jusqu'à la fin du fichier, des triplets (répétitions en varint,
+                octet de touches, niveau de détail en u8), un bit par touche
+                de TRACKED_KEYS
+
+    python replay.py record partie.zsr --bot dodge --seed 3
+    python replay.py play partie.zsr
+"""
+import argparse
+import json
+import math
+import os
+import struct
+import time
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+
+import main
+
+MAGIC = b'ZSRP'
+VERSION = 6 # 2 : positions flottantes ; 3 : météorites qui tournent (masques par angle) ;
+            # 4 : arène et caméra (images mises à jour seulement dans la vue) ;
+            # 5 : niveau de détail enregistré à chaque pas ;
+            # 6 : fin de partie, position du joueur et entités dans le résultat
+HEADER = struct.Struct('<4sBQ')
+CONFIG_LENGTH = struct.Struct('<H')
+RESULT = struct.Struct('<dIBddI')
+
+# Touches lues par Player.update, une par bit (8 touches : un octet par pas)
+TRACKED_KEYS = (pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d,
+                pygame.K_UP, pygame.K_w, pygame.K_DOWN, pygame.K_s)
+_KEY_BITS = {key: bit for bit, key in enumerate(TRACKED_KEYS)}
+
+# Constantes de main qui influencent la simulation, enregistrées avec la partie
+GAMEPLAY_CONSTANTS = (
+    'SCREEN_WIDTH', 'SCREEN_HEIGHT', 'WORLD_WIDTH', 'WORLD_HEIGHT', 'FIXED_DELTA_TIME',
+    'PLAYER_SPEED', 'ZOMBIE_MIN_SPEED', 'ZOMBIE_MAX_SPEED', 'TRACKING_ZOMBIE_SPEED',
+    'METEORITE_MIN_SPEED', 'METEORITE_MAX_SPEED', 'METEORITE_DIAG_FACTOR_MIN', 'METEORITE_DIAG_FACTOR_MAX',
+    'INITIAL_ZOMBIE_SPAWN_DELAY', 'MIN_ZOMBIE_SPAWN_DELAY', 'ZOMBIE_SPAWN_DECREASE_RATE',
+    'INITIAL_TRACKING_ZOMBIE_CHANCE', 'INITIAL_METEORITE_SPAWN_DELAY', 'MIN_METEORITE_SPAWN_DELAY',
+    'METEORITE_SPAWN_DECREASE_RATE', 'DIFFICULTY_INCREASE_INTERVAL',
+    'METEORITE_ROTATION_STEPS', 'METEORITE_ROTATION_BUDGET', 'METEORITE_SPIN_FACTOR',
+    'ARENA_OBSTACLES', 'FLOW_FIELD_CELL_SIZE', 'FLOW_FIELD_RADIUS', 'DESPAWN_DISTANCE',
+    'LOD_LEVELS', 'LOD_TRACKER_DISTANCE', 'ENTITY_BUDGET',
+)
+
+
+class ReplayError(Exception):
+    """Fichier de replay invalide ou relecture qui ne redonne pas le même résultat."""
+
+
+class BitKeys:
+    """État de clavier reconstruit depuis un octet de touches."""
+    __slots__ = ('bits',)
+
+    def __init__(self, bits):
+        self.bits = bits
+
+    def __getitem__(self, key):
+        bit = _KEY_BITS.get(key)
+        return bit is not None and bool(self.bits >> bit & 1)
+
+
+# Une instance par octet possible : aucune allocation pendant la relecture
+BIT_KEYS = tuple(BitKeys(bits) for bits in range(1 << len(TRACKED_KEYS)))
+
+
+def encode_keys(keys):
+    """État de clavier -> octet de touches."""
+    bits = 0
+    for bit, key in enumerate(TRACKED_KEYS):
+        if keys[key]:
+            bits |= 1 << bit
+    return bits
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("flux de touches tronqué")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def current_config(engine_name=None):
+    """Constantes de jeu actuelles (et moteur) à enregistrer avec une partie."""
+    config = {name: getattr(main, name) for name in GAMEPLAY_CONSTANTS}
+    config['engine'] = engine_name or main.ENTITY_ENGINE
+    return config
+
+
+def final_state(simulation):
+    """Empreinte de fin de partie : (temps simulé, pas, partie finie, x et y du joueur, entités vivantes)."""
+    return (simulation.elapsed_time, simulation.steps, simulation.game_over,
+            simulation.player.pos_x, simulation.player.pos_y,
+            len(simulation.zombies) + len(simulation.meteorites))
+
+
+class Replay:
+    """Contenu d'un fichier de replay."""
+    def __init__(self, seed, config, result, runs):
+        self.seed = seed
+        self.config = config
+        self.result = tuple(result) # final_state() de la partie enregistrée
+        self.runs = runs            # [(répétitions, octet de touches, niveau de détail), ...]
+
+    @property
+    def elapsed_time(self):
+        """ms simulées à la fin de la partie."""
+        return self.result[0]
+
+    @property
+    def steps(self):
+        return self.result[1]
+
+    def to_bytes(self):
+        config = json.dumps(self.config, separators=(',', ':'), sort_keys=True).encode('utf-8')
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.seed))
+        out += CONFIG_LENGTH.pack(len(config)) + config
+        out += RESULT.pack(*self.result)
+        for count, bits, lod_level in self.runs:
+            _write_varint(out, count)
+            out.append(bits)
+            out.append(lod_level)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size or data[:4] != MAGIC:
+            raise ReplayError("ce n'est pas un fichier de replay")
+        magic, version, seed = HEADER.unpack_from(data)
+        if version != VERSION:
+            raise ReplayError(f"version de replay non gérée: {version}")
+        pos = HEADER.size
+        (config_length,) = CONFIG_LENGTH.unpack_from(data, pos)
+        pos += CONFIG_LENGTH.size
+        config = json.loads(data[pos:pos + config_length].decode('utf-8'))
+        pos += config_length
+        elapsed_time, steps, game_over, player_x, player_y, entities = RESULT.unpack_from(data, pos)
+        result = (elapsed_time, steps, bool(game_over), player_x, player_y, entities)
+        pos += RESULT.size
+        runs = []
+        while pos < len(data):
+            count, pos = _read_varint(data, pos)
+            if pos + 1 >= len(data):
+                raise ReplayError("flux de touches tronqué")
+            runs.append((count, data[pos], data[pos + 1]))
+            pos += 2
+        return cls(seed, config, result, runs)
+
+    def save(self, path):
+        with open(path, 'wb') as replay_file:
+            replay_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as replay_file:
+            return cls.from_bytes(replay_file.read())
+
+
+class ReplayRecorder:
+    """
+    Enregistre les touches d'une partie, pas par pas, avec le niveau de
+    détail de la simulation. `sample(keys)`, appelé juste avant le pas,
+    retourne l'état de clavier à donner à `Simulation.step` (réduit aux
+    touches enregistrées, pour que la relecture voie exactement la même chose).
+    """
+    def __init__(self, simulation, engine_name=None):
+        self.simulation = simulation
+        self.config = current_config(engine_name)
+        self.runs = []
+
+    def sample(self, keys):
+        bits = encode_keys(keys)
+        lod_level = self.simulation.lod_level
+        runs = self.runs
+        if runs and runs[-1][1] == bits and runs[-1][2] == lod_level:
+            runs[-1][0] += 1
+        else:
+            runs.append([1, bits, lod_level])
+        return BIT_KEYS[bits]
+
+    def to_replay(self):
+        simulation = self.simulation
+        return Replay(simulation.seed, self.config, final_state(simulation), [tuple(run) for run in self.runs])
+
+    def save(self, path):
+        self.to_replay().save(path)
+
+
+def play(replay, engine_name=None, verify=True):
+    """
+    Rejoue une partie sans affichage, à vitesse maximale, avec les constantes
+    enregistrées (restaurées ensuite). Vérifie que la partie finit dans le même
+    état (voir `final_state`). Retourne la simulation terminée.
+    """
+    saved = {name: getattr(main, name) for name in GAMEPLAY_CONSTANTS}
+    try:
+        for name in GAMEPLAY_CONSTANTS:
+            if name in replay.config:
+                setattr(main, name, replay.config[name])
+        simulation = main.Simulation(engine_name or replay.config.get('engine'), replay.seed)
+        step = simulation.step
+        for count, bits, lod_level in replay.runs:
+            keys = BIT_KEYS[bits]
+            simulation.lod_level = lod_level
+            for _ in range(count):
+                step(keys)
+    finally:
+        for name, value in saved.items():
+            setattr(main, name, value)
+    if verify and final_state(simulation) != replay.result:
+        raise ReplayError(f"relecture divergente : {final_state(simulation)} au lieu de {replay.result} "
+                          f"(temps ms, pas, partie finie, x, y, entités)")
+    return simulation
+
+
+def record_game(policy, seed=None, max_seconds=None, engine_name=None):
+    """Joue une partie sans affichage avec `policy` en l'enregistrant ; retourne le Replay."""
+    simulation = main.Simulation(engine_name, seed)
+    recorder = ReplayRecorder(simulation, engine_name)
+    max_steps = math.ceil(max_seconds * 1000 / main.FIXED_DELTA_TIME) if max_seconds else None # Comme headless.run_game
+    while not simulation.game_over and (max_steps is None or simulation.steps < max_steps):
+        simulation.step(recorder.sample(policy(simulation)))
+    return recorder.to_replay()
+
+
+def main_cli():
+    import headless
+
+    parser = argparse.ArgumentParser(description="Enregistrer ou rejouer une partie")
+    commands = parser.add_subparsers(dest='command', required=True)
+    record_parser = commands.add_parser('record', help="enregistrer une partie jouée par un bot")
+    record_parser.add_argument('path')
+    record_parser.add_argument('--bot', choices=sorted(headless.POLICIES), default='dodge')
+    record_parser.add_argument('--seed', type=int, default=None)
+    record_parser.add_argument('--max-seconds', type=float, default=None)
+    record_parser.add_argument('--engine', choices=main.ENTITY_ENGINES, default=main.ENTITY_ENGINE)
+    play_parser = commands.add_parser('play', help="rejouer et vérifier une partie")
+    play_parser.add_argument('path')
+    play_parser.add_argument('--engine', choices=main.ENTITY_ENGINES, default=None)
+    args = parser.parse_args()
+
+    main.init_headless()
+    if args.command == 'record':
+        replay = record_game(headless.POLICIES[args.bot](), args.seed, args.max_seconds, args.engine)
+        replay.save(args.path)
+        print(f"Partie enregistrée : graine {replay.seed}, {replay.steps} pas, "
+              f"score {replay.elapsed_time / 1000:.2f} s, {os.path.getsize(args.path)} octets")
+    else:
+        replay = Replay.load(args.path)
+        start = time.perf_counter()
+        try:
+            simulation = play(replay, args.engine)
+        except ReplayError as e:
+            print(f"Erreur: {e}")
+            raise SystemExit(1)
+        elapsed = time.perf_counter() - start
+        print(f"Relecture conforme : score {simulation.score:.2f} s en {simulation.steps} pas, "
+              f"rejouée en {elapsed:.3f} s ({simulation.steps / elapsed:.0f} pas/s)")
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,228 @@
+"""
+Grille de hachage spatial uniforme pour les requêtes de proximité.
+
+Au lieu de parcourir tous les zombies et météorites pour trouver ceux qui
+touchent le joueur, chaque sprite est rangé dans les cellules (carrés de
+`cell_size` pixels) que couvre son rectangle. Une requête ne regarde que les
+sprites des cellules concernées : son coût dépend de la densité locale et non
+du nombre total d'entités.
+
+`SpatialGroup` est un `pygame.sprite.Group` qui tient sa grille à jour
+automatiquement : ajout/retrait (y compris `kill()`) et déplacement des
+sprites, vérifié paresseusement à la requête suivant un `update()`.
+
+Cette vérification parcourt tous les sprites en Python : avec une requête
+par pas, elle coûte plus cher que la requête linéaire qu'elle évite (voir
+benchmarks/bench_collisions.py). La grille ne gagne que si ce sont les
+appelants qui la tiennent à jour sans tout parcourir (moteur numpy, qui ne
+replace que les sprites changés de cellule). `LinearGroup` offre les mêmes
+requêtes par simple parcours, pour les autres cas.
+"""
+import pygame
+
+
+class SpatialHash:
+    """Grille uniforme : cellule (cx, cy) -> sprites dont le rectangle la recouvre."""
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self._cells = {}         # (cx, cy) -> {sprite: None} (dict pour un ordre stable)
+        self._sprite_cells = {}  # sprite -> (cx0, cy0, cx1, cy1) cellules occupées
+        self._regions = {}       # sprite -> Rect (en pixels) des cellules occupées
+
+    def __len__(self):
+        return len(self._sprite_cells)
+
+    def __contains__(self, sprite):
+        return sprite in self._sprite_cells
+
+    def _cell_range(self, rect):
+        """Cellules (bornes incluses) couvertes par un rectangle."""
+        size = self.cell_size
+        left, top = rect.left // size, rect.top // size
+        right = max(left, (rect.right - 1) // size)
+        bottom = max(top, (rect.bottom - 1) // size)
+        return (left, top, right, bottom)
+
+    def insert(self, sprite):
+        """Ajoute un sprite à la grille selon son `rect` actuel."""
+        cell_range = self._cell_range(sprite.rect)
+        self._sprite_cells[sprite] = cell_range
+        cells = self._cells
+        left, top, right, bottom = cell_range
+        size = self.cell_size
+        self._regions[sprite] = pygame.Rect(left * size, top * size,
+                                            (right - left + 1) * size, (bottom - top + 1) * size)
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = {sprite: None}
+                else:
+                    bucket[sprite] = None
+
+    def remove(self, sprite):
+        """Retire un sprite de la grille (sans effet s'il n'y est pas)."""
+        cell_range = self._sprite_cells.pop(sprite, None)
+        if cell_range is None:
+            return
+        del self._regions[sprite]
+        cells = self._cells
+        left, top, right, bottom = cell_range
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = cells[(cx, cy)]
+                del bucket[sprite]
+                if not bucket:
+                    del cells[(cx, cy)]
+
+    def move(self, sprite):
+        """
+        Met à jour la position d'un sprite. Tant que son rectangle reste dans la
+        zone des cellules où il est rangé, rien n'est fait (un seul test en C) :
+        il peut alors être rangé dans une cellule de trop, ce qui ne coûte qu'un
+        candidat supplémentaire, éliminé par le test de chevauchement.
+        """
+        region = self._regions.get(sprite)
+        if region is None or not region.contains(sprite.rect):
+            self.remove(sprite)
+            self.insert(sprite)
+
+    def check(self, sprites):
+        """
+        Compare la grille aux sprites attendus (tests, benchmarks) ; retourne la
+        liste des incohérences : sprites fantômes ou absents, rangés dans des
+        cellules qui ne couvrent plus leur rectangle, cellules mal tenues.
+        """
+        expected = set(sprites)
+        problems = [f"fantôme : {sprite!r}" for sprite in self._sprite_cells.keys() - expected]
+        problems += [f"absent : {sprite!r}" for sprite in expected - self._sprite_cells.keys()]
+        problems += [f"mal rangé : {sprite!r} {sprite.rect}"
+                     for sprite, region in self._regions.items() if not region.contains(sprite.rect)]
+        stored = {}
+        for (cx, cy), bucket in self._cells.items():
+            for sprite in bucket:
+                stored.setdefault(sprite, set()).add((cx, cy))
+        for sprite, (left, top, right, bottom) in self._sprite_cells.items():
+            cells = {(cx, cy) for cx in range(left, right + 1) for cy in range(top, bottom + 1)}
+            if stored.pop(sprite, set()) != cells:
+                problems.append(f"cellules incohérentes : {sprite!r}")
+        problems += [f"cellules orphelines : {sprite!r}" for sprite in stored]
+        return problems
+
+    def clear(self):
+        """Vide la grille."""
+        self._cells.clear()
+        self._sprite_cells.clear()
+        self._regions.clear()
+
+    def nearby(self, rect):
+        """Sprites des cellules couvertes par `rect` (candidats, sans test de chevauchement)."""
+        cells = self._cells
+        left, top, right, bottom = self._cell_range(rect)
+        if left == right and top == bottom:
+            return list(cells.get((left, top), ()))
+        found = {}
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return list(found)
+
+    def query_rect(self, rect):
+        """Sprites dont le rectangle chevauche `rect`."""
+        colliderect = pygame.Rect(rect).colliderect
+        return [sprite for sprite in self.nearby(rect) if colliderect(sprite.rect)]
+
+    def query_radius(self, center, radius):
+        """Sprites dont le rectangle est à une distance au plus `radius` du point `center`."""
+        x, y = center
+        # Un pixel de marge : `within_radius` compte le bord droit / bas (exclu du
+        # rectangle) d'un sprite qui peut ne pas recouvrir les cellules de la zone
+        bounds = pygame.Rect(0, 0, 2 * radius + 3, 2 * radius + 3)
+        bounds.center = (int(x), int(y))
+        return within_radius(self.nearby(bounds), center, radius)
+
+
+def within_radius(sprites, center, radius):
+    """Sprites dont le rectangle est à une distance au plus `radius` du point `center`."""
+    x, y = center
+    radius_sq = radius * radius
+    found = []
+    for sprite in sprites:
+        rect = sprite.rect
+        # Point du rectangle le plus proche du centre
+        nearest_x = min(max(x, rect.left), rect.right)
+        nearest_y = min(max(y, rect.top), rect.bottom)
+        if (nearest_x - x) ** 2 + (nearest_y - y) ** 2 <= radius_sq:
+            found.append(sprite)
+    return found
+
+
+class SpatialGroup(pygame.sprite.Group):
+    """Groupe de sprites doublé d'une `SpatialHash` maintenue automatiquement."""
+    def __init__(self, cell_size, *sprites):
+        self.grid = SpatialHash(cell_size)
+        self._stale = False # Sprites peut-être déplacés depuis le dernier `refresh()`
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.grid.insert(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.grid.remove(sprite)
+
+    def update(self, *args, **kwargs):
+        """Appelle `update()` de chaque sprite ; la grille sera revue à la prochaine requête."""
+        super().update(*args, **kwargs)
+        self._stale = True
+
+    def refresh(self):
+        """Replace dans la grille les sprites déplacés depuis la dernière mise à jour."""
+        grid = self.grid
+        moved = [sprite for sprite, region in grid._regions.items() if not region.contains(sprite.rect)]
+        for sprite in moved:
+            grid.move(sprite)
+        self._stale = False
+
+    def check_grid(self):
+        """Incohérences entre la grille et les sprites du groupe (voir `SpatialHash.check`)."""
+        if self._stale:
+            self.refresh()
+        return self.grid.check(self.sprites())
+
+    def nearby(self, rect):
+        """Sprites des cellules couvertes par `rect` (candidats, sans test de chevauchement)."""
+        if self._stale:
+            self.refresh()
+        return self.grid.nearby(rect)
+
+    def query_rect(self, rect):
+        """Sprites du groupe dont le rectangle chevauche `rect`."""
+        if self._stale:
+            self.refresh()
+        return self.grid.query_rect(rect)
+
+    def query_radius(self, center, radius):
+        """Sprites du groupe à une distance au plus `radius` de `center`."""
+        if self._stale:
+            self.refresh()
+        return self.grid.query_radius(center, radius)
+
+
+class LinearGroup(pygame.sprite.Group):
+    """Groupe de sprites offrant les requêtes de `SpatialGroup` par parcours linéaire."""
+    def nearby(self, rect):
+        """Tous les sprites du groupe (aucun n'est écarté sans test)."""
+        return self.sprites()
+
+    def query_rect(self, rect):
+        """Sprites du groupe dont le rectangle chevauche `rect`."""
+        colliderect = pygame.Rect(rect).colliderect
+        return [sprite for sprite in self if colliderect(sprite.rect)]
+
+    def query_radius(self, center, radius):
+        """Sprites du groupe à une distance au plus `radius` de `center`."""
+        return within_radius(self, center, radius)
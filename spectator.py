@@ -0,0 +1,443 @@
+"""
+Diffusion de la partie en cours à des spectateurs (autres écrans, analyses).
+
+Un serveur asyncio, dans son propre thread, accepte des clients en TCP ou
+sur un socket Unix et leur envoie à chaque pas de simulation un instantané
+binaire : position du joueur, des zombies et des météorites. Pour rester
+compact, on n'envoie l'état complet (image clé) que toutes les
+`keyframe_interval` pas, à chaque nouvelle partie et à l'arrivée d'un
+client ; entre deux, seulement les entités apparues ou modifiées et les
+numéros de celles qui ont disparu (delta par rapport au pas précédent).
+
+Messages : longueur (u32) puis
+    en-tête : type (u8, KEYFRAME ou DELTA), pas (u32), temps simulé (u32, ms),
+              fin de partie (u8), joueur x, y (i16) et direction (u8)
+    entités : nombre (u32), puis par entité numéro (u32), type (u8),
+              x, y (i16, coin du rect dans l'arène, bornés), image (u16, bornée)
+    retirées : nombre (u32), puis numéros (u32) ; toujours 0 dans une image clé
+
+En retour, le spectateur envoie le pas de chaque message traité (ACK, u32).
+
+L'image est l'indice de direction (DIRECTIONS) d'un zombie ou l'indice de
+l'image tournée d'une météorite. Le type vient de `snapshot_kind` (KINDS).
+
+Le jeu ne bloque jamais : `publish()` encode dans le thread du jeu puis
+confie le message à la boucle asyncio (`call_soon_threadsafe`). Chaque
+client a une file bornée, et ne peut avoir plus de MAX_CLIENT_LAG pas
+envoyés mais pas encore acquittés (les tampons réseau, eux, se comptent en
+octets : des secondes de petits messages). Au-delà, un client trop lent perd
+des messages au lieu de ralentir les autres ou la partie ; comme ses deltas
+n'ont plus de base, il ne reçoit ensuite plus rien avant la prochaine image
+clé. Un client qui n'acquitte jamais n'est borné que par sa file. Sans
+client, rien n'est encodé.
+
+    python main.py --serve 127.0.0.1:8765        # ou --serve unix:/tmp/zombies.sock
+    python spectator.py 127.0.0.1:8765 [--seconds 10] [--slow 0.05]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import stat
+import struct
+import threading
+import time
+
+KEYFRAME, DELTA = 1, 2
+KINDS = ('zombie', 'traqueur', 'meteorite')  # Indice = snapshot_kind des sprites
+DIRECTIONS = ('nord', 'sud', 'est', 'ouest') # Même ordre que main.DIRECTIONS
+_DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+LENGTH = struct.Struct('<I')
+HEADER = struct.Struct('<BIIBhhB')
+COUNT = struct.Struct('<I')
+ENTITY = struct.Struct('<IBhhH')
+ENTITY_ID = struct.Struct('<I')
+ACK = struct.Struct('<I')
+COORD_MIN, COORD_MAX = -32768, 32767
+IMAGE_MAX = 0xFFFF # Un indice d'image hors format ne doit pas faire échouer le thread du jeu
+
+KEYFRAME_INTERVAL = 60 # Pas entre deux images clés (une par seconde de jeu)
+CLIENT_QUEUE_SIZE = 8  # Messages en attente par client avant d'en perdre
+MAX_CLIENT_LAG = 30    # Pas envoyés et pas encore acquittés avant d'en perdre (0,5 s)
+SEND_BUFFER_SIZE = 16 * 1024 # Octets en transit par client (tampons système et asyncio)
+
+
+class SpectatorError(Exception):
+    """Flux de spectateur invalide (message tronqué ou inconnu)."""
+
+
+def parse_address(text):
+    """'hôte:port' -> (hôte, port) ; 'unix:/chemin' -> '/chemin'."""
+    if text.startswith('unix:'):
+        return text[len('unix:'):]
+    host, _, port = text.rpartition(':')
+    return (host or '127.0.0.1', int(port))
+
+
+def _coord(value):
+    return COORD_MIN if value < COORD_MIN else COORD_MAX if value > COORD_MAX else value
+
+
+def capture(simulation):
+    """État des entités d'une partie : {numéro: (type, x, y, image)}."""
+    state = {}
+    for sprite in simulation.zombies:
+        rect = sprite.rect
+        state[sprite.entity_id] = (sprite.snapshot_kind, _coord(rect.x), _coord(rect.y),
+                                   _DIRECTION_CODES.get(sprite.direction, 0))
+    for sprite in simulation.meteorites:
+        rect = sprite.rect
+        state[sprite.entity_id] = (sprite.snapshot_kind, _coord(rect.x), _coord(rect.y), min(sprite.frame, IMAGE_MAX))
+    return state
+
+
+class SnapshotEncoder:
+    """
+    Encode les pas successifs d'une partie en images clés et deltas.
+    `reset()` (nouvelle partie, client arrivé) force une image clé au pas suivant.
+    """
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.previous = None # État du dernier message (None : prochain message = image clé)
+        self.since_keyframe = 0
+
+    def reset(self):
+        self.previous = None
+
+    def encode(self, simulation, keyframe=False):
+        """Message (longueur comprise) pour l'état actuel ; retourne (message, image clé ?)."""
+        state = capture(simulation)
+        previous = self.previous
+        keyframe = keyframe or previous is None or self.since_keyframe >= self.keyframe_interval
+        if keyframe:
+            changed, removed = state.items(), ()
+            self.since_keyframe = 0
+        else:
+            changed = [(entity_id, entity) for entity_id, entity in state.items()
+                       if previous.get(entity_id) != entity]
+            removed = [entity_id for entity_id in previous if entity_id not in state]
+            self.since_keyframe += 1
+        self.previous = state
+
+        player = simulation.player
+        parts = [HEADER.pack(KEYFRAME if keyframe else DELTA, simulation.steps, round(simulation.elapsed_time),
+                             simulation.game_over, _coord(player.rect.x), _coord(player.rect.y),
+                             _DIRECTION_CODES.get(player.direction, 0)),
+                 COUNT.pack(len(changed))]
+        pack = ENTITY.pack
+        parts.extend(pack(entity_id, *entity) for entity_id, entity in changed)
+        parts.append(COUNT.pack(len(removed)))
+        pack = ENTITY_ID.pack
+        parts.extend(pack(entity_id) for entity_id in removed)
+        payload = b''.join(parts)
+        return LENGTH.pack(len(payload)) + payload, keyframe
+
+
+class _Client:
+    __slots__ = ('queue', 'resync', 'dropped', 'sent_tick', 'acked_tick')
+
+    def __init__(self, queue_size):
+        self.queue = asyncio.Queue(queue_size)
+        self.resync = True # Attend une image clé (deltas sans base)
+        self.dropped = 0
+        self.sent_tick = 0
+        self.acked_tick = None # Pas du dernier message traité (None : n'acquitte pas)
+
+
+class SpectatorServer:
+    """
+    Serveur de spectateurs. `start()` ouvre le socket et lance la boucle
+    asyncio dans un thread ; `publish(simulation)` après chaque pas (thread du
+    jeu, non bloquant) ; `new_game()` au début d'une partie ; `close()`.
+
+    Args:
+        address: (hôte, port) pour TCP (port 0 : choisi par le système) ou
+            chemin d'un socket Unix (voir parse_address).
+        keyframe_interval (int): pas entre deux images clés.
+        queue_size (int): messages en attente par client avant d'en perdre.
+    """
+    def __init__(self, address, keyframe_interval=KEYFRAME_INTERVAL, queue_size=CLIENT_QUEUE_SIZE):
+        self.address = address
+        self.queue_size = queue_size
+        self.encoder = SnapshotEncoder(keyframe_interval)
+        self._loop = None
+        self._thread = None
+        self._server = None
+        self._error = None
+        self._clients = set()      # Seulement manipulé dans le thread asyncio
+        self._client_count = 0     # Lu par le thread du jeu
+        self._want_keyframe = False
+        # Statistiques
+        self.published = 0         # Messages encodés
+        self.sent = 0              # Messages mis en file (tous clients)
+        self.dropped = 0           # Messages perdus par des clients lents
+        self.bytes_sent = 0
+        self.connections = 0
+
+    # --- Thread du jeu ---
+
+    def start(self):
+        """Ouvre le socket (erreur OSError si impossible) ; retourne l'adresse réelle."""
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name='spectateurs', daemon=True)
+        self._thread.start()
+        ready.wait()
+        if self._error is not None:
+            self._thread.join()
+            raise self._error
+        return self.address
+
+    def new_game(self):
+        """Nouvelle partie : numéros et pas repartent de zéro, image clé au prochain pas."""
+        self.encoder.reset()
+
+    def publish(self, simulation):
+        """Diffuse l'état actuel de la partie ; ne fait rien sans client."""
+        if not self._client_count:
+            self.encoder.reset() # Pas de base commune avec un futur client
+            return
+        keyframe = self._want_keyframe
+        if keyframe:
+            self._want_keyframe = False
+        message, keyframe = self.encoder.encode(simulation, keyframe)
+        self.published += 1
+        self._loop.call_soon_threadsafe(self._broadcast, message, keyframe, simulation.steps)
+
+    def close(self):
+        if self._loop is not None and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+        self._loop = None
+        self._client_count = 0
+
+    def stats(self):
+        return {
+            'clients': self._client_count,
+            'connections': self.connections,
+            'published': self.published,
+            'sent': self.sent,
+            'dropped': self.dropped,
+            'bytes_sent': self.bytes_sent,
+        }
+
+    # --- Thread asyncio ---
+
+    def _run(self, ready):
+        loop = asyncio.new_event_loop()
+        try:
+            self._server = loop.run_until_complete(self._listen())
+        except OSError as e:
+            self._error = e
+            loop.close()
+            ready.set()
+            return
+        self._loop = loop
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            loop.run_until_complete(self._shutdown())
+            loop.close()
+            if isinstance(self.address, str) and os.path.exists(self.address):
+                os.unlink(self.address)
+
+    async def _listen(self):
+        if isinstance(self.address, str):
+            # Socket laissé par une session précédente
+            if os.path.exists(self.address) and stat.S_ISSOCK(os.stat(self.address).st_mode):
+                os.unlink(self.address)
+            return await asyncio.start_unix_server(self._serve_client, self.address)
+        host, port = self.address
+        server = await asyncio.start_server(self._serve_client, host, port)
+        self.address = server.sockets[0].getsockname()[:2] # Port réel si 0
+        return server
+
+    async def _shutdown(self):
+        self._server.close()
+        tasks = asyncio.all_tasks() - {asyncio.current_task()}
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def _serve_client(self, reader, writer):
+        # Tampons d'envoi réduits : un client lent remplit vite sa file, même
+        # s'il n'acquitte pas, au lieu d'accumuler des Mo de retard
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_SIZE)
+        writer.transport.set_write_buffer_limits(high=SEND_BUFFER_SIZE)
+        client = _Client(self.queue_size)
+        self._clients.add(client)
+        self._client_count = len(self._clients)
+        self._want_keyframe = True # Le nouveau client a besoin d'un état complet
+        self.connections += 1
+        acks = asyncio.ensure_future(self._read_acks(reader, client, asyncio.current_task()))
+        try:
+            while True:
+                message = await client.queue.get()
+                writer.write(message)
+                await writer.drain() # Client lent : sa file se remplit, le jeu continue
+                self.bytes_sent += len(message)
+        except (ConnectionError, asyncio.CancelledError):
+            pass # Client parti, ou serveur arrêté par close()
+        finally:
+            acks.cancel()
+            self._clients.discard(client)
+            self._client_count = len(self._clients)
+            writer.close()
+
+    async def _read_acks(self, reader, client, sender):
+        """Pas acquittés par le client ; fin du flux : client parti, on arrête de lui écrire."""
+        try:
+            while True:
+                (client.acked_tick,) = ACK.unpack(await reader.readexactly(ACK.size))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            sender.cancel()
+
+    def _broadcast(self, message, keyframe, tick):
+        for client in self._clients:
+            if client.resync and not keyframe:
+                client.dropped += 1
+                self.dropped += 1
+            elif client.queue.full() or (client.acked_tick is not None and
+                                         client.sent_tick - client.acked_tick > MAX_CLIENT_LAG):
+                # Message perdu : les deltas suivants n'auraient plus de base
+                client.resync = True
+                client.dropped += 1
+                self.dropped += 1
+            else:
+                client.resync = False
+                client.sent_tick = tick
+                client.queue.put_nowait(message)
+                self.sent += 1
+
+
+# --- Côté spectateur ---
+
+class SnapshotDecoder:
+    """État de la partie reconstruit à partir des messages reçus."""
+    def __init__(self):
+        self.entities = {}  # numéro -> (type, x, y, image)
+        self.player = None  # (x, y, direction)
+        self.tick = None
+        self.elapsed_time = 0
+        self.game_over = False
+        self.synced = False # Une image clé a été reçue (les deltas s'appliquent)
+        self.keyframes = self.deltas = self.skipped = 0
+
+    def feed(self, payload):
+        """Applique un message (sans sa longueur) ; retourne False s'il a été ignoré."""
+        try:
+            kind, tick, elapsed, game_over, player_x, player_y, direction = HEADER.unpack_from(payload)
+            if kind not in (KEYFRAME, DELTA):
+                raise SpectatorError(f"type de message inconnu: {kind}")
+            if kind == DELTA and not (self.synced and tick == self.tick + 1):
+                self.synced = False # Pas manquant : attendre la prochaine image clé
+                self.skipped += 1
+                return False
+            pos = HEADER.size
+            (count,) = COUNT.unpack_from(payload, pos)
+            pos += COUNT.size
+            if kind == KEYFRAME:
+                self.entities = {}
+                self.synced = True
+                self.keyframes += 1
+            else:
+                self.deltas += 1
+            entities = self.entities
+            for _ in range(count):
+                entity_id, entity_kind, x, y, image = ENTITY.unpack_from(payload, pos)
+                entities[entity_id] = (entity_kind, x, y, image)
+                pos += ENTITY.size
+            (count,) = COUNT.unpack_from(payload, pos)
+            pos += COUNT.size
+            for _ in range(count):
+                entities.pop(ENTITY_ID.unpack_from(payload, pos)[0], None)
+                pos += ENTITY_ID.size
+        except struct.error as e:
+            raise SpectatorError(f"message tronqué: {e}") from None
+        self.tick, self.elapsed_time, self.game_over = tick, elapsed, bool(game_over)
+        self.player = (player_x, player_y, direction)
+        return True
+
+    def counts(self):
+        """Nombre d'entités vivantes par type."""
+        counts = dict.fromkeys(KINDS, 0)
+        for entity_kind, _, _, _ in self.entities.values():
+            counts[KINDS[entity_kind]] += 1
+        return counts
+
+
+async def open_stream(address):
+    if isinstance(address, str):
+        return await asyncio.open_unix_connection(address)
+    return await asyncio.open_connection(*address)
+
+
+async def read_message(reader):
+    """Prochain message (sans sa longueur) ; IncompleteReadError en fin de flux."""
+    (length,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+    return await reader.readexactly(length)
+
+
+async def watch(address, seconds=None, slow=0.0):
+    """
+    Spectateur de test : affiche chaque seconde ce qui a été reçu, pendant
+    `seconds` secondes au plus (même si le serveur n'envoie plus rien).
+    `slow` : pause après chaque message (simule un client lent).
+    """
+    reader, writer = await open_stream(address)
+    decoder = SnapshotDecoder()
+    start = last = time.perf_counter()
+    messages = received = 0
+    try:
+        while True:
+            remaining = None if seconds is None else seconds - (time.perf_counter() - start)
+            if remaining is not None and remaining <= 0:
+                break
+            try:
+                payload = await asyncio.wait_for(read_message(reader), remaining)
+            except asyncio.TimeoutError:
+                break # Partie en pause ou terminée : la durée demandée est écoulée
+            except asyncio.IncompleteReadError:
+                print("Flux terminé par le serveur")
+                break
+            decoder.feed(payload)
+            writer.write(ACK.pack(HEADER.unpack_from(payload)[1])) # Pas traité
+            messages += 1
+            received += LENGTH.size + len(payload)
+            if slow:
+                await asyncio.sleep(slow)
+            now = time.perf_counter()
+            if now - last >= 1.0:
+                counts = ', '.join(f"{count} {kind}" for kind, count in decoder.counts().items())
+                print(f"pas {decoder.tick} ({decoder.elapsed_time / 1000:.1f} s) : {counts} | "
+                      f"{messages / (now - last):.0f} messages/s, {received / (now - last) / 1024:.1f} Ko/s | "
+                      f"images clés {decoder.keyframes}, deltas {decoder.deltas}, ignorés {decoder.skipped}"
+                      f"{' | fin de partie' if decoder.game_over else ''}", flush=True)
+                last, messages, received = now, 0, 0
+    finally:
+        writer.close()
+    return decoder
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Regarder une partie diffusée par main.py --serve")
+    parser.add_argument('address', help="hôte:port ou unix:/chemin")
+    parser.add_argument('--seconds', type=float, default=None, help="durée d'observation")
+    parser.add_argument('--slow', type=float, default=0.0, metavar='SECONDES',
+                        help="pause après chaque message (client lent)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(watch(parse_address(args.address), args.seconds, args.slow))
+    except (OSError, SpectatorError) as e:
+        print(f"Erreur: {e}")
+        raise SystemExit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,279 @@
+"""
+Tests de non-régression du jeu, sans affichage :
+    python -m pytest -q
+"""
+import importlib.util
+import os
+import random
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import pytest
+
+import headless
+import main
+from spatial_hash import SpatialGroup
+
+MOVE_KEYS = (pygame.K_LEFT, pygame.K_UP, pygame.K_RIGHT, pygame.K_DOWN)
+
+
+@pytest.fixture(scope='module', autouse=True)
+def headless_display():
+    main.init_headless()
+
+
+# --- Moteurs 'objects' et 'numpy' ---
+
+def crowded_run(engine_name, population=400, frames=120, seed=0):
+    """
+    Population maintenue par apparitions à chaque image (comme
+    benchmarks/bench_engines.py) ; retourne les empreintes par image et les
+    incohérences des grilles spatiales.
+    """
+    rng = random.Random(seed)
+    zombies, meteorites = SpatialGroup(main.SPATIAL_CELL_SIZE), SpatialGroup(main.SPATIAL_CELL_SIZE)
+    player = main.Player()
+    engine = main.create_entity_engine(zombies, meteorites, engine_name)
+    fingerprints, problems = [], []
+    for frame in range(frames):
+        while len(zombies) + len(meteorites) < population:
+            roll = rng.random()
+            if roll < 0.2:
+                sprite, group = main.TrackingZombie(rng), zombies
+            elif roll < 0.7:
+                sprite, group = main.Zombie(rng), zombies
+            else:
+                sprite, group = main.Meteorite(rng.choice(main.METEORITE_TYPES), rng), meteorites
+            group.add(sprite)
+            if engine is not None:
+                engine.add(sprite)
+        player.update(headless.KeyState([MOVE_KEYS[(frame // 45) % len(MOVE_KEYS)]]))
+        if engine is not None:
+            engine.step(player)
+        else:
+            zombies.update(player)
+            meteorites.update()
+        fingerprints.append(sorted((type(s).__name__, tuple(s.rect), s.pos_x, s.pos_y)
+                                   for s in (*zombies, *meteorites)))
+        problems += [(frame, problem) for group in (zombies, meteorites) for problem in group.check_grid()]
+    return fingerprints, problems
+
+
+def test_engines_match_with_consistent_grids():
+    pytest.importorskip('numpy')
+    objects_prints, objects_problems = crowded_run('objects')
+    numpy_prints, numpy_problems = crowded_run('numpy')
+    assert objects_problems == []
+    assert numpy_problems == [] # Pas de sprite fantôme après compactage des tableaux
+    assert objects_prints == numpy_prints
+
+
+def test_headless_games_match_across_engines():
+    pytest.importorskip('numpy')
+    for seed in range(3):
+        objects = headless.run_game(headless.DodgeBot(), seed, 20, 'objects')
+        vectorized = headless.run_game(headless.DodgeBot(), seed, 20, 'numpy')
+        # La phase large dépend du groupe (linéaire ou grille, voir SPATIAL_GRID)
+        del objects['broad_tests'], vectorized['broad_tests']
+        assert objects == vectorized
+
+
+@pytest.mark.parametrize('obstacles', [None, 'couloirs'])
+def test_collision_counts_belong_to_each_game(monkeypatch, obstacles):
+    if obstacles:
+        monkeypatch.setattr(main, 'ARENA_OBSTACLES', main.obstacle_preset(obstacles))
+    runs = [headless.run_game(headless.DodgeBot(), 1, None, 'objects') for _ in range(3)]
+    assert all(run == runs[0] for run in runs) # Ni le dernier pas d'une partie ni celui de la précédente
+    if importlib.util.find_spec('numpy'):
+        vectorized = headless.run_game(headless.DodgeBot(), 1, None, 'numpy')
+        assert vectorized['narrow_tests'] == runs[0]['narrow_tests']
+
+
+@pytest.mark.parametrize('engine_name', ['objects', 'numpy'])
+def test_entities_despawn_near_the_camera_in_a_large_world(monkeypatch, engine_name):
+    if engine_name == 'numpy':
+        pytest.importorskip('numpy')
+    monkeypatch.setattr(main, 'WORLD_WIDTH', 8000)
+    monkeypatch.setattr(main, 'WORLD_HEIGHT', 6000)
+    simulation = main.Simulation(engine_name, seed=0)
+    bot = headless.DodgeBot()
+    while simulation.steps < 3000 and not simulation.game_over:
+        simulation.step(bot(simulation))
+        view = simulation.view
+        assert not any(main.beyond_despawn_distance(sprite.rect, view)
+                       for sprite in (*simulation.zombies, *simulation.meteorites))
+
+
+def lod_despawn_run(engine_name, trackers=16, steps=400):
+    """
+    Traqueurs lointains (simulés un pas sur huit) placés juste en deçà de
+    DESPAWN_DISTANCE pendant que le joueur s'éloigne ; retourne les traqueurs
+    encore présents à chaque pas.
+    """
+    simulation = main.Simulation(engine_name, seed=0)
+    simulation.lod_level = len(main.LOD_LEVELS) - 1
+    simulation.zombie_spawn_delay = simulation.meteorite_spawn_delay = float('inf') # Aucune autre apparition
+    view = main.camera_view(*simulation.player.rect.center)
+    for index in range(trackers):
+        tracker = main.TrackingZombie(simulation.rng)
+        tracker.place(view.left - main.DESPAWN_DISTANCE - tracker.rect.width + 1 + 3 * index,
+                      view.top + 40 * index)
+        simulation._spawn(tracker, simulation.zombies)
+    walk_right = headless.KeyState([pygame.K_RIGHT])
+    present = []
+    while simulation.steps < steps:
+        simulation.step(walk_right)
+        present.append(sorted((sprite.entity_id, tuple(sprite.rect)) for sprite in simulation.zombies))
+    return present
+
+
+def test_engines_match_when_lod_skips_far_trackers(monkeypatch):
+    pytest.importorskip('numpy')
+    monkeypatch.setattr(main, 'WORLD_WIDTH', 8000)
+    monkeypatch.setattr(main, 'WORLD_HEIGHT', 6000)
+    objects, vectorized = lod_despawn_run('objects'), lod_despawn_run('numpy')
+    assert objects[-1] == [] # Tous supprimés en cours de route
+    assert objects == vectorized
+
+
+def test_step_reads_the_current_fixed_delta_time(monkeypatch):
+    monkeypatch.setattr(main, 'FIXED_DELTA_TIME', 2 * main.FIXED_DELTA_TIME) # Comme batch.py --set
+    simulation = main.Simulation('objects', seed=0)
+    simulation.step(headless.KeyState([]))
+    assert simulation.elapsed_time == main.FIXED_DELTA_TIME
+
+
+def test_entity_budget_only_applies_above_level_zero():
+    simulation = main.Simulation('objects', seed=0)
+    assert simulation.entity_budget() is None
+    budgets = []
+    for level in range(1, len(main.LOD_LEVELS)):
+        simulation.lod_level = level
+        budgets.append(simulation.entity_budget())
+    assert budgets == sorted(budgets, reverse=True) and budgets[0] < main.ENTITY_BUDGET
+
+
+# --- Pack d'images ---
+
+def test_asset_pack_detects_a_source_edited_in_place(tmp_path):
+    import shutil
+    import asset_pack
+    source = os.path.join(asset_pack.ASSET_DIR, 'zombie_est.png')
+    shutil.copy(source, tmp_path / 'zombie_est.png')
+    asset_pack.build_pack([('zombie_est.png', main.ZOMBIE_TARGET_SIZE)], str(tmp_path))
+    pack = asset_pack.open_pack(str(tmp_path))
+    try:
+        assert pack.load('zombie_est.png', main.ZOMBIE_TARGET_SIZE) is not None
+        stat = os.stat(tmp_path / 'zombie_est.png')
+        os.utime(tmp_path / 'zombie_est.png', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9)) # Même taille
+        assert pack.load('zombie_est.png', main.ZOMBIE_TARGET_SIZE) is None
+    finally:
+        pack.close()
+
+
+# --- Lanceur en lot ---
+
+def test_parse_override_keeps_nested_commas():
+    import batch
+    assert batch.parse_override('INITIAL_ZOMBIE_SPAWN_DELAY=1000, 1500') == ('INITIAL_ZOMBIE_SPAWN_DELAY', [1000, 1500])
+    assert batch.parse_override('ARENA_OBSTACLES=((0, 0, 10, 10),), ()') == \
+        ('ARENA_OBSTACLES', [((0, 0, 10, 10),), ()])
+
+
+# --- Replays ---
+
+def test_replay_round_trip_on_both_engines():
+    import replay
+    recorded = replay.record_game(headless.DodgeBot(), seed=3, max_seconds=15)
+    loaded = replay.Replay.from_bytes(recorded.to_bytes())
+    assert loaded.to_bytes() == recorded.to_bytes()
+    assert (loaded.seed, loaded.result, loaded.runs) == (recorded.seed, recorded.result, recorded.runs)
+    engines = ('objects', 'numpy') if importlib.util.find_spec('numpy') else ('objects',)
+    for engine_name in engines:
+        assert replay.final_state(replay.play(loaded, engine_name)) == recorded.result
+
+
+def test_replay_rejects_older_versions():
+    import replay
+    data = bytearray(replay.record_game(headless.DodgeBot(), seed=3, max_seconds=1).to_bytes())
+    data[len(replay.MAGIC)] = 5 # Résultat encore au format de la version 5
+    with pytest.raises(replay.ReplayError, match='version'):
+        replay.Replay.from_bytes(bytes(data))
+
+
+def test_replay_detects_divergent_inputs():
+    import replay
+    recorded = replay.record_game(headless.DodgeBot(), seed=3, max_seconds=15)
+    count, bits, lod_level = recorded.runs[0]
+    recorded.runs[0] = (count, bits ^ 1, lod_level) # Première touche inversée
+    with pytest.raises(replay.ReplayError):
+        replay.play(recorded)
+
+
+# --- Flux des spectateurs ---
+
+def test_spectator_codec_tracks_the_game():
+    import spectator
+    simulation = main.Simulation('objects', seed=1)
+    simulation.zombie_spawn_delay = simulation.meteorite_spawn_delay = 100 # Entités qui apparaissent et disparaissent
+    encoder, decoder = spectator.SnapshotEncoder(keyframe_interval=25), spectator.SnapshotDecoder()
+    bot = headless.DodgeBot()
+    while simulation.steps < 300 and not simulation.game_over:
+        simulation.step(bot(simulation))
+        message, _ = encoder.encode(simulation)
+        assert decoder.feed(message[spectator.LENGTH.size:])
+        assert decoder.entities == spectator.capture(simulation)
+        assert decoder.player[:2] == tuple(simulation.player.rect.topleft)
+        assert decoder.tick == simulation.steps
+    assert decoder.keyframes > 1 and decoder.keyframes + decoder.deltas == simulation.steps
+
+
+def test_spectator_codec_handles_large_counts_and_frames():
+    import spectator
+    from types import SimpleNamespace
+
+    def sprite(entity_id, kind, **extra):
+        return SimpleNamespace(entity_id=entity_id, snapshot_kind=kind, rect=pygame.Rect(entity_id % 900, 5, 30, 30),
+                               **extra)
+    player = SimpleNamespace(rect=pygame.Rect(400, 300, 40, 40), direction='nord')
+    simulation = SimpleNamespace(
+        zombies=[sprite(i, 0, direction='est') for i in range(70000)],
+        meteorites=[sprite(70000, 2, frame=300), sprite(70001, 2, frame=1 << 20)],
+        player=player, steps=1, elapsed_time=16.7, game_over=False)
+    message, keyframe = spectator.SnapshotEncoder().encode(simulation)
+    decoder = spectator.SnapshotDecoder()
+    assert keyframe and decoder.feed(message[spectator.LENGTH.size:])
+    assert len(decoder.entities) == 70002
+    assert decoder.entities[70000][3] == 300 and decoder.entities[70001][3] == spectator.IMAGE_MAX
+
+
+def test_spectator_watch_stops_when_the_stream_is_quiet():
+    import asyncio
+    import time
+    import spectator
+
+    async def scenario():
+        server = await asyncio.start_server(lambda reader, writer: None, '127.0.0.1', 0) # N'envoie rien
+        address = server.sockets[0].getsockname()[:2]
+        start = time.perf_counter()
+        decoder = await spectator.watch(address, seconds=0.3)
+        server.close()
+        return decoder, time.perf_counter() - start
+
+    decoder, elapsed = asyncio.run(scenario())
+    assert decoder.tick is None and elapsed < 2.0
+
+
+# --- Sessions enchaînées ---
+
+def test_soak_restarts_keep_memory_flat():
+    import subprocess
+    script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'soak_sessions.py')
+    completed = subprocess.run([sys.executable, script, '--restarts', '60', '--warmup', '20', '--sample-every', '20'],
+                               capture_output=True, text=True, timeout=300)
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+    assert 'Croissance mémoire' in completed.stdout
@@ -0,0 +1,329 @@
+"""
+Moteur de simulation vectorisé (NumPy) pour les zombies et les météorites.
+
+Au lieu d'appeler `update()` sur chaque sprite, l'état de toutes les entités
+est rangé dans des tableaux NumPy (structure de tableaux) : positions,
+vitesses, type. Une image de simulation devient quelques opérations sur ces
+tableaux :
+- les zombies droits et les météorites avancent en un seul pas ;
+- les vecteurs de poursuite de tous les zombies traqueurs sont normalisés
+  d'un coup (cible lue en lot dans le champ de flux s'il y a des obstacles) ;
+  avec un niveau de détail réduit, les traqueurs lointains ne bougent qu'un
+  pas sur N (masque calculé en lot) ;
+- les angles des météorites tournent en lot ; seules celles qui changent
+  d'image tournée sont mises à jour une par une, et seulement si elles sont
+  dans la zone vue par la caméra (de même pour l'image des traqueurs) ;
+- les entités sorties de l'arène, ou trop loin de la zone vue par la caméra,
+  sont retirées par masque booléen, puis les tableaux sont compactés.
+
+Les sprites restent de simples vues pour l'affichage et les collisions : leur
+position exacte (et celle du pas précédent, pour l'interpolation) et leur
+`rect` sont recopiés depuis les tableaux après chaque pas. Pour les groupes à
+grille spatiale (SpatialGroup), les cellules occupées sont aussi suivies dans
+des tableaux : seuls les sprites qui changent de cellule touchent la grille.
+
+Les calculs reproduisent exactement ceux des méthodes `update()` des sprites
+(mêmes opérations flottantes dans le même ordre, et l'arrondi de pygame lors
+de l'affectation d'un flottant à un `Rect`), de sorte que les deux moteurs
+donnent les mêmes positions pour une même graine aléatoire.
+
+NumPy est optionnel : ce module n'est importé que si le moteur 'numpy' est choisi.
+"""
+import numpy as np
+
+from flow_field import NO_CELL
+
+# Types d'entités
+ZOMBIE = 0      # Ligne droite, disparaît hors de l'arène (tous côtés)
+TRACKER = 1     # Poursuit le joueur
+METEORITE = 2   # Ligne droite, disparaît par le bas
+
+# Ordre des directions utilisé pour l'index `direction`
+DIRECTIONS = ('nord', 'sud', 'est', 'ouest')
+NORD, SUD, EST, OUEST = range(4)
+
+
+def round_like_rect(values):
+    """
+    Arrondit comme pygame lors de l'affectation d'un flottant à un attribut de
+    `Rect` : au plus proche, les demis s'éloignant de zéro (0.5 -> 1, -2.5 -> -3).
+    """
+    whole = np.trunc(values)
+    fraction = values - whole # Exact en virgule flottante
+    return (whole + np.sign(fraction) * (np.abs(fraction) >= 0.5)).astype(np.int64)
+
+
+class VectorEngine:
+    """
+    Simulation en lot des entités non-joueur.
+
+    Args:
+        groups (iterable): groupes de sprites gérés (zombies, météorites) ; un
+            sprite retiré de ses groupes (ex: `kill()` par une collision) est
+            aussi retiré du moteur. La grille des groupes qui en ont une
+            (SpatialGroup) est tenue à jour par le moteur.
+        kinds (dict): classe de sprite -> type (ZOMBIE, TRACKER, METEORITE).
+        world_size (tuple): (largeur, hauteur) de l'arène.
+        despawn_distance (int): distance à la zone vue au-delà de laquelle une
+            entité disparaît (None : seulement en sortant de l'arène).
+        capacity (int): taille initiale des tableaux (doublée si besoin).
+    """
+    def __init__(self, groups, kinds, world_size, despawn_distance=None, capacity=256):
+        self.groups = list(groups)
+        self.grids = [getattr(group, 'grid', None) for group in self.groups]
+        self.kinds = dict(kinds)
+        self.world_width, self.world_height = world_size
+        self.despawn_distance = despawn_distance
+        self.count = 0
+        self.sprites = [] # Vue : le sprite i correspond à l'index i des tableaux
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """(Ré)alloue les tableaux en conservant les `count` premières entrées."""
+        n = self.count
+        def grow(name, dtype, columns=()):
+            array = np.zeros((capacity, *columns), dtype)
+            if n:
+                array[:n] = getattr(self, name)[:n]
+            setattr(self, name, array)
+        grow('x', np.float64)        # Position exacte, coin haut-gauche (comme sprite.pos_x)
+        grow('y', np.float64)
+        grow('ox', np.float64)       # Décalage du rect par rapport à la position (météorites)
+        grow('oy', np.float64)
+        grow('w', np.int64)
+        grow('h', np.int64)
+        grow('dx', np.float64)       # Vitesse (zombies droits, météorites)
+        grow('dy', np.float64)
+        grow('speed', np.float64)    # Vitesse de poursuite (traqueurs)
+        grow('margin', np.int64)     # Marge de disparition hors de l'arène
+        grow('kind', np.int8)
+        grow('direction', np.int8)   # Index dans DIRECTIONS (traqueurs)
+        grow('angle', np.float64)    # Angle en degrés (météorites)
+        grow('spin', np.float64)     # Rotation par pas (0 : ne tourne pas)
+        grow('frame', np.int64)      # Index de l'image tournée courante
+        grow('frame_count', np.int64) # Nombre d'images tournées (1 : pas de rotation)
+        grow('group', np.int64)      # Index du groupe dans self.groups
+        grow('cell_size', np.int64)  # Taille de cellule de la grille du groupe (0: pas de grille)
+        grow('cells', np.int64, (4,)) # Cellules occupées (cx0, cy0, cx1, cy1)
+        grow('entity_id', np.int64)  # Numéro d'apparition (décalage des mises à jour espacées)
+        grow('moved', np.bool_)      # A bougé au dernier pas (son prev_x/prev_y reste à recopier)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    @staticmethod
+    def _cell_ranges(x, y, w, h, cell_size):
+        """Cellules couvertes par chaque rectangle (comme SpatialHash._cell_range)."""
+        left, top = x // cell_size, y // cell_size
+        right = np.maximum(left, (x + w - 1) // cell_size)
+        bottom = np.maximum(top, (y + h - 1) // cell_size)
+        return np.stack((left, top, right, bottom), axis=-1)
+
+    def add(self, sprite):
+        """Ajoute un sprite (déjà initialisé) au moteur."""
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        i = self.count
+        kind = self.kinds[type(sprite)]
+        rect = sprite.rect
+        self.x[i], self.y[i], self.w[i], self.h[i] = sprite.pos_x, sprite.pos_y, rect.width, rect.height
+        self.kind[i] = kind
+        self.margin[i] = sprite.despawn_margin
+        self.entity_id[i] = sprite.entity_id
+        self.moved[i] = False # place() : prev_x/prev_y déjà égaux à la position
+        if kind == TRACKER:
+            self.dx[i] = self.dy[i] = 0.0
+            self.speed[i] = sprite.speed
+            self.direction[i] = DIRECTIONS.index(sprite.direction)
+        else:
+            self.dx[i], self.dy[i] = sprite.dx, sprite.dy
+            self.speed[i] = 0.0
+        if kind == METEORITE:
+            self.ox[i], self.oy[i] = sprite.offset_x, sprite.offset_y
+            self.angle[i], self.spin[i] = sprite.angle, sprite.spin
+            self.frame[i], self.frame_count[i] = sprite.frame, len(sprite.frames)
+        else:
+            self.ox[i] = self.oy[i] = 0.0
+            self.angle[i] = self.spin[i] = 0.0
+            self.frame[i], self.frame_count[i] = 0, 1
+        group_index = next(g for g, group in enumerate(self.groups) if sprite in group)
+        grid = self.grids[group_index]
+        self.group[i] = group_index
+        self.cell_size[i] = grid.cell_size if grid is not None else 0
+        if grid is not None:
+            self.cells[i] = self._cell_ranges(rect.x, rect.y, rect.width, rect.height, grid.cell_size)
+        self.sprites.append(sprite)
+        self.count += 1
+
+    def _compact(self, keep):
+        """Ne garde que les entrées d'indices `keep` (tableau trié), dans l'ordre."""
+        k = len(keep)
+        for name in ('x', 'y', 'ox', 'oy', 'w', 'h', 'dx', 'dy', 'speed', 'margin', 'kind', 'direction',
+                     'angle', 'spin', 'frame', 'frame_count', 'group', 'cell_size', 'cells', 'entity_id', 'moved'):
+            array = getattr(self, name)
+            array[:k] = array[keep]
+        self.sprites = [self.sprites[i] for i in keep.tolist()]
+        self.count = k
+
+    def _drop_removed(self):
+        """Retire du moteur les sprites sortis de leurs groupes depuis le dernier pas."""
+        if sum(len(group) for group in self.groups) == self.count:
+            return
+        alive = np.fromiter((sprite.alive() for sprite in self.sprites), bool, self.count)
+        self._compact(np.flatnonzero(alive))
+
+    @staticmethod
+    def _flow_targets(field, center_x, center_y, target_x, target_y):
+        """Cibles lues dans le champ de flux (comme FlowField.next_target), sinon celles données."""
+        size, stride = field.cell_size, field.stride
+        col = np.clip(np.floor_divide(center_x, size), 0, field.cols - 1).astype(np.int64)
+        row = np.clip(np.floor_divide(center_y, size), 0, field.rows - 1).astype(np.int64)
+        cell = (row + 1) * stride + col + 1
+        # Lecture sans copie des tableaux du champ
+        following = np.frombuffer(field.next_cell, dtype=field.next_cell.typecode)[cell]
+        valid = ((np.frombuffer(field.stamp, dtype=field.stamp.typecode)[cell] == field.generation) &
+                 (following != NO_CELL))
+        return (np.where(valid, (following % stride - 0.5) * size, target_x),
+                np.where(valid, (following // stride - 0.5) * size, target_y))
+
+    def step(self, player, scale=1.0, view=None, field=None, lod=None):
+        """
+        Avance toutes les entités d'un pas de simulation (voir les `update()`
+        des sprites) ; `scale` : durée du pas en unités de vitesse, `view` :
+        zone vue par la caméra (None : tout est visible), `field` : champ de
+        flux des traqueurs (None : poursuite directe), `lod` : (période, pas,
+        distance) des mises à jour espacées des traqueurs lointains.
+        """
+        self._drop_removed()
+        n = self.count
+        if n == 0:
+            return
+        x, y, w, h = self.x[:n], self.y[:n], self.w[:n], self.h[:n]
+        ox, oy = self.ox[:n], self.oy[:n]
+        prev_x, prev_y = x.copy(), y.copy()
+        kind = self.kind[:n]
+        sprites = self.sprites
+
+        # --- Zombies droits et météorites : un pas en ligne droite ---
+        straight = kind != TRACKER
+        x[straight] += self.dx[:n][straight] * scale
+        y[straight] += self.dy[:n][straight] * scale
+
+        # --- Traqueurs : vecteurs de poursuite normalisés en lot ---
+        trackers = np.flatnonzero(kind == TRACKER)
+        if len(trackers):
+            tx, ty = x[trackers], y[trackers]
+            center_x, center_y = tx + w[trackers] / 2, ty + h[trackers] / 2
+            target_x = player.pos_x + player.rect.width / 2
+            target_y = player.pos_y + player.rect.height / 2
+            step_scale, active = scale, True
+            if lod is not None: # Traqueurs lointains : un pas sur `period`, d'autant plus long
+                period, step, far_distance = lod
+                far_x, far_y = target_x - center_x, target_y - center_y
+                far = far_x * far_x + far_y * far_y > far_distance * far_distance
+                active = ~far | ((step + self.entity_id[:n][trackers]) % period == 0)
+                step_scale = np.where(far, scale * period, scale)
+            if field is not None:
+                target_x, target_y = self._flow_targets(field, center_x, center_y, target_x, target_y)
+            to_x = target_x - center_x
+            to_y = target_y - center_y
+            # Opérations IEEE correctement arrondies : même résultat que math.sqrt
+            distance = np.sqrt(to_x * to_x + to_y * to_y)
+            moving = (distance > 0) & active
+            safe = np.where(moving, distance, 1.0)
+            speed = self.speed[:n][trackers]
+            move_x = to_x / safe * speed
+            move_y = to_y / safe * speed
+            x[trackers] = np.where(moving, tx + move_x * step_scale, tx)
+            y[trackers] = np.where(moving, ty + move_y * step_scale, ty)
+
+        # --- Angles des météorites (voir Meteorite.update) ---
+        spinning = np.flatnonzero(self.spin[:n] != 0)
+        if len(spinning):
+            angle = np.mod(self.angle[spinning] + self.spin[spinning] * scale, 360.0)
+            self.angle[spinning] = angle
+
+        # Positions au pixel (comme sprite.rect), avant changement d'image
+        rx, ry = round_like_rect(x + ox), round_like_rect(y + oy)
+        if view is not None: # Comme view.colliderect(sprite.rect)
+            visible = ((rx < view.right) & (rx + w > view.left) &
+                       (ry < view.bottom) & (ry + h > view.top))
+        else:
+            visible = np.ones(n, bool)
+
+        # --- Direction visuelle des traqueurs visibles (égalité : on garde l'ancienne) ---
+        changed = []
+        if len(trackers):
+            abs_x, abs_y = np.abs(move_x), np.abs(move_y)
+            old = self.direction[:n][trackers]
+            new = np.where(abs_y > abs_x, np.where(move_y > 0, SUD, NORD),
+                           np.where(abs_x > abs_y, np.where(move_x > 0, EST, OUEST), old))
+            new = np.where(moving & visible[trackers], new, old).astype(np.int8)
+            turned = new != old
+            if turned.any():
+                self.direction[trackers[turned]] = new[turned]
+                changed = trackers[turned].tolist()
+
+        # --- Image tournée des météorites visibles (voir Meteorite.set_frame) ---
+        if len(spinning):
+            shown = visible[spinning]
+            count = self.frame_count[spinning]
+            frame = (angle * count / 360.0).astype(np.int64) % count
+            switched = shown & (frame != self.frame[spinning])
+            if switched.any():
+                for i, new_frame in zip(spinning[switched].tolist(), frame[switched].tolist()):
+                    # Nouvelle image (taille différente), centrée sur l'image non tournée
+                    sprite = sprites[i]
+                    sprite.set_frame(new_frame)
+                    w[i], h[i] = sprite.rect.size
+                    ox[i], oy[i] = sprite.offset_x, sprite.offset_y
+                    self.frame[i] = new_frame
+                rx, ry = round_like_rect(x + ox), round_like_rect(y + oy)
+
+        # --- Disparition hors de l'arène ou loin de la caméra (masques booléens) ---
+        margin = self.margin[:n]
+        width, height = self.world_width, self.world_height
+        outside_any = ((rx + w < -margin) | (rx > width + margin) |
+                       (ry + h < -margin) | (ry > height + margin))
+        gone = np.where(kind == METEORITE, ry > height + margin, outside_any)
+        distance = self.despawn_distance
+        if view is not None and distance is not None: # Comme beyond_despawn_distance
+            gone |= ((rx + w < view.left - distance) | (rx > view.right + distance) |
+                     (ry + h < view.top - distance) | (ry > view.bottom + distance))
+
+        # --- Recopie vers les sprites (vues pour l'affichage) ---
+        # Seulement ceux qui ont bougé à ce pas ou au précédent (prev_x/prev_y
+        # à rattraper) : les traqueurs lointains en attente n'ont rien de neuf
+        for i in changed:
+            sprites[i].set_direction(DIRECTIONS[self.direction[i]])
+        moved = (x != prev_x) | (y != prev_y)
+        copy = np.flatnonzero(moved | self.moved[:n])
+        self.moved[:n] = moved
+        for i, px, py, sx, sy, ix, iy in zip(copy.tolist(), prev_x[copy].tolist(), prev_y[copy].tolist(),
+                                             x[copy].tolist(), y[copy].tolist(),
+                                             rx[copy].tolist(), ry[copy].tolist()):
+            sprite = sprites[i]
+            sprite.prev_x, sprite.prev_y, sprite.pos_x, sprite.pos_y = px, py, sx, sy
+            sprite.rect.topleft = (ix, iy)
+
+        if gone.any():
+            for i in np.flatnonzero(gone).tolist():
+                sprites[i].kill()
+            keep = np.flatnonzero(~gone)
+            self._compact(keep)
+            sprites = self.sprites # Nouvelle liste, alignée sur les tableaux compactés
+            n = self.count
+            rx, ry, w, h = rx[keep], ry[keep], self.w[:n], self.h[:n]
+
+        # --- Grilles spatiales : seuls les sprites ayant changé de cellule ---
+        cell_size = self.cell_size[:n]
+        gridded = cell_size > 0
+        if gridded.any():
+            cells = self._cell_ranges(rx, ry, w, h, np.where(gridded, cell_size, 1))
+            moved = np.flatnonzero(gridded & (cells != self.cells[:n]).any(axis=1))
+            if len(moved):
+                self.cells[moved] = cells[moved]
+                grids, groups = self.grids, self.group
+                for i in moved.tolist():
+                    grids[groups[i]].move(sprites[i])